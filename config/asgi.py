@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Sous ASGI, les lectures de l'API passent par les vues async (softdesk/async_views.py)
+os.environ.setdefault('SOFTDESK_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
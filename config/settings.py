@@ -1,164 +1,357 @@
-"""
-Configuration Django pour le projet SoftDesk Support
-Ajoutez ces configurations à votre fichier settings.py existant
-"""
-
-from datetime import timedelta
-from pathlib import Path
-
-# Build paths inside the project
-BASE_DIR = Path(__file__).resolve().parent.parent
-
-# SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'your-secret-key-here-change-in-production'
-
-# SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
-
-ALLOWED_HOSTS = []
-
-# Application definition
-INSTALLED_APPS = [
-    'django.contrib.admin',
-    'django.contrib.auth',
-    'django.contrib.contenttypes',
-    'django.contrib.sessions',
-    'django.contrib.messages',
-    'django.contrib.staticfiles',
-    
-    # Third party apps
-    'rest_framework',
-    'rest_framework_simplejwt',
-    'corsheaders',
-    
-    # Local apps
-    'softdesk',  # Votre application
-]
-
-MIDDLEWARE = [
-    'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'corsheaders.middleware.CorsMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-]
-
-ROOT_URLCONF = 'config.urls'
-
-TEMPLATES = [
-    {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
-        'APP_DIRS': True,
-        'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.debug',
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
-        },
-    },
-]
-
-WSGI_APPLICATION = 'config.wsgi.application'
-
-# Database
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
-
-# Password validation
-AUTH_PASSWORD_VALIDATORS = [
-    {
-        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
-    },
-]
-
-# Internationalization
-LANGUAGE_CODE = 'fr-fr'
-TIME_ZONE = 'Europe/Paris'
-USE_I18N = True
-USE_TZ = True
-
-# Static files (CSS, JavaScript, Images)
-STATIC_URL = 'static/'
-
-# Default primary key field type
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
-
-# Custom User Model
-AUTH_USER_MODEL = 'softdesk.User'
-
-# REST Framework Configuration
-REST_FRAMEWORK = {
-    'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    ],
-    'DEFAULT_PERMISSION_CLASSES': [
-        'rest_framework.permissions.IsAuthenticated',
-    ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 10,
-    'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
-    ],
-}
-
-# JWT Configuration (Sécurité OWASP)
-SIMPLE_JWT = {
-    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),  
-    'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
-    'ROTATE_REFRESH_TOKENS': True,
-    'BLACKLIST_AFTER_ROTATION': True,
-    'UPDATE_LAST_LOGIN': True,
-    
-    'ALGORITHM': 'HS256',
-    'SIGNING_KEY': SECRET_KEY,
-    'VERIFYING_KEY': None,
-    'AUDIENCE': None,
-    'ISSUER': None,
-    
-    'AUTH_HEADER_TYPES': ('Bearer',),
-    'AUTH_HEADER_NAME': 'HTTP_AUTHORIZATION',
-    'USER_ID_FIELD': 'id',
-    'USER_ID_CLAIM': 'user_id',
-    
-    'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
-    'TOKEN_TYPE_CLAIM': 'token_type',
-}
-
-# CORS Configuration (si nécessaire pour le front-end)
-CORS_ALLOWED_ORIGINS = [
-    "http://localhost:3000",
-    "http://127.0.0.1:3000",
-]
-
-# Security Settings (OWASP)
-SECURE_BROWSER_XSS_FILTER = True
-SECURE_CONTENT_TYPE_NOSNIFF = True
-X_FRAME_OPTIONS = 'DENY'
-
-# En production, activez ces paramètres :
-# SECURE_SSL_REDIRECT = True
-# SESSION_COOKIE_SECURE = True
-# CSRF_COOKIE_SECURE = True
-# SECURE_HSTS_SECONDS = 31536000
-# SECURE_HSTS_INCLUDE_SUBDOMAINS = True
+"""
+Configuration Django pour le projet SoftDesk Support
+Ajoutez ces configurations à votre fichier settings.py existant
+"""
+
+import os
+from datetime import timedelta
+from pathlib import Path
+
+# Build paths inside the project
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = 'your-secret-key-here-change-in-production'
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = True
+
+ALLOWED_HOSTS = []
+
+# Application definition
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    
+    # Third party apps
+    'rest_framework',
+    'rest_framework_simplejwt',
+    'corsheaders',
+    
+    # Local apps
+    'softdesk',  # Votre application
+]
+
+MIDDLEWARE = [
+    # Délestage (503) avant tout travail quand le processus est saturé (voir softdesk/throttling.py)
+    'softdesk.throttling.LoadSheddingMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    # Base de lecture de la requête : réplica ou primaire (voir softdesk/replicas.py)
+    'softdesk.replicas.ReplicaRoutingMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+# Lectures natives async (softdesk/async_views.py) : activées par config/asgi.py
+SOFTDESK_ASYNC_VIEWS = os.environ.get('SOFTDESK_ASYNC_VIEWS') == '1'
+
+ROOT_URLCONF = 'config.urls_async' if SOFTDESK_ASYNC_VIEWS else 'config.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'config.wsgi.application'
+
+# Database : profil choisi par SOFTDESK_DB_PROFILE (voir softdesk/database.py)
+# Connexions persistantes (CONN_MAX_AGE, en secondes) sous WSGI ; sous ASGI,
+# Django ne les réutilise pas d'une requête à l'autre : 0, et un pooler
+# (PgBouncer) devant PostgreSQL.
+SOFTDESK_DB_CONN_MAX_AGE = int(os.environ.get(
+    'SOFTDESK_DB_CONN_MAX_AGE', 0 if SOFTDESK_ASYNC_VIEWS else 600
+))
+DATABASE_PROFILES = {
+    'sqlite': {
+        # Moteur de Django + OPTIONS['transaction_mode'] (natif à partir de Django 5.1)
+        'ENGINE': 'softdesk.backends.sqlite3',
+        'NAME': os.environ.get('SOFTDESK_DB_NAME', BASE_DIR / 'db.sqlite3'),
+        'CONN_MAX_AGE': SOFTDESK_DB_CONN_MAX_AGE,
+        # Verrou d'écriture pris dès le début de transaction.atomic() : attente
+        # (busy_timeout) au lieu d'un « database is locked » immédiat
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+    },
+    'postgresql': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('SOFTDESK_DB_NAME', 'softdesk'),
+        'USER': os.environ.get('SOFTDESK_DB_USER', 'softdesk'),
+        'PASSWORD': os.environ.get('SOFTDESK_DB_PASSWORD', ''),
+        'HOST': os.environ.get('SOFTDESK_DB_HOST', 'localhost'),
+        'PORT': os.environ.get('SOFTDESK_DB_PORT', '5432'),
+        'CONN_MAX_AGE': SOFTDESK_DB_CONN_MAX_AGE,
+        # Connexion persistante vérifiée avant réutilisation (redémarrage du serveur...)
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'connect_timeout': 5},
+    },
+}
+SOFTDESK_DB_PROFILE = os.environ.get('SOFTDESK_DB_PROFILE', 'sqlite')
+DATABASES = {
+    'default': DATABASE_PROFILES[SOFTDESK_DB_PROFILE],
+}
+
+# Réplicas en lecture (voir softdesk/replicas.py) : SOFTDESK_DB_REPLICAS liste,
+# séparés par des virgules, les fichiers (sqlite) ou les hôtes (postgresql)
+SOFTDESK_REPLICAS = {
+    'ALIASES': [],
+    'STICKY_SECONDS': int(os.environ.get('SOFTDESK_DB_STICKY_SECONDS', 5)),
+}
+for index, replica in enumerate(filter(None, os.environ.get('SOFTDESK_DB_REPLICAS', '').split(',')), 1):
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        'NAME' if SOFTDESK_DB_PROFILE == 'sqlite' else 'HOST': replica.strip(),
+        # Tests : le réplica est la base de test du primaire
+        'TEST': {'MIRROR': 'default'},
+    }
+    SOFTDESK_REPLICAS['ALIASES'].append(f'replica{index}')
+DATABASE_ROUTERS = ['softdesk.replicas.ReplicaRouter']
+
+# PRAGMA de chaque connexion SQLite : seulement ce qui diffère des valeurs par
+# défaut de softdesk/database.py, par ex. {'cache_size': -64 * 1024} (None : retiré)
+SOFTDESK_SQLITE_PRAGMAS = {}
+
+# Cache : profil choisi par SOFTDESK_CACHE_PROFILE. Versions des projets,
+# appartenances, réponses en cache et réplicas en dépendent : avec plusieurs
+# processus (SOFTDESK_WORKERS, ou WEB_CONCURRENCY de gunicorn), il doit être
+# partagé, sinon le démarrage est refusé (voir softdesk/checks.py).
+CACHE_PROFILES = {
+    # Mémoire du processus : un seul processus (runserver, tests)
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'softdesk',
+    },
+    # Table de la base : python manage.py createcachetable
+    'database': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'softdesk_cache',
+    },
+    # Nécessite redis (pip install redis)
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('SOFTDESK_CACHE_URL', 'redis://localhost:6379/0'),
+    },
+}
+SOFTDESK_CACHE_PROFILE = os.environ.get('SOFTDESK_CACHE_PROFILE', 'local')
+CACHES = {
+    'default': CACHE_PROFILES[SOFTDESK_CACHE_PROFILE],
+}
+SOFTDESK_WORKERS = int(os.environ.get('SOFTDESK_WORKERS') or os.environ.get('WEB_CONCURRENCY') or 1)
+
+# Cache des appartenances aux projets (voir softdesk/membership.py)
+SOFTDESK_MEMBERSHIP_CACHE = {
+    'LOCAL_MAXSIZE': 1024,
+    'LOCAL_TTL': 5,
+    'TIMEOUT': 300,
+}
+
+# Cache de l'authentification JWT (voir softdesk/authentication.py)
+SOFTDESK_AUTH_CACHE = {
+    'TOKEN_MAXSIZE': 10000,
+    'USER_MAXSIZE': 1024,
+    'USER_TTL': 60,
+}
+
+# Limitation de débit et délestage (voir softdesk/throttling.py)
+# SHARED_CACHE : alias de CACHES partagé (Redis...) pour compter sur tous les processus
+SOFTDESK_THROTTLING = {
+    'ENABLED': True,
+    'MAXSIZE': 100000,
+    'SHARED_CACHE': os.environ.get('SOFTDESK_THROTTLE_CACHE') or None,
+    'MAX_IN_FLIGHT': int(os.environ.get('SOFTDESK_MAX_IN_FLIGHT', 64)),
+    'RETRY_AFTER': 1,
+}
+
+# Liste noire des refresh tokens échangés (voir softdesk/blacklist.py) :
+# CAPACITY ~ nombre d'échanges pendant REFRESH_TOKEN_LIFETIME
+SOFTDESK_TOKEN_BLACKLIST = {
+    'CAPACITY': 100000,
+    'ERROR_RATE': 0.001,
+    'PURGE_INTERVAL': 300,
+}
+
+# Cache des réponses list/retrieve (voir softdesk/response_cache.py).
+# Pour un cache sur fichiers : ajouter à CACHES un alias 'responses' avec
+# 'django.core.cache.backends.filebased.FileBasedCache' et l'indiquer ici.
+SOFTDESK_RESPONSE_CACHE = {
+    'ENABLED': True,
+    'ALIAS': 'default',
+    'TIMEOUT': 300,
+}
+
+# Hachage des mots de passe (voir softdesk/passwords.py) : profil et coût par
+# environnement. Le premier hacheur du profil hache les nouveaux mots de passe,
+# les suivants vérifient les anciens (réhachés à la connexion suivante).
+PASSWORD_HASHER_PROFILES = {
+    'pbkdf2': [
+        'softdesk.passwords.PBKDF2PasswordHasher',
+        'softdesk.passwords.Argon2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    ],
+    # Nécessite argon2-cffi
+    'argon2': [
+        'softdesk.passwords.Argon2PasswordHasher',
+        'softdesk.passwords.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    ],
+    # Tests et bases jetables uniquement : aucune résistance aux attaques
+    'test': [
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ],
+}
+SOFTDESK_PASSWORD_HASHER_PROFILE = os.environ.get('SOFTDESK_PASSWORD_HASHER_PROFILE', 'pbkdf2')
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[SOFTDESK_PASSWORD_HASHER_PROFILE]
+SOFTDESK_PASSWORDS = {
+    'WORKERS': int(os.environ.get('SOFTDESK_PASSWORD_WORKERS', 2)),
+    'MAX_PENDING': int(os.environ.get('SOFTDESK_PASSWORD_MAX_PENDING', 64)),
+    # Threads par processus WSGI (gunicorn --threads) : borne les requêtes bloquées sur un hachage
+    'SERVER_THREADS': int(os.environ.get('SOFTDESK_SERVER_THREADS', 0)) or None,
+    # 0 ou absent : coût par défaut de Django
+    'ITERATIONS': int(os.environ.get('SOFTDESK_PASSWORD_ITERATIONS', 0)) or None,
+    'ARGON2_TIME_COST': int(os.environ.get('SOFTDESK_ARGON2_TIME_COST', 0)) or None,
+    'ARGON2_MEMORY_COST': int(os.environ.get('SOFTDESK_ARGON2_MEMORY_COST', 0)) or None,
+    'LAST_LOGIN_INTERVAL': 10,
+    'LAST_LOGIN_MAXSIZE': 500,
+}
+
+# Password validation
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+# Internationalization
+LANGUAGE_CODE = 'fr-fr'
+TIME_ZONE = 'Europe/Paris'
+USE_I18N = True
+USE_TZ = True
+
+# Static files (CSS, JavaScript, Images)
+STATIC_URL = 'static/'
+
+# Default primary key field type
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Custom User Model
+AUTH_USER_MODEL = 'softdesk.User'
+
+# REST Framework Configuration
+# Profils de rendu : "production" sans l'interface navigable de DRF
+RENDERER_PROFILES = {
+    'development': [
+        'softdesk.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'production': [
+        'softdesk.renderers.FastJSONRenderer',
+    ],
+}
+SOFTDESK_RENDERER_PROFILE = os.environ.get(
+    'SOFTDESK_RENDERER_PROFILE', 'development' if DEBUG else 'production'
+)
+
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        # JWTAuthentication + cache des tokens vérifiés et des utilisateurs
+        'softdesk.authentication.CachedJWTAuthentication',
+    ],
+    'DEFAULT_PERMISSION_CLASSES': [
+        'rest_framework.permissions.IsAuthenticated',
+    ],
+    # Fenêtres glissantes par utilisateur, projet et vue (softdesk/throttling.py)
+    'DEFAULT_THROTTLE_CLASSES': [
+        'softdesk.throttling.UserRateThrottle',
+        'softdesk.throttling.ProjectRateThrottle',
+        'softdesk.throttling.EndpointRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'user': '1200/min',
+        'anon': '120/min',
+        'project': '6000/min',
+        'endpoint': '600/min',
+        'search': '120/min',
+    },
+    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'PAGE_SIZE': 10,
+    # JSON rendu et lu par orjson (softdesk/renderers.py), repli sur la stdlib
+    'DEFAULT_RENDERER_CLASSES': RENDERER_PROFILES[SOFTDESK_RENDERER_PROFILE],
+    'DEFAULT_PARSER_CLASSES': [
+        'softdesk.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# JWT Configuration (Sécurité OWASP)
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),  
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
+    'ROTATE_REFRESH_TOKENS': True,
+    'BLACKLIST_AFTER_ROTATION': True,
+    # Dernière connexion écrite par lots (LoginSerializer, softdesk/passwords.py)
+    'UPDATE_LAST_LOGIN': False,
+    'TOKEN_OBTAIN_SERIALIZER': 'softdesk.serializers.LoginSerializer',
+    # Liste noire des refresh tokens échangés (softdesk/blacklist.py)
+    'TOKEN_REFRESH_SERIALIZER': 'softdesk.serializers.RefreshSerializer',
+    
+    'ALGORITHM': 'HS256',
+    'SIGNING_KEY': SECRET_KEY,
+    'VERIFYING_KEY': None,
+    'AUDIENCE': None,
+    'ISSUER': None,
+    
+    'AUTH_HEADER_TYPES': ('Bearer',),
+    'AUTH_HEADER_NAME': 'HTTP_AUTHORIZATION',
+    'USER_ID_FIELD': 'id',
+    'USER_ID_CLAIM': 'user_id',
+    
+    'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
+    'TOKEN_TYPE_CLAIM': 'token_type',
+}
+
+# CORS Configuration (si nécessaire pour le front-end)
+CORS_ALLOWED_ORIGINS = [
+    "http://localhost:3000",
+    "http://127.0.0.1:3000",
+]
+
+# Security Settings (OWASP)
+SECURE_BROWSER_XSS_FILTER = True
+SECURE_CONTENT_TYPE_NOSNIFF = True
+X_FRAME_OPTIONS = 'DENY'
+
+# En production, activez ces paramètres :
+# SECURE_SSL_REDIRECT = True
+# SESSION_COOKIE_SECURE = True
+# CSRF_COOKIE_SECURE = True
+# SECURE_HSTS_SECONDS = 31536000
+# SECURE_HSTS_INCLUDE_SUBDOMAINS = True
 # SECURE_HSTS_PRELOAD = True
\ No newline at end of file
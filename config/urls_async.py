@@ -0,0 +1,8 @@
+from django.contrib import admin
+from django.urls import path, include
+
+# Variante de config/urls.py chargée sous ASGI (voir config/asgi.py)
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('api/', include('softdesk.urls_async')), # Lectures async
+]
\ No newline at end of file
@@ -29,14 +29,14 @@ class ProjectAdmin(admin.ModelAdmin):
     list_display = ['name', 'type', 'author', 'created_time']
     list_filter = ['type', 'created_time']
     search_fields = ['name', 'description']
-    readonly_fields = ['created_time']
+    readonly_fields = ['created_time', 'updated_time']
     
     fieldsets = (
         ('Informations du projet', {
             'fields': ('name', 'description', 'type')
         }),
         ('Métadonnées', {
-            'fields': ('author', 'created_time')
+            'fields': ('author', 'created_time', 'updated_time')
         }),
     )
 
@@ -56,7 +56,7 @@ class IssueAdmin(admin.ModelAdmin):
     list_display = ['name', 'project', 'priority', 'tag', 'status', 'author', 'assigned_to', 'created_time']
     list_filter = ['priority', 'tag', 'status', 'created_time']
     search_fields = ['name', 'description', 'project__name']
-    readonly_fields = ['created_time']
+    readonly_fields = ['created_time', 'updated_time']
     
     fieldsets = (
         ('Informations de l\'issue', {
@@ -69,7 +69,7 @@ class IssueAdmin(admin.ModelAdmin):
             'fields': ('author', 'assigned_to')
         }),
         ('Métadonnées', {
-            'fields': ('created_time',)
+            'fields': ('created_time', 'updated_time')
         }),
     )
 
@@ -80,13 +80,13 @@ class CommentAdmin(admin.ModelAdmin):
     list_display = ['uuid', 'issue', 'author', 'created_time']
     list_filter = ['created_time']
     search_fields = ['description', 'issue__name', 'author__username']
-    readonly_fields = ['uuid', 'created_time']
+    readonly_fields = ['uuid', 'created_time', 'updated_time']
     
     fieldsets = (
         ('Commentaire', {
             'fields': ('uuid', 'description', 'issue')
         }),
         ('Métadonnées', {
-            'fields': ('author', 'created_time')
+            'fields': ('author', 'created_time', 'updated_time')
         }),
-    )
\ No newline at end of file
+    )
\ No newline at end of file
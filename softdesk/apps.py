@@ -4,3 +4,17 @@ from django.apps import AppConfig
 class SoftdeskConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'softdesk'
+
+    def ready(self):
+        # Enregistrement des signaux (invalidation des caches)
+        from . import signals  # noqa: F401
+
+        # Réglage de chaque nouvelle connexion à la base (PRAGMA SQLite)
+        from django.db.backends.signals import connection_created
+
+        from .database import configure_connection
+        connection_created.connect(configure_connection, dispatch_uid='softdesk.configure_connection')
+
+        # Plusieurs processus : caches partagés obligatoires (voir checks.py)
+        from .checks import check_shared_caches
+        check_shared_caches()
@@ -0,0 +1,384 @@
+"""
+Lectures natives async (ASGI)
+
+Sous ASGI, ``config/asgi.py`` active ``SOFTDESK_ASYNC_VIEWS`` et les routes
+de l'API utilisent ces sous-classes des ViewSets de ``views.py``. Les ``GET``
+de liste et de détail (projets, issues, commentaires, contributeurs), les
+statistiques du tableau et l'export en flux s'exécutent alors en async de bout en bout :
+authentification, cache des appartenances, versions des projets, cache des
+réponses, pagination et ORM async. Aucun worker n'est bloqué pendant les allers-retours vers la base.
+
+Connexion et inscription (``AsyncLoginView``, ``AsyncUserViewSet``) restent
+synchrones mais s'exécutent hors du thread partagé des vues synchrones :
+l'attente du pool de hachage (voir ``passwords.py``) n'y retarde pas les
+écritures des autres requêtes.
+
+Permissions, portée des querysets (``ScopedQuerysetMixin.scoped_queryset``),
+validateurs (ETag / Last-Modified), cache et forme des réponses sont ceux
+des vues synchrones : seules les E/S sont réécrites en async. Les autres méthodes (écritures, ``HEAD``,
+``OPTIONS``) sont déléguées telles quelles au ViewSet synchrone.
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db import close_old_connections
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.response import Response
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from .board import aget_board_stats
+from .export import ProjectExport
+from .membership import membership_cache
+from .models import Contributor
+from .response_cache import response_cache
+from .serializers import ContributorSerializer
+from .versioning import aget_issue_project_id, aget_project_versions
+from .views import (
+    CommentViewSet, ContributorViewSet, IssueViewSet, ProjectViewSet, ScopedQuerysetMixin, UserViewSet
+)
+
+
+def render_now(response):
+    """
+    Rendu immédiat : Django exécuterait sinon le rendu différé d'une
+    ``Response`` DRF dans le thread synchrone partagé.
+    """
+    if not hasattr(response, 'render'):
+        return response
+    response.render()
+    return HttpResponse(
+        response.content, status=response.status_code, headers=dict(response.items())
+    )
+
+
+class AsyncReadMixin:
+    """
+    À placer avant un ViewSet de ``views.py`` : ``as_view`` retourne une vue
+    async pour les routes dont le ``GET`` correspond à ``async_actions``.
+    Chaque action ``xxx`` est implémentée par une coroutine ``axxx``.
+    """
+    async_actions = ('list', 'retrieve')
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        sync_view = super().as_view(actions, **initkwargs)
+        read_action = actions.get('get')
+        if read_action not in cls.async_actions:
+            return sync_view
+        if 'head' not in actions:
+            actions = {**actions, 'head': read_action}
+
+        async def view(request, *args, **kwargs):
+            if request.method != 'GET':
+                return await sync_to_async(sync_view)(request, *args, **kwargs)
+            self = cls(**initkwargs)
+            self.action_map = actions
+            # Comme ViewSetMixin.as_view (sert aussi à l'en-tête Allow)
+            for method, action in actions.items():
+                setattr(self, method, getattr(self, action))
+            return await self.adispatch(request, *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.actions = actions
+        return csrf_exempt(view)
+
+    # Cycle de la requête
+
+    async def adispatch(self, request, *args, **kwargs):
+        """
+        ``APIView.dispatch`` dont le gestionnaire est une coroutine : mêmes
+        étapes (``initialize_request``, ``initial``, ``handle_exception``,
+        ``finalize_response``), celles du ViewSet.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request)
+            handler = getattr(self, f'a{self.action}')
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        response = self.finalize_response(request, response, *args, **kwargs)
+        return self.render_response(response)
+
+    async def ainitial(self, request):
+        """
+        ``initial`` de DRF (négociation, version, permissions), précédé de
+        l'authentification et suivi des limites, qui font des E/S.
+        """
+        await self.aperform_authentication(request)
+        self.async_throttles = True
+        self.initial(request)  # request.user déjà résolu : pas de nouvelle authentification
+        await self.acheck_throttles(request)
+
+    def check_throttles(self, request):
+        # Dans une lecture async, vérifiées par acheck_throttles (voir ainitial)
+        if not getattr(self, 'async_throttles', False):
+            super().check_throttles(request)
+
+    async def aperform_authentication(self, request):
+        """Comme ``Request._authenticate``, avec ``aauthenticate`` si disponible."""
+        for authenticator in request.authenticators:
+            authenticate = getattr(authenticator, 'aauthenticate', None)
+            if authenticate is None:
+                authenticate = sync_to_async(authenticator.authenticate)
+            try:
+                user_auth = await authenticate(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+            if user_auth is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth
+                return
+        request._not_authenticated()
+
+    async def acheck_throttles(self, request):
+        """Comme ``check_throttles``, avec ``aallow_request`` si disponible."""
+        durations = []
+        for throttle in self.get_throttles():
+            allow = getattr(throttle, 'aallow_request', None)
+            if allow is not None:
+                allowed = await allow(request, self)
+            else:
+                allowed = throttle.allow_request(request, self)
+            if not allowed:
+                durations.append(throttle.wait())
+        if durations:
+            self.throttled(request, max((d for d in durations if d is not None), default=None))
+
+    async def acheck_object_permissions(self, request, obj):
+        for permission in self.get_permissions():
+            check = getattr(permission, 'ahas_object_permission', None)
+            if check is not None:
+                allowed = await check(request, self, obj)
+            else:
+                allowed = permission.has_object_permission(request, self, obj)
+            if not allowed:
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, 'message', None),
+                    code=getattr(permission, 'code', None),
+                )
+
+    def render_response(self, response):
+        return render_now(response)
+
+    # Données
+
+    async def aget_scope_project_id(self):
+        """Variante async de ``get_scope_project_id`` (à surcharger si elle fait des E/S)."""
+        return self.get_scope_project_id()
+
+    async def aget_queryset(self):
+        """
+        Variante async de ``get_queryset`` : appartenance lue par le cache async,
+        puis les règles de ``scoped_queryset`` communes aux deux variantes.
+        """
+        if not isinstance(self, ScopedQuerysetMixin):
+            return self.get_queryset()  # Sans E/S (sous-requêtes seulement)
+        project_id = await self.aget_scope_project_id()
+        is_member = project_id is not None and await membership_cache.ais_member(
+            self.request.user, project_id
+        )
+        return self.scoped_queryset(project_id, is_member)
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(await self.aget_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        await self.acheck_object_permissions(self.request, obj)
+        return obj
+
+    async def aget_version_project_ids(self):
+        project_pk = self.kwargs.get(self.project_url_kwarg)
+        if project_pk is None:
+            return await membership_cache.aproject_ids(self.request.user)
+        try:
+            return [int(project_pk)]
+        except ValueError:
+            return []
+
+    async def aget_project_versions(self):
+        """Versions lues une seule fois par requête (clé de cache et validateurs)."""
+        if not hasattr(self, '_project_versions'):
+            self._project_versions = await aget_project_versions(
+                await self.aget_version_project_ids()
+            )
+        return self._project_versions
+
+    # Cache des réponses et requêtes conditionnelles
+
+    async def acached_response(self, request, build_response):
+        if not response_cache.enabled or not request.user.is_authenticated:
+            return await build_response()
+
+        key = response_cache.make_key(request, await self.aget_project_versions())
+        entry = await response_cache.aget(key)
+        if entry is not None:
+            return self.cache_hit_response(request, entry)
+
+        response = await build_response()
+        entry = self.make_cache_entry(response)
+        if entry is not None:
+            await response_cache.aset(key, entry)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    async def aconditional_response(self, request, parts, build_response):
+        validators = self.make_validators(parts, await self.aget_project_versions())
+        etag, last_modified = validators
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+        return self.add_validators(await build_response(), validators)
+
+    # Actions
+
+    async def apaginated_response(self, queryset, count=None):
+        page = await self.paginator.apaginate_queryset(
+            queryset, self.request, view=self, count=count
+        )
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        objects = [obj async for obj in queryset]
+        return Response(self.get_serializer(objects, many=True).data)
+
+    async def alist(self, request, *args, **kwargs):
+        async def build_response():
+            queryset = self.filter_queryset(await self.aget_queryset())
+            aggregate = await queryset.aaggregate(
+                total=Count('pk'), last=Max(self.last_modified_field)
+            )
+            return await self.aconditional_response(
+                request, [aggregate['total'], aggregate['last']],
+                # Le COUNT des validateurs sert aussi à la pagination par numéro
+                lambda: self.apaginated_response(queryset, count=aggregate['total']),
+            )
+        return await self.acached_response(request, build_response)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        async def build_response():
+            instance = await self.aget_object()
+
+            async def serialize():
+                return Response(self.get_serializer(instance).data)
+
+            return await self.aconditional_response(
+                request, [instance.pk, getattr(instance, self.last_modified_field)], serialize
+            )
+        return await self.acached_response(request, build_response)
+
+
+class OffloadedViewMixin:
+    """
+    À placer avant une vue synchrone qui attend le pool de hachage : ``as_view``
+    retourne une vue async qui l'exécute dans un thread de l'exécuteur par
+    défaut (``thread_sensitive=False``), pas dans le thread partagé.
+    """
+
+    @classmethod
+    def as_view(cls, *args, **initkwargs):
+        sync_view = super().as_view(*args, **initkwargs)
+
+        def run(request, *args, **kwargs):
+            try:
+                return render_now(sync_view(request, *args, **kwargs))
+            finally:
+                # Connexion propre à ce thread : request_finished ne la verra pas
+                close_old_connections()
+
+        async def view(request, *args, **kwargs):
+            return await sync_to_async(run, thread_sensitive=False)(request, *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.actions = getattr(sync_view, 'actions', None)
+        return csrf_exempt(view)
+
+
+class AsyncLoginView(OffloadedViewMixin, TokenObtainPairView):
+    pass
+
+
+class AsyncUserViewSet(OffloadedViewMixin, UserViewSet):
+    pass
+
+
+class AsyncProjectViewSet(AsyncReadMixin, ProjectViewSet):
+    async_actions = ('list', 'retrieve', 'list_contributors', 'board_stats', 'export')
+
+    async def aboard_stats(self, request, pk=None):
+        """Statistiques du tableau (comme ``board_stats``)"""
+        project = await self.aget_object()
+        versions = await self.aget_project_versions()
+
+        async def build_response():
+            return Response(await aget_board_stats(project.pk, versions[project.pk]))
+
+        return await self.aconditional_response(request, [], build_response)
+
+    async def aexport(self, request, pk=None):
+        """Export en flux (comme ``export``), lu par l'ORM async"""
+        project = await self.aget_object()
+        export = ProjectExport(project, request.accepted_renderer.format)
+        return export.response(export.aiter_chunks())
+
+    async def alist_contributors(self, request, pk=None):
+        """Liste les contributeurs d'un projet (comme ``list_contributors``)"""
+        project = await self.aget_object()
+        context = self.get_serializer_context()
+        contributors = self.sparse_queryset(
+            Contributor.objects.filter(project=project).select_related('user'),
+            ContributorSerializer(context=context), ('project', 'created_time')
+        )
+        aggregate = await contributors.aaggregate(total=Count('pk'), last=Max('created_time'))
+
+        async def serialize():
+            objects = [contributor async for contributor in contributors]
+            return Response(ContributorSerializer(objects, many=True, context=context).data)
+
+        return await self.aconditional_response(
+            request, [aggregate['total'], aggregate['last']], serialize
+        )
+
+
+class AsyncIssueViewSet(AsyncReadMixin, IssueViewSet):
+    pass
+
+
+class AsyncCommentViewSet(AsyncReadMixin, CommentViewSet):
+
+    async def aget_scope_project_id(self):
+        # Comme CommentViewSet.get_scope_project_id
+        issue_id = self.kwargs.get('issue_pk')
+        if issue_id is None:
+            return None
+        project_id = self.url_project_id(await aget_issue_project_id(issue_id))
+        if project_id is None:
+            raise Http404
+        return project_id
+
+    async def aget_version_project_ids(self):
+        issue_id = self.kwargs.get('issue_pk')
+        if issue_id is None:
+            return await membership_cache.aproject_ids(self.request.user)
+        project_id = self.url_project_id(await aget_issue_project_id(issue_id))
+        return [] if project_id is None else [project_id]
+
+
+class AsyncContributorViewSet(AsyncReadMixin, ContributorViewSet):
+    pass
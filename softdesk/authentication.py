@@ -0,0 +1,108 @@
+"""
+Authentification JWT allégée (Green Code)
+
+``CachedJWTAuthentication`` garde, dans des caches locaux au processus :
+- les tokens déjà vérifiés (clé : empreinte SHA-256 du token), jusqu'à leur
+  expiration : pas de nouveau calcul HMAC ni de décodage JSON ;
+- les utilisateurs (clé : id), pour une durée courte et bornée, invalidés
+  par les signaux ``post_save``/``post_delete`` de ``User`` : pas de
+  ``SELECT`` sur la table des utilisateurs à chaque requête.
+
+Dans un déploiement multi-processus, un utilisateur désactivé peut rester
+accepté par les autres workers au plus ``USER_TTL`` secondes.
+
+``aauthenticate`` est la variante utilisée par les vues async (voir
+``async_views.py``) : même logique, ORM async en cas d'absence du cache.
+"""
+import copy
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .localcache import LocalLRUCache
+
+DEFAULTS = {
+    'TOKEN_MAXSIZE': 10000,  # Tokens vérifiés gardés en mémoire
+    'TOKEN_TTL': 300,        # Durée maximale (s), bornée par l'expiration du token
+    'USER_MAXSIZE': 1024,    # Utilisateurs gardés en mémoire
+    'USER_TTL': 60,          # Durée de vie (s) d'un utilisateur en cache
+}
+
+conf = {**DEFAULTS, **getattr(settings, 'SOFTDESK_AUTH_CACHE', {})}
+token_cache = LocalLRUCache(conf['TOKEN_MAXSIZE'], conf['TOKEN_TTL'])
+user_cache = LocalLRUCache(conf['USER_MAXSIZE'], conf['USER_TTL'])
+
+
+def forget_user(user_id):
+    """Appelé par les signaux de ``User`` (voir ``signals.py``)."""
+    user_cache.delete(user_id)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` avec cache des tokens vérifiés et des utilisateurs."""
+
+    def get_validated_token(self, raw_token):
+        key = hashlib.sha256(raw_token).digest()
+        token = token_cache.get(key)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            remaining = token.payload.get('exp', 0) - time.time()
+            if remaining > 0:
+                token_cache.set(key, token, ttl=remaining)
+        return token
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+        user = user_cache.get(user_id) if user_id is not None else None
+        if user is None:
+            # Vérifications d'origine (claim manquant, utilisateur inconnu ou inactif)
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+        else:
+            self.check_revoked(user, validated_token)
+        # Copie : une vue qui modifierait request.user n'altère pas le cache
+        return copy.copy(user)
+
+    def check_revoked(self, user, validated_token):
+        """Contrôle propre à chaque token : refait même si l'utilisateur est en cache."""
+        if jwt_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            jwt_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+
+    async def aauthenticate(self, request):
+        """Équivalent async de ``authenticate`` (vérification du token sans E/S)."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+        if user_id is None:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        user = user_cache.get(user_id)
+        if user is None:
+            user_model = get_user_model()
+            try:
+                user = await user_model.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+            except user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            if not user.is_active:
+                raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+            user_cache.set(user_id, user)
+        self.check_revoked(user, validated_token)
+        return copy.copy(user)
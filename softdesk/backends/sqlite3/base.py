@@ -0,0 +1,35 @@
+"""
+Moteur SQLite de Django avec l'option ``transaction_mode`` (Django 5.1+).
+
+Par défaut, ``transaction.atomic()`` ouvre un ``BEGIN`` différé : une
+transaction qui lit puis écrit pendant qu'une autre écrit échoue aussitôt
+par « database is locked », sans attendre ``busy_timeout`` (SQLite refuse
+d'attendre pour éviter un interblocage). Avec ``"transaction_mode":
+"IMMEDIATE"``, le verrou d'écriture est pris dès le ``BEGIN`` : la
+transaction attend son tour au lieu d'échouer.
+
+Même réglage que ``OPTIONS["transaction_mode"]`` de Django 5.1 : à la mise à
+jour, revenir à ``django.db.backends.sqlite3`` suffit.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ('DEFERRED', 'EXCLUSIVE', 'IMMEDIATE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    transaction_mode = 'DEFERRED'
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        # Option propre à ce moteur, inconnue de sqlite3.connect()
+        mode = (kwargs.pop('transaction_mode', None) or 'DEFERRED').upper()
+        if mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f"settings.DATABASES : transaction_mode doit être parmi {', '.join(TRANSACTION_MODES)}."
+            )
+        self.transaction_mode = mode
+        return kwargs
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f'BEGIN {self.transaction_mode}')
@@ -0,0 +1,13 @@
+"""
+Scénarios de ``python manage.py benchmark`` (Green Code)
+
+Un module par scénario, chacun exposant ``run(bench, options)`` : il crée ses
+données sur la base de test jetable préparée par la commande, puis écrit ses
+mesures par ``bench`` (voir ``harness.py``, outils communs de mesure).
+"""
+
+SCENARIOS = ('pagination', 'membership', 'auth', 'asgi', 'fields', 'renderers', 'export',
+             'search', 'board', 'database', 'login', 'refresh', 'throttling')
+
+# Scénarios à jouer sur une base SQLite dans un fichier (verrous, journal)
+FILE_SCENARIOS = ('database', 'login')
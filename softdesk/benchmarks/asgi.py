@@ -0,0 +1,81 @@
+"""
+Sous charge concurrente, un déploiement WSGI (pool fixe de threads, chacun
+bloqué pendant les allers-retours SQL) contre le déploiement ASGI (vues
+async sur une seule boucle d'événements). Le cache des réponses est coupé :
+chaque requête va jusqu'à la base.
+
+    python manage.py benchmark asgi --concurrency 32 --wsgi-threads 4 --db-latency 5
+"""
+import asyncio
+import statistics
+import time
+
+from asgiref.sync import ThreadSensitiveContext
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from softdesk.models import Comment, Issue
+
+from .harness import (
+    bench_project, bench_users, percentile, run_clients, sql_latency, without_response_cache
+)
+
+
+def run(bench, options):
+    user, = bench_users(1)
+    project = bench_project(user)
+    issues = Issue.objects.bulk_create(
+        Issue(name=f'Issue {i}', description='-', project=project, author=user) for i in range(50)
+    )
+    Comment.objects.bulk_create(Comment(description='-', issue=issues[0], author=user) for _ in range(20))
+    headers = {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+    urls = [
+        '/api/projects/',
+        f'/api/projects/{project.pk}/',
+        f'/api/projects/{project.pk}/issues/',
+        f'/api/projects/{project.pk}/issues/{issues[0].pk}/comments/',
+    ]
+    total, concurrency = options['requests'], options['concurrency']
+    bench.write(
+        f"{total} requêtes, {concurrency} clients, {options['wsgi_threads']} threads WSGI, "
+        f"latence SQL simulée {options['db_latency']} ms"
+    )
+
+    def wsgi_request(index, queued):
+        # Latence vue par le client : attente d'un thread libre comprise
+        response = Client().get(urls[index % len(urls)], headers=headers)
+        assert response.status_code == 200, response.status_code
+        return (time.perf_counter() - queued) * 1000
+
+    async def asgi_run():
+        client, semaphore = AsyncClient(), asyncio.Semaphore(concurrency)
+
+        async def asgi_request(index):
+            # Comme ASGIHandler : un thread dédié par requête pour le code synchrone (ORM)
+            async with semaphore, ThreadSensitiveContext():
+                start = time.perf_counter()
+                response = await client.get(urls[index % len(urls)], headers=headers)
+                assert response.status_code == 200, response.status_code
+                return (time.perf_counter() - start) * 1000
+
+        return await asyncio.gather(*(asgi_request(i) for i in range(total)))
+
+    def run_wsgi():
+        # Au plus `concurrency` requêtes en attente ou en cours, comme côté ASGI
+        return run_clients(wsgi_request, total, options['wsgi_threads'], concurrency)
+
+    def run_asgi():
+        with override_settings(ROOT_URLCONF='config.urls_async'):
+            return asyncio.run(asgi_run())
+
+    with without_response_cache(), sql_latency(options['db_latency']):
+        for label, run_variant in (('WSGI (threads)', run_wsgi), ('ASGI (vues async)', run_asgi)):
+            run_variant()  # Préchauffage (connexions, caches, imports)
+            start = time.perf_counter()
+            timings = run_variant()
+            elapsed = time.perf_counter() - start
+            bench.write(
+                f"{label:<20} {total / elapsed:>9.0f} req/s   "
+                f"médiane {statistics.median(timings):>7.2f} ms   p95 {percentile(timings, 0.95):>7.2f} ms"
+            )
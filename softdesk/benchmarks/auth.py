@@ -0,0 +1,34 @@
+"""
+JWTAuthentication contre CachedJWTAuthentication sur une liste d'issues.
+
+    python manage.py benchmark auth --repeat 500
+"""
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from softdesk.authentication import CachedJWTAuthentication
+from softdesk.models import Issue
+from softdesk.views import IssueViewSet
+
+from .harness import bench_project, bench_users, measure
+
+
+def run(bench, options):
+    user, = bench_users(1)
+    project = bench_project(user)
+    Issue.objects.bulk_create(
+        Issue(name=f'Issue {i}', description='-', project=project, author=user) for i in range(20)
+    )
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+    url = f'/api/projects/{project.pk}/issues/'
+
+    original = IssueViewSet.authentication_classes
+    try:
+        for auth_class in (JWTAuthentication, CachedJWTAuthentication):
+            IssueViewSet.authentication_classes = [auth_class]
+            client.get(url)  # Préchauffage (caches, imports)
+            bench.row(auth_class.__name__, *measure(client, url, options['repeat']))
+    finally:
+        IssueViewSet.authentication_classes = original
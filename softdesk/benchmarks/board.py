@@ -0,0 +1,48 @@
+"""
+Statistiques du tableau : toutes les issues téléchargées, GROUP BY, cache.
+
+    python manage.py benchmark board --issues 20000
+"""
+import random
+
+from rest_framework.test import APIClient
+
+from softdesk.board import board_queryset, summarize
+from softdesk.models import Issue
+from softdesk.renderers import FastJSONRenderer
+from softdesk.serializers import IssueSerializer
+
+from .harness import bench_project, bench_users, measure, measure_call
+
+
+def run(bench, options):
+    users = bench_users(10)
+    project = bench_project(users[0], users)
+    generator = random.Random(42)
+    Issue.objects.bulk_create(
+        (Issue(name=f'Issue {i}', description='Description détaillée. ' * 10,
+               project=project, author=users[0],
+               assigned_to=generator.choice(users + [None]),
+               status=generator.choice(Issue.STATUS_CHOICES)[0],
+               priority=generator.choice(Issue.PRIORITY_CHOICES)[0],
+               tag=generator.choice(Issue.TAG_CHOICES)[0])
+         for i in range(options['issues'])),
+        batch_size=5000,
+    )
+    client = APIClient()
+    client.force_authenticate(users[0])
+    bench.write(f"{options['issues']} issues, 10 assignés")
+
+    # Avant : le client télécharge toutes les issues pour compter lui-même
+    issues = Issue.objects.filter(project=project).select_related('author', 'assigned_to', 'project')
+    list_ms, _ = measure_call(
+        lambda: FastJSONRenderer().render(IssueSerializer(issues, many=True).data),
+        max(options['repeat'] // 10, 1),
+    )
+    bench.row('liste complète sérialisée', list_ms, 1)
+    group_ms, _ = measure_call(
+        lambda: summarize(project.pk, board_queryset(project.pk)), options['repeat']
+    )
+    bench.row('GROUP BY (cache froid)', group_ms, 1)
+    bench.row('board-stats (cache)',
+              *measure(client, f'/api/projects/{project.pk}/board-stats/', options['repeat']))
@@ -0,0 +1,114 @@
+"""
+Lectures et écritures concurrentes sur une base SQLite dans un fichier, un
+processus par client : réglages par défaut de Django (journal rollback,
+BEGIN différé, une connexion par requête) contre le profil sqlite (PRAGMA de
+SOFTDESK_SQLITE_PRAGMAS, BEGIN IMMEDIATE, connexions persistantes). Sur 10
+requêtes : 2 créations d'issue, 2 modifications de 40 issues par lot
+(transaction), 6 lectures de liste.
+
+    python manage.py benchmark database --concurrency 16 --requests 4000
+"""
+import multiprocessing
+import random
+import statistics
+import time
+
+from django.db import OperationalError, connection
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from softdesk.database import DEFAULTS as SQLITE_PRAGMAS, sqlite_pragmas
+from softdesk.models import Issue, User
+
+from .harness import bench_project, bench_users, percentile, without_response_cache
+
+
+def database_client(worker):
+    """
+    Un client, dans son propre processus (comme un worker gunicorn) :
+    ``worker`` = (index, clients, requêtes, projet, ids de ses issues,
+    connexion persistante). Retourne (durées en ms, erreurs).
+    """
+    index, clients, total, project_id, issue_ids, persistent = worker
+    client = APIClient()
+    client.force_authenticate(User.objects.get(username=f'bench{index}'))
+    generator = random.Random(index)
+    url = f'/api/projects/{project_id}/issues/'
+    timings, errors = [], {'locked': 0, 'other': 0}
+    for step in range(index, total, clients):
+        start = time.perf_counter()
+        try:
+            if step % 10 in (0, 5):
+                response = client.post(
+                    url, {'name': 'Nouvelle', 'description': '-', 'project': project_id}, format='json'
+                )
+            elif step % 10 in (1, 6):
+                status = generator.choice(Issue.STATUS_CHOICES)[0]
+                response = client.patch(f'{url}bulk/', [
+                    {'id': pk, 'status': status} for pk in generator.sample(issue_ids, 40)
+                ], format='json')
+            else:
+                response = client.get(f'{url}?page_size=20')
+            if response.status_code >= 400:
+                errors['other'] += 1
+        except OperationalError as exc:
+            errors['locked' if 'locked' in str(exc) else 'other'] += 1
+        timings.append((time.perf_counter() - start) * 1000)
+        if not persistent:
+            connection.close()  # CONN_MAX_AGE = 0
+    connection.close()
+    return timings, errors
+
+
+def run(bench, options):
+    if connection.vendor != 'sqlite':
+        bench.write("Scénario propre à SQLite.")
+        return
+    clients = options['concurrency']
+    users = bench_users(clients)
+    project = bench_project(users[0], users)
+    issues = Issue.objects.bulk_create(
+        Issue(name=f'Issue {i}', description='Description détaillée. ' * 10,
+              project=project, author=users[i % clients])
+        for i in range(1000)
+    )
+    bench.write(f"{options['requests']} requêtes, {clients} processus clients, 40 % d'écritures")
+
+    variants = [
+        ('défaut', dict.fromkeys(SQLITE_PRAGMAS), 'DEFERRED', False),
+        ('profil sqlite', {}, 'IMMEDIATE', True),
+    ]
+    connection_options = connection.settings_dict['OPTIONS']
+    original_mode = connection_options.get('transaction_mode')
+    # Fork : les réglages ci-dessous sont hérités par les processus clients
+    context = multiprocessing.get_context('fork')
+    try:
+        with without_response_cache():
+            for label, pragmas, mode, persistent in variants:
+                connection_options['transaction_mode'] = mode
+                with override_settings(SOFTDESK_SQLITE_PRAGMAS=pragmas):
+                    # Le mode du journal est enregistré dans le fichier : le fixer pour la variante
+                    journal_mode = sqlite_pragmas().get('journal_mode', 'delete')
+                    with connection.cursor() as cursor:
+                        cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
+                    # Aucune connexion ouverte ne doit être partagée avec les processus clients
+                    connection.close()
+                    workers = [
+                        (index, clients, options['requests'], project.pk,
+                         [issue.pk for issue in issues[index::clients]], persistent)
+                        for index in range(clients)
+                    ]
+                    with context.Pool(clients) as pool:
+                        start = time.perf_counter()
+                        results = pool.map(database_client, workers)
+                        elapsed = time.perf_counter() - start
+                timings = [timing for client_timings, _ in results for timing in client_timings]
+                locked = sum(errors['locked'] for _, errors in results)
+                other = sum(errors['other'] for _, errors in results)
+                bench.write(
+                    f"{label:<14} {options['requests'] / elapsed:>5.0f} req/s   "
+                    f"médiane {statistics.median(timings):>7.2f} ms   p95 {percentile(timings, 0.95):>8.2f} ms   "
+                    f"« database is locked » {locked:>4}   autres erreurs {other}"
+                )
+    finally:
+        connection_options['transaction_mode'] = original_mode
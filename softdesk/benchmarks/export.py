@@ -0,0 +1,53 @@
+"""
+Export en flux d'un projet croissant : premier octet, durée totale et pic mémoire.
+
+    python manage.py benchmark export --issues 20000
+"""
+import time
+import tracemalloc
+
+from rest_framework.test import APIClient
+
+from softdesk.models import Comment, Issue
+
+from .harness import bench_project, bench_users
+
+
+def run(bench, options):
+    user, = bench_users(1)
+    project = bench_project(user)
+    client = APIClient()
+    client.force_authenticate(user)
+    url = f'/api/projects/{project.pk}/export/'
+
+    bench.write(f"{'issues + commentaires':<24} {'format':<8} {'1er octet':>12} "
+                f"{'total':>12} {'pic mémoire':>14} {'taille':>12}")
+    created = 0
+    for size in (options['issues'] // 100, options['issues'] // 10, options['issues']):
+        issues = Issue.objects.bulk_create(
+            (Issue(name=f'Issue {i}', description='Description détaillée. ' * 10,
+                   project=project, author=user, assigned_to=user)
+             for i in range(created, size)),
+            batch_size=5000,
+        )
+        Comment.objects.bulk_create(
+            (Comment(description='Commentaire. ' * 10, issue=issue, author=user)
+             for issue in issues),
+            batch_size=5000,
+        )
+        created = size
+        for export_format in ('ndjson', 'csv'):
+            tracemalloc.start()
+            start = time.perf_counter()
+            response = client.get(f'{url}?format={export_format}')
+            content = iter(response.streaming_content)
+            total = len(next(content))
+            first_ms = (time.perf_counter() - start) * 1000
+            total += sum(len(chunk) for chunk in content)
+            total_ms = (time.perf_counter() - start) * 1000
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            bench.write(
+                f"{size * 2:<24} {export_format:<8} {first_ms:>9.2f} ms {total_ms:>9.2f} ms "
+                f"{peak / 1024:>10.1f} Ko {total:>12}"
+            )
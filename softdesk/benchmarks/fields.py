@@ -0,0 +1,62 @@
+"""
+Taille de la réponse et temps SQL d'une liste d'issues selon ?fields= / ?expand=.
+
+    python manage.py benchmark fields --issues 2000 --page-size 100
+"""
+import statistics
+import time
+
+from django.db import connection
+from rest_framework.test import APIClient
+
+from softdesk.models import Issue
+
+from .harness import bench_project, bench_users, without_response_cache
+
+FIELD_SETS = [
+    ('(tous les champs)', ''),
+    ('fields=id,name', '&fields=id,name'),
+    ('fields=id,name,status,priority', '&fields=id,name,status,priority'),
+    ('fields=id,name&expand=author', '&fields=id,name&expand=author'),
+    ('expand=author,assigned_to,project', '&expand=author,assigned_to,project'),
+]
+
+
+def run(bench, options):
+    user, = bench_users(1)
+    project = bench_project(user)
+    Issue.objects.bulk_create(
+        (Issue(name=f'Issue {i}', description='Description détaillée. ' * 40,
+               project=project, author=user, assigned_to=user)
+         for i in range(options['issues'])),
+        batch_size=5000,
+    )
+    client = APIClient()
+    client.force_authenticate(user)
+    url = f"/api/projects/{project.pk}/issues/?page_size={options['page_size']}"
+    bench.write(f"{options['issues']} issues, pages de {options['page_size']}")
+
+    with without_response_cache():
+        for label, params in FIELD_SETS:
+            timings, sql_timings = [], []
+            for _ in range(options['repeat']):
+                sql_time = [0.0]
+
+                def timed(execute, sql, params, many, context):
+                    start = time.perf_counter()
+                    try:
+                        return execute(sql, params, many, context)
+                    finally:
+                        sql_time[0] += time.perf_counter() - start
+
+                with connection.execute_wrapper(timed):
+                    start = time.perf_counter()
+                    response = client.get(url + params)
+                    timings.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200, (params, response.status_code)
+                sql_timings.append(sql_time[0] * 1000)
+            bench.write(
+                f"{label:<40} {statistics.median(timings):>9.2f} ms "
+                f"{statistics.median(sql_timings):>7.2f} ms SQL "
+                f"{len(response.content):>8} octets"
+            )
@@ -0,0 +1,150 @@
+"""
+Outils communs aux scénarios : sortie, mesures, données et réglages temporaires.
+"""
+import logging
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test.utils import CaptureQueriesContext
+
+from softdesk.models import Contributor, Project, User
+from softdesk.pagination import KeysetPagination
+from softdesk.response_cache import response_cache
+
+PASSWORD = 'bench-pass-123'
+
+
+class Bench:
+    """Sortie d'un scénario : lignes libres ou « libellé, médiane, requêtes SQL »."""
+
+    def __init__(self, stdout):
+        self.stdout = stdout
+
+    def write(self, text):
+        self.stdout.write(text)
+
+    def row(self, label, median_ms, queries):
+        self.stdout.write(f"{label:<40} {median_ms:>9.2f} ms {queries:>4} requêtes")
+
+
+def measure(client, url, repeat):
+    """Retourne (médiane en ms, nombre de requêtes SQL) pour un GET."""
+    timings = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, (url, response.status_code)
+    return statistics.median(timings), len(queries.captured_queries)
+
+
+def measure_call(func, repeat):
+    """Retourne (médiane en ms, pic mémoire en Ko) pour un appel sans E/S."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024
+
+
+def measure_page(queryset, page_size, repeat):
+    """Comme la pagination par numéro : COUNT(*) puis première page triée."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        queryset.count()
+        list(queryset.order_by(*KeysetPagination.ordering)[:page_size])
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), 2
+
+
+def percentile(timings, fraction):
+    timings = sorted(timings)
+    return timings[max(int(len(timings) * fraction) - 1, 0)]
+
+
+def run_clients(request, total, threads, concurrency):
+    """
+    ``request(index, queued)`` pour ``total`` requêtes servies par ``threads``
+    threads (serveur WSGI), avec au plus ``concurrency`` requêtes en attente
+    ou en cours (clients). Retourne les résultats dans l'ordre d'envoi.
+    """
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        pending, results = [], []
+        for index in range(total):
+            if len(pending) >= concurrency:
+                results.append(pending.pop(0).result())
+            pending.append(pool.submit(request, index, time.perf_counter()))
+        return results + [future.result() for future in pending]
+
+
+def bench_users(count, prefix='bench'):
+    """Utilisateurs ``bench0``, ``bench1``… avec le mot de passe ``PASSWORD``."""
+    return [
+        User.objects.create_user(username=f'{prefix}{index}', password=PASSWORD, age=30)
+        for index in range(count)
+    ]
+
+
+def bench_project(author, members=()):
+    """Projet dont ``author`` et ``members`` sont contributeurs."""
+    project = Project.objects.create(name='Bench', description='-', type='back-end', author=author)
+    Contributor.objects.bulk_create(
+        Contributor(user=user, project=project) for user in {author, *members}
+    )
+    return project
+
+
+@contextmanager
+def without_response_cache():
+    """Cache des réponses coupé : chaque requête va jusqu'à la base."""
+    enabled = response_cache.conf['ENABLED']
+    response_cache.conf['ENABLED'] = False
+    try:
+        yield
+    finally:
+        response_cache.conf['ENABLED'] = enabled
+
+
+@contextmanager
+def sql_latency(milliseconds):
+    """Latence ajoutée à chaque requête SQL (base distante), connexions futures comprises."""
+    def simulate_latency(execute, sql, params, many, context):
+        time.sleep(milliseconds / 1000)
+        return execute(sql, params, many, context)
+
+    def add_latency(sender, connection, **kwargs):
+        connection.execute_wrappers.append(simulate_latency)
+
+    if milliseconds:
+        connection_created.connect(add_latency)
+        connection.execute_wrappers.append(simulate_latency)
+    try:
+        yield
+    finally:
+        connection_created.disconnect(add_latency)
+        if simulate_latency in connection.execute_wrappers:
+            connection.execute_wrappers.remove(simulate_latency)
+
+
+@contextmanager
+def request_log_level(level):
+    """Journal ``django.request`` réduit : sinon une ligne par réponse 4xx ou 5xx."""
+    request_logger = logging.getLogger('django.request')
+    previous = request_logger.level
+    request_logger.setLevel(level)
+    try:
+        yield
+    finally:
+        request_logger.setLevel(previous)
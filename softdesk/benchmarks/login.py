@@ -0,0 +1,87 @@
+"""
+Rafale de connexions mêlées à des lectures de l'API (4 par connexion),
+servies par ``wsgi_threads`` threads : mot de passe vérifié dans le thread
+de la requête et ``UPDATE_LAST_LOGIN`` de simplejwt, contre le pool de
+hachage borné et les dates de connexion écrites par lot.
+
+    python manage.py benchmark login --logins 50 --wsgi-threads 8
+"""
+import logging
+import threading
+import time
+
+from django.test import Client
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.tokens import AccessToken
+
+from softdesk.models import Issue
+from softdesk.passwords import hashing_pool, last_login_buffer
+
+from .harness import (
+    PASSWORD, bench_project, bench_users, percentile, request_log_level, run_clients,
+    without_response_cache,
+)
+
+
+def run(bench, options):
+    users = bench_users(20)
+    project = bench_project(users[0])
+    Issue.objects.bulk_create(
+        Issue(name=f'Issue {i}', description='-', project=project, author=users[0]) for i in range(20)
+    )
+    headers = {'Authorization': f'Bearer {AccessToken.for_user(users[0])}'}
+    read_url = f'/api/projects/{project.pk}/issues/'
+    total, concurrency = options['logins'] * 5, options['concurrency']
+    bench.write(
+        f"{options['logins']} connexions et {total - options['logins']} lectures, "
+        f"{concurrency} clients, {options['wsgi_threads']} threads WSGI, "
+        f"{hashing_pool.workers} thread(s) de hachage"
+    )
+
+    def request(index, queued):
+        if index % 5 == 0:
+            kind = 'login'
+            response = Client(raise_request_exception=False).post('/api/login/', {
+                'username': f'bench{index % len(users)}', 'password': PASSWORD,
+            }, content_type='application/json')
+        else:
+            kind = 'read'
+            response = Client(raise_request_exception=False).get(read_url, headers=headers)
+        return kind, response.status_code, (time.perf_counter() - queued) * 1000
+
+    def unpooled(func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    update_last_login = jwt_serializers.api_settings.UPDATE_LAST_LOGIN
+    # Comme SOFTDESK_SERVER_THREADS = --wsgi-threads : un thread reste libre pour les lectures
+    waiting = hashing_pool._waiting
+    hashing_pool._waiting = threading.BoundedSemaphore(max(options['wsgi_threads'] - 1, 1))
+    try:
+        with without_response_cache(), request_log_level(logging.CRITICAL):
+            for label, pooled in (('sans pool', False), ('pool + lot', True)):
+                if not pooled:
+                    # Attributs d'instance : masquent les méthodes le temps de la variante
+                    hashing_pool.run = unpooled
+                    last_login_buffer.record = lambda user_id: None
+                jwt_serializers.api_settings.UPDATE_LAST_LOGIN = not pooled
+                start = time.perf_counter()
+                results = run_clients(request, total, options['wsgi_threads'], concurrency)
+                elapsed = time.perf_counter() - start
+                last_login_buffer.flush()
+                vars(hashing_pool).pop('run', None)
+                vars(last_login_buffer).pop('record', None)
+                logins = [ms for kind, _, ms in results if kind == 'login']
+                reads = [ms for kind, _, ms in results if kind == 'read']
+                # 503 compris : connexions refusées par le délestage du pool
+                failed = sum(1 for _, code, _ in results if code != 200)
+                bench.write(
+                    f"{label:<12} connexions {len(logins) / elapsed:>6.1f} req/s   "
+                    f"p99 connexion {percentile(logins, 0.99):>8.0f} ms   "
+                    f"p99 lecture {percentile(reads, 0.99):>8.0f} ms   "
+                    f"total {total / elapsed:>6.1f} req/s   échecs {failed}"
+                )
+    finally:
+        hashing_pool._waiting = waiting
+        vars(hashing_pool).pop('run', None)
+        vars(last_login_buffer).pop('record', None)
+        jwt_serializers.api_settings.UPDATE_LAST_LOGIN = update_last_login
@@ -0,0 +1,52 @@
+"""
+Filtres DISTINCT sur jointure contre les semi-jointures actuelles.
+
+    python manage.py benchmark membership --projects 300
+"""
+from softdesk.models import Comment, Contributor, Issue, Project, User
+from softdesk.views import contributed_project_ids
+
+from .harness import measure_page
+
+
+def run(bench, options):
+    projects_count, page_size = options['projects'], options['page_size']
+    users = User.objects.bulk_create(
+        User(username=f'bench{i}', age=30) for i in range(options['contributors'] + 1)
+    )
+    user = users[0]
+    projects = Project.objects.bulk_create(
+        Project(name=f'Projet {i}', description='-', type='back-end', author=user)
+        for i in range(projects_count)
+    )
+    Contributor.objects.bulk_create(
+        (Contributor(user=member, project=project) for project in projects for member in users),
+        batch_size=5000,
+    )
+    issues = Issue.objects.bulk_create(
+        (Issue(name=f'Issue {i}', description='-', project=project, author=user)
+         for project in projects for i in range(20)),
+        batch_size=5000,
+    )
+    Comment.objects.bulk_create(
+        (Comment(description='-', issue=issue, author=user) for issue in issues for _ in range(2)),
+        batch_size=5000,
+    )
+    bench.write(
+        f"{projects_count} projets x {len(users)} contributeurs, "
+        f"{len(issues)} issues, {len(issues) * 2} commentaires"
+    )
+
+    # Mêmes colonnes de part et d'autre : seule la façon de filtrer change
+    project_ids = contributed_project_ids(user)
+    variants = [
+        ('projets', Project.objects.filter(contributors__user=user).distinct(),
+         Project.objects.filter(pk__in=project_ids)),
+        ('issues', Issue.objects.filter(project__contributors__user=user).distinct(),
+         Issue.objects.filter(project_id__in=project_ids)),
+        ('commentaires', Comment.objects.filter(issue__project__contributors__user=user).distinct(),
+         Comment.objects.filter(issue__project_id__in=project_ids)),
+    ]
+    for label, before, after in variants:
+        bench.row(f'{label} DISTINCT (avant)', *measure_page(before, page_size, options['repeat']))
+        bench.row(f'{label} semi-jointure (après)', *measure_page(after, page_size, options['repeat']))
@@ -0,0 +1,43 @@
+"""
+Page 1 et page profonde, par numéro et par curseur.
+
+    python manage.py benchmark pagination --issues 100010
+"""
+from rest_framework.test import APIClient
+
+from softdesk.models import Issue
+from softdesk.pagination import KeysetPagination
+
+from .harness import bench_project, bench_users, measure, without_response_cache
+
+
+def run(bench, options):
+    page_size = options['page_size']
+    user, = bench_users(1)
+    project = bench_project(user)
+    Issue.objects.bulk_create(
+        (Issue(name=f'Issue {i}', description='-', project=project, author=user)
+         for i in range(options['issues'])),
+        batch_size=5000,
+    )
+    deep_page = max(options['issues'] // page_size, 1)
+    bench.write(f"{options['issues']} issues, page {deep_page} x {page_size}")
+
+    client = APIClient()
+    client.force_authenticate(user)
+    url = f'/api/projects/{project.pk}/issues/?page_size={page_size}'
+
+    # Sans cache des réponses : chaque page est lue en base
+    with without_response_cache():
+        bench.row('page=1', *measure(client, f'{url}&page=1', options['repeat']))
+        bench.row(f'page={deep_page}', *measure(client, f'{url}&page={deep_page}', options['repeat']))
+
+        bench.row('cursor (première page)', *measure(client, f'{url}&pagination=cursor', options['repeat']))
+        # Curseur équivalent à la page profonde : clé de la dernière ligne de la page précédente
+        anchor = Issue.objects.filter(project=project).order_by(
+            *KeysetPagination.ordering
+        )[(deep_page - 1) * page_size - 1]
+        paginator = KeysetPagination()
+        paginator.base_url = url
+        bench.row(f'cursor (page {deep_page})',
+                  *measure(client, paginator.encode_cursor(anchor, reverse=False), options['repeat']))
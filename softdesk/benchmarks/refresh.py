@@ -0,0 +1,52 @@
+"""
+``token/refresh/`` avec rotation : échange d'un token neuf (filtre de Bloom
+négatif, un INSERT) et token rejoué (filtre positif, un SELECT), puis purge
+des entrées expirées.
+
+    python manage.py benchmark refresh --repeat 200
+"""
+import logging
+import statistics
+import time
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from softdesk.blacklist import refresh_blacklist
+from softdesk.models import BlacklistedRefreshToken
+
+from .harness import bench_users, request_log_level
+
+
+def run(bench, options):
+    user, = bench_users(1)
+    client = APIClient()
+    url = '/api/token/refresh/'
+
+    def exchange(token, expected):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = client.post(url, {'refresh': token}, format='json')
+            elapsed = (time.perf_counter() - start) * 1000
+        assert response.status_code == expected, response.status_code
+        return elapsed, len(queries.captured_queries)
+
+    tokens = [str(RefreshToken.for_user(user)) for _ in range(options['repeat'] + 1)]
+    exchange(tokens.pop(), 200)  # Préchauffage (imports, filtre chargé)
+    fresh = [exchange(token, 200) for token in tokens]
+    with request_log_level(logging.ERROR):  # Un avertissement « Unauthorized » par rejeu
+        replayed = [exchange(token, 401) for token in tokens]
+    bench.row('échange (token neuf)', statistics.median(ms for ms, _ in fresh), fresh[-1][1])
+    bench.row('rejeu (token déjà échangé)', statistics.median(ms for ms, _ in replayed), replayed[-1][1])
+
+    # Entrées expirées : supprimées en un DELETE sur l'index expires_at
+    BlacklistedRefreshToken.objects.update(expires_at=timezone.now())
+    rows = BlacklistedRefreshToken.objects.count()
+    start = time.perf_counter()
+    deleted = refresh_blacklist.purge()
+    bench.row(f'purge ({deleted}/{rows} entrées expirées)', (time.perf_counter() - start) * 1000, 2)
+    bloom = refresh_blacklist._bloom
+    bench.write(f"filtre de Bloom : {len(bloom._bits) / 1024:.0f} Kio, {bloom.hashes} fonctions de hachage")
@@ -0,0 +1,60 @@
+"""
+Rendu (et lecture) JSON d'une page de 100 éléments par ressource : DRF contre orjson.
+
+    python manage.py benchmark renderers --repeat 200
+"""
+import io
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from softdesk.models import Comment, Contributor, Issue, Project, User
+from softdesk.renderers import FastJSONParser, FastJSONRenderer
+from softdesk.serializers import (
+    CommentSerializer, ContributorSerializer, IssueSerializer, ProjectSerializer
+)
+
+from .harness import measure_call
+
+
+def run(bench, options):
+    users = User.objects.bulk_create(User(username=f'bench{i}', age=30) for i in range(100))
+    projects = Project.objects.bulk_create(
+        Project(name=f'Projet {i}', description='Description du projet. ' * 10,
+                type='back-end', author=users[0])
+        for i in range(100)
+    )
+    Contributor.objects.bulk_create(Contributor(user=user, project=projects[0]) for user in users)
+    issues = Issue.objects.bulk_create(
+        Issue(name=f'Issue {i}', description='Description détaillée. ' * 20,
+              project=projects[0], author=users[0], assigned_to=users[1])
+        for i in range(100)
+    )
+    Comment.objects.bulk_create(
+        Comment(description='Commentaire. ' * 10, issue=issues[0], author=users[1])
+        for _ in range(100)
+    )
+    pages = [
+        ('projets', ProjectSerializer, Project.objects.select_related('author')),
+        ('issues', IssueSerializer,
+         Issue.objects.select_related('author', 'assigned_to', 'project')),
+        ('commentaires', CommentSerializer, Comment.objects.select_related('author', 'issue')),
+        ('contributeurs', ContributorSerializer, Contributor.objects.select_related('user')),
+    ]
+    variants = [
+        ('DRF', JSONRenderer(), JSONParser()),
+        ('orjson', FastJSONRenderer(), FastJSONParser()),
+    ]
+    bench.write(f"{'page de 100':<30} {'rendu':>12} {'pic mémoire':>14} {'lecture':>12}")
+    for label, serializer_class, queryset in pages:
+        data = serializer_class(queryset[:100], many=True).data
+        for name, renderer, parser in variants:
+            render_ms, peak_kb = measure_call(lambda: renderer.render(data), options['repeat'])
+            payload = renderer.render(data)
+            parse_ms, _ = measure_call(
+                lambda: parser.parse(io.BytesIO(payload)), options['repeat']
+            )
+            bench.write(
+                f"{f'{label} ({name})':<30} {render_ms:>9.3f} ms {peak_kb:>10.1f} Ko "
+                f"{parse_ms:>9.3f} ms   {len(payload)} octets"
+            )
@@ -0,0 +1,69 @@
+"""
+Recherche plein texte (FTS5) contre ``icontains`` sur les commentaires (SQLite).
+
+    python manage.py benchmark search --comments 1000000
+"""
+import random
+import time
+
+from django.db import connection
+
+from softdesk.models import Comment, Contributor, Issue, Project
+from softdesk.search import rebuild, search
+
+from .harness import bench_users, measure_call
+
+TERMS = ('mot0', 'mot50', 'mot4999', 'mot12 mot40')
+
+
+def run(bench, options):
+    if connection.vendor != 'sqlite':
+        bench.write("Scénario propre à SQLite.")
+        return
+    user, = bench_users(1)
+    # 100 projets, l'utilisateur n'est contributeur que de 10 d'entre eux
+    projects = Project.objects.bulk_create(
+        Project(name=f'Projet {i}', description='-', type='back-end', author=user)
+        for i in range(100)
+    )
+    Contributor.objects.bulk_create(Contributor(user=user, project=project) for project in projects[:10])
+    issues = Issue.objects.bulk_create(
+        Issue(name=f'Issue {i}', description='-', project=projects[i % 100], author=user)
+        for i in range(1000)
+    )
+    # Vocabulaire de 5000 mots : "mot0" est fréquent, "mot4999" rare
+    vocabulary = [f'mot{i}' for i in range(5000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    generator = random.Random(42)
+    start = time.perf_counter()
+    for offset in range(0, options['comments'], 10000):
+        Comment.objects.bulk_create(
+            Comment(description=' '.join(generator.choices(vocabulary, weights, k=20)),
+                    issue=issues[index % len(issues)], author=user)
+            for index in range(offset, min(offset + 10000, options['comments']))
+        )
+    bench.write(f"{options['comments']} commentaires indexés en "
+                f"{time.perf_counter() - start:.1f} s (triggers compris)")
+
+    project_ids = [project.pk for project in projects[:10]]
+    visible = Comment.objects.filter(issue__project_id__in=project_ids)
+
+    def compare():
+        for term in TERMS:
+            fts_ms, _ = measure_call(
+                lambda: search(term, project_ids, kind='comment', limit=10), options['repeat']
+            )
+            like = visible
+            for word in term.split():
+                like = like.filter(description__icontains=word)
+            like_ms, _ = measure_call(
+                lambda: list(like.order_by('-created_time', '-id')[:10]), options['repeat']
+            )
+            bench.write(f"{term:<20} FTS5 {fts_ms:>9.2f} ms   icontains {like_ms:>9.2f} ms")
+
+    bench.write("Index tenu par les triggers :")
+    compare()
+    start = time.perf_counter()
+    rebuild()
+    bench.write(f"Après rebuild_search_index ({time.perf_counter() - start:.1f} s) :")
+    compare()
@@ -0,0 +1,96 @@
+"""
+Coût des trois throttles par requête, client emballé (429 et
+``Retry-After``), puis délestage sous ASGI : ``concurrency`` clients
+simultanés pour au plus ``MAX_IN_FLIGHT`` requêtes en cours.
+
+    python manage.py benchmark throttling --concurrency 256 --db-latency 5
+"""
+import asyncio
+import logging
+import statistics
+import time
+
+from asgiref.sync import ThreadSensitiveContext
+from django.test import AsyncClient
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from softdesk import throttling
+from softdesk.models import Issue
+
+from .harness import (
+    bench_project, bench_users, measure, request_log_level, sql_latency, without_response_cache
+)
+
+
+def run(bench, options):
+    user, = bench_users(1)
+    project = bench_project(user)
+    Issue.objects.bulk_create(
+        Issue(name=f'Issue {i}', description='-', project=project, author=user) for i in range(20)
+    )
+    token = AccessToken.for_user(user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    url = f'/api/projects/{project.pk}/issues/'
+    try:
+        with without_response_cache(), request_log_level(logging.CRITICAL):
+            for label, active in (('throttles coupés', False), ('3 throttles (compteurs locaux)', True)):
+                throttling.conf['ENABLED'] = active
+                throttling.local_store.clear()
+                client.get(url)  # Préchauffage
+                bench.row(label, *measure(client, url, options['repeat']))
+
+            # Client emballé : toujours la même liste, jusqu'au premier refus
+            throttling.local_store.clear()
+            sent, response = 0, None
+            while response is None or response.status_code == 200:
+                response = client.get(url)
+                sent += 1
+            refused = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                client.get(url)
+                refused.append((time.perf_counter() - start) * 1000)
+            bench.write(
+                f"client emballé : {response.status_code} après {sent - 1} requêtes, "
+                f"Retry-After {response['Retry-After']} s, refus en {statistics.median(refused):.2f} ms"
+            )
+            throttling.conf['ENABLED'] = False
+            shed_load(bench, url, {'Authorization': f'Bearer {token}'}, options)
+    finally:
+        throttling.conf['ENABLED'] = True
+
+
+def shed_load(bench, url, headers, options):
+    concurrency = options['concurrency']
+
+    async def run_requests():
+        client = AsyncClient()
+
+        async def request():
+            async with ThreadSensitiveContext():
+                start = time.perf_counter()
+                response = await client.get(url, headers=headers)
+                return response.status_code, (time.perf_counter() - start) * 1000
+
+        return await asyncio.gather(*(request() for _ in range(concurrency)))
+
+    bench.write(f"ASGI, {concurrency} requêtes simultanées, latence SQL simulée {options['db_latency']} ms")
+    max_in_flight = throttling.conf['MAX_IN_FLIGHT']
+    try:
+        with sql_latency(options['db_latency']):
+            for label, limit in (('sans délestage', concurrency), (f'MAX_IN_FLIGHT {max_in_flight}', max_in_flight)):
+                throttling.conf['MAX_IN_FLIGHT'] = limit
+                with override_settings(ROOT_URLCONF='config.urls_async'):
+                    start = time.perf_counter()
+                    results = asyncio.run(run_requests())
+                    elapsed = (time.perf_counter() - start) * 1000
+                parts = []
+                for code in sorted({code for code, _ in results}):
+                    timings = [ms for status_code, ms in results if status_code == code]
+                    parts.append(f"{code} : {len(timings):>3} réponses, médiane {statistics.median(timings):>7.0f} ms")
+                bench.write(f"  {label:<18} {'   '.join(parts)}   total {elapsed:>6.0f} ms")
+    finally:
+        throttling.conf['MAX_IN_FLIGHT'] = max_in_flight
@@ -0,0 +1,151 @@
+"""
+Liste noire des refresh tokens, bornée par leur durée de vie (Green Code)
+
+Avec ``ROTATE_REFRESH_TOKENS`` et ``BLACKLIST_AFTER_ROTATION``, chaque
+``token/refresh/`` échange le refresh token contre un nouveau : l'ancien
+(son ``jti``) entre dans ``BlacklistedRefreshToken`` avec sa date
+d'expiration, et y reste jusqu'à celle-ci seulement.
+
+- Un filtre de Bloom en mémoire, propre au processus, sert de premier
+  niveau : un ``jti`` absent du filtre n'a jamais été vu, aucune lecture en
+  base. Seul un ``jti`` présent (token rejoué, ou faux positif, environ
+  ``ERROR_RATE``) coûte un ``SELECT`` sur la clé primaire.
+- L'``INSERT`` de l'ancien ``jti`` (clé primaire) fait foi : deux échanges
+  du même token, même dans deux processus différents, ne peuvent pas
+  réussir tous les deux. Le filtre n'a donc pas besoin d'être complet.
+- Toutes les ``PURGE_INTERVAL`` secondes, un thread supprime les entrées
+  expirées en un seul ``DELETE`` (index sur ``expires_at``) puis reconstruit
+  le filtre depuis la table : il apprend les tokens échangés par les autres
+  processus et se vide des expirés. La table garde la taille d'une durée de
+  vie de refresh token (``REFRESH_TOKEN_LIFETIME``).
+
+Le cas courant d'un échange fait donc une seule requête, l'``INSERT`` de la
+rotation, qui remplace les ``get_or_create`` de
+``rest_framework_simplejwt.token_blacklist`` (app non installée).
+"""
+import hashlib
+import logging
+import math
+import os
+import threading
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .models import BlacklistedRefreshToken
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'CAPACITY': 100000,     # Tokens échangés attendus par durée de vie de refresh token
+    'ERROR_RATE': 0.001,    # Taux de faux positifs du filtre à pleine capacité
+    'PURGE_INTERVAL': 300,  # Délai (s) entre deux purges des entrées expirées
+}
+
+conf = {**DEFAULTS, **getattr(settings, 'SOFTDESK_TOKEN_BLACKLIST', {})}
+
+
+# SQLite (3.24+) et PostgreSQL : une seule requête, aucune ligne si déjà échangé
+INSERT_SQL = 'INSERT INTO {table} ({jti}, {expires_at}) VALUES (%s, %s) ON CONFLICT DO NOTHING'
+
+
+class BloomFilter:
+    """Filtre de Bloom : ni faux négatif, faux positifs bornés par ``error_rate``."""
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, key):
+        # Double hachage (Kirsch-Mitzenmacher) : k positions depuis une seule empreinte
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        positions = self._positions(key)
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RefreshTokenBlacklist:
+    """Filtre de Bloom local devant la table ``BlacklistedRefreshToken``."""
+
+    def __init__(self, capacity, error_rate, purge_interval):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.purge_interval = purge_interval
+        self._reset()
+        # Le thread de purge ne survit pas à un fork (workers gunicorn)
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._bloom = BloomFilter(self.capacity, self.error_rate)
+        self._lock = threading.Lock()
+        self._started = False
+
+    def _start(self):
+        """Premier appel du processus : filtre chargé depuis la table, en arrière-plan."""
+        if self._started:
+            return
+        with self._lock:
+            if not self._started:
+                self._started = True
+                self._schedule(0)
+
+    def _schedule(self, delay):
+        timer = threading.Timer(delay, self._purge_in_thread)
+        timer.daemon = True
+        timer.start()
+
+    def contains(self, jti):
+        """Le token a-t-il déjà été échangé ? (base consultée seulement si le filtre le croit)"""
+        self._start()
+        if jti not in self._bloom:
+            return False
+        return BlacklistedRefreshToken.objects.filter(pk=jti).exists()
+
+    def add(self, jti, exp):
+        """Ajoute le token échangé ; False s'il l'avait déjà été (par ce processus ou un autre)."""
+        self._bloom.add(jti)
+        # Conflit ignoré par la base plutôt qu'une IntegrityError, qui rendrait
+        # inutilisable la transaction en cours (ATOMIC_REQUESTS, tests)
+        opts, qn = BlacklistedRefreshToken._meta, connection.ops.quote_name
+        expires_field = opts.get_field('expires_at')
+        sql = INSERT_SQL.format(
+            table=qn(opts.db_table), jti=qn(opts.pk.column), expires_at=qn(expires_field.column)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [jti, expires_field.get_db_prep_value(datetime_from_epoch(exp), connection)])
+            return cursor.rowcount == 1
+
+    def _purge_in_thread(self):
+        try:
+            self.purge()
+        except Exception:
+            logger.exception("Purge de la liste noire des refresh tokens impossible")
+        finally:
+            connection.close()  # Connexion propre au thread de purge
+            self._schedule(self.purge_interval)
+
+    def purge(self):
+        """Supprime les entrées expirées (un seul ``DELETE``) et reconstruit le filtre."""
+        deleted, _ = BlacklistedRefreshToken.objects.filter(expires_at__lte=timezone.now()).delete()
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        for jti in BlacklistedRefreshToken.objects.values_list('jti', flat=True).iterator(chunk_size=5000):
+            bloom.add(jti)
+        # Échanges faits pendant la reconstruction : déjà en base, l'INSERT les refusera
+        self._bloom = bloom
+        return deleted
+
+
+refresh_blacklist = RefreshTokenBlacklist(conf['CAPACITY'], conf['ERROR_RATE'], conf['PURGE_INTERVAL'])
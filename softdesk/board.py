@@ -0,0 +1,81 @@
+"""
+Statistiques du tableau d'un projet (Green Code)
+
+``GET /projects/{id}/board-stats/`` renvoie le nombre d'issues par statut,
+priorité, tag et assigné, calculés en une seule requête ``GROUP BY``
+(status, priority, tag, assigned_to) puis répartis en Python : le nombre
+de groupes est borné par les choix du modèle et les contributeurs, jamais
+par le nombre d'issues.
+
+Le résultat est mis en cache pour la version du projet (voir
+``versioning.py``) : toute écriture sur les issues la fait avancer, l'entrée
+précédente n'est plus lue et expire d'elle-même. Tous les contributeurs
+partagent la même entrée.
+"""
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import Issue
+
+KEY_PREFIX = 'softdesk:board'
+# Borne aussi la durée d'un nom d'assigné périmé (renommage sans écriture sur les issues)
+TIMEOUT = 3600
+
+GROUP_FIELDS = ('status', 'priority', 'tag', 'assigned_to', 'assigned_to__username')
+
+
+def _key(project_id, version):
+    return f"{KEY_PREFIX}:{project_id}:{version}"
+
+
+def board_queryset(project_id):
+    return Issue.objects.filter(project_id=project_id).values(*GROUP_FIELDS).annotate(
+        count=Count('pk')
+    ).order_by()
+
+
+def summarize(project_id, rows):
+    """Répartit les lignes du ``GROUP BY`` par statut, priorité, tag et assigné."""
+    stats = {
+        'project': project_id,
+        'total': 0,
+        'status': dict.fromkeys((value for value, _ in Issue.STATUS_CHOICES), 0),
+        'priority': dict.fromkeys((value for value, _ in Issue.PRIORITY_CHOICES), 0),
+        'tag': dict.fromkeys((value for value, _ in Issue.TAG_CHOICES), 0),
+    }
+    assignees = {}
+    for row in rows:
+        count = row['count']
+        stats['total'] += count
+        for field in ('status', 'priority', 'tag'):
+            stats[field][row[field]] = stats[field].get(row[field], 0) + count
+        assignee = assignees.setdefault(row['assigned_to'], {
+            'id': row['assigned_to'], 'username': row['assigned_to__username'], 'count': 0,
+        })
+        assignee['count'] += count
+    # Les plus chargés d'abord, les issues non assignées (id None) en dernier
+    stats['assignees'] = sorted(
+        assignees.values(),
+        key=lambda assignee: (assignee['id'] is None, -assignee['count'], assignee['id'] or 0),
+    )
+    return stats
+
+
+def get_board_stats(project_id, version):
+    """Statistiques du projet pour sa ``version`` courante (cache, sinon une requête)."""
+    key = _key(project_id, version)
+    stats = cache.get(key)
+    if stats is None:
+        stats = summarize(project_id, board_queryset(project_id))
+        cache.set(key, stats, TIMEOUT)
+    return stats
+
+
+async def aget_board_stats(project_id, version):
+    """Variante async de ``get_board_stats``."""
+    key = _key(project_id, version)
+    stats = await cache.aget(key)
+    if stats is None:
+        stats = summarize(project_id, [row async for row in board_queryset(project_id)])
+        await cache.aset(key, stats, TIMEOUT)
+    return stats
@@ -0,0 +1,51 @@
+"""
+Caches partagés entre processus (Green Code)
+
+Les versions des projets (ETag, clés du cache des réponses), le cache des
+appartenances, l'adhérence aux réplicas et les compteurs de limites partagés
+vivent dans des caches Django. Avec plusieurs processus, un cache local
+(``LocMemCache``) laisserait chaque worker servir des réponses et des
+permissions périmées après une écriture faite dans un autre : un contributeur
+retiré garderait l'accès au projet jusqu'à l'expiration de l'entrée.
+
+``SOFTDESK_WORKERS`` donne le nombre de processus qui servent l'API : au-delà
+de 1, le démarrage est refusé si l'un de ces caches est local au processus
+(profils ``redis`` ou ``database`` de ``SOFTDESK_CACHE_PROFILE``).
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+LOCAL_BACKENDS = {'django.core.cache.backends.locmem.LocMemCache'}
+
+
+def shared_cache_aliases():
+    """Alias de ``CACHES`` à partager entre processus, avec leur usage."""
+    from . import throttling
+    from .response_cache import response_cache
+
+    aliases = {'default': "versions des projets, appartenances, réplicas"}
+    if response_cache.enabled:
+        aliases.setdefault(response_cache.conf['ALIAS'], "cache des réponses")
+    if throttling.conf['SHARED_CACHE']:
+        aliases.setdefault(throttling.conf['SHARED_CACHE'], "limites de débit")
+    return aliases
+
+
+def local_caches():
+    """Caches locaux au processus alors que plusieurs processus servent l'API."""
+    if getattr(settings, 'SOFTDESK_WORKERS', 1) <= 1:
+        return []
+    return [
+        f"{alias} ({usage})" for alias, usage in shared_cache_aliases().items()
+        if settings.CACHES[alias]['BACKEND'] in LOCAL_BACKENDS
+    ]
+
+
+def check_shared_caches():
+    """Appelé au démarrage (``apps.py``) : refuse un cache local avec plusieurs processus."""
+    problems = local_caches()
+    if problems:
+        raise ImproperlyConfigured(
+            f"{settings.SOFTDESK_WORKERS} processus (SOFTDESK_WORKERS) avec des caches locaux : "
+            f"{', '.join(problems)}. Choisir SOFTDESK_CACHE_PROFILE=redis ou database."
+        )
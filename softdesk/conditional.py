@@ -0,0 +1,101 @@
+"""
+Requêtes GET conditionnelles (ETag / Last-Modified)
+
+Les validateurs sont calculés sans sérialiser les données :
+- liste : ``COUNT`` et ``MAX(updated_time)`` sur le queryset de la vue ;
+- détail : l'objet déjà chargé pour les permissions ;
+plus, dans les deux cas, les versions des projets concernés (voir
+``versioning.py``), qui couvrent les suppressions et les données jointes.
+
+Si ``If-None-Match`` / ``If-Modified-Since`` correspondent, la réponse est
+un ``304`` et le serializer n'est jamais appelé.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from .membership import membership_cache
+from .versioning import get_project_versions, version_timestamp
+
+
+class ConditionalGetMixin:
+    """À combiner avec un ``ModelViewSet`` : surcharge ``list`` et ``retrieve``."""
+    last_modified_field = 'updated_time'
+    # Paramètre d'URL portant le projet (``pk`` pour les projets eux-mêmes)
+    project_url_kwarg = 'project_pk'
+
+    def get_version_project_ids(self):
+        """
+        Projets dont la version entre dans les validateurs, déduits de l'URL
+        et du cache des appartenances, sans requête SQL : le projet de l'URL
+        ou, à défaut, tous ceux de l'utilisateur.
+        """
+        project_pk = self.kwargs.get(self.project_url_kwarg)
+        if project_pk is None:
+            return membership_cache.project_ids(self.request.user)
+        try:
+            return [int(project_pk)]
+        except ValueError:
+            return []
+
+    def get_validator_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_validators(self, parts, project_ids):
+        return self.make_validators(parts, get_project_versions(project_ids))
+
+    def make_validators(self, parts, versions):
+        """ETag et date de dernière modification à partir des versions déjà lues."""
+        timestamps = [version_timestamp(version) for version in versions.values()]
+        timestamps += [part.timestamp() for part in parts if hasattr(part, 'timestamp')]
+
+        raw = '|'.join([
+            self.request.get_full_path(),
+            str(self.request.user.pk),
+            *map(str, parts),
+            *(f'{key}:{versions[key]}' for key in sorted(versions)),
+        ])
+        etag = quote_etag(hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest())
+        last_modified = int(max(timestamps)) if timestamps else None
+        return etag, last_modified
+
+    def conditional_response(self, request, validators, build_response):
+        etag, last_modified = validators
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            return not_modified
+        return self.add_validators(build_response(), validators)
+
+    def add_validators(self, response, validators):
+        etag, last_modified = validators
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        parent = super()
+        aggregate = self.get_validator_queryset().aggregate(
+            total=Count('pk'), last=Max(self.last_modified_field)
+        )
+        validators = self.get_validators(
+            [aggregate['total'], aggregate['last']], self.get_version_project_ids()
+        )
+        return self.conditional_response(
+            request, validators, lambda: parent.list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        validators = self.get_validators(
+            [instance.pk, getattr(instance, self.last_modified_field)],
+            self.get_version_project_ids(),
+        )
+        return self.conditional_response(
+            request, validators, lambda: Response(self.get_serializer(instance).data)
+        )
@@ -0,0 +1,92 @@
+"""
+Compteurs dénormalisés (Green Code)
+
+``Project.contributors_count``, ``issues_count``, ``open_issues_count`` et
+``Issue.comments_count`` sont stockés et maintenus par des ``UPDATE``
+atomiques en ``F()`` dans les chemins de création et de suppression
+(signaux de ``signals.py`` et écritures groupées de ``views.py``).
+
+``recount()`` recalcule tout en une requête par modèle et répare les écarts
+(commande ``python manage.py recount_counters``).
+"""
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Comment, Contributor, Issue, Project
+
+
+def _delta(field, value):
+    # Ne jamais descendre sous zéro, même si le compteur a dérivé
+    if value >= 0:
+        return F(field) + value
+    return Greatest(F(field) + value, Value(0))
+
+
+def adjust_project(project_id, contributors=0, issues=0, open_issues=0):
+    updates = {
+        field: _delta(field, value)
+        for field, value in (
+            ('contributors_count', contributors),
+            ('issues_count', issues),
+            ('open_issues_count', open_issues),
+        )
+        if value
+    }
+    if updates and project_id is not None:
+        Project.objects.filter(pk=project_id).update(**updates)
+
+
+def adjust_issue(issue_id, comments=0):
+    if comments and issue_id is not None:
+        Issue.objects.filter(pk=issue_id).update(comments_count=_delta('comments_count', comments))
+
+
+def count_contributors(project_id):
+    """Recompte ``contributors_count`` d'un projet à partir des lignes existantes."""
+    Project.objects.filter(pk=project_id).update(
+        contributors_count=expected_project_counters()['contributors_count']
+    )
+
+
+def _count_subquery(queryset, group_field):
+    subquery = queryset.order_by().values(group_field).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), 0)
+
+
+def expected_project_counters():
+    return {
+        'contributors_count': _count_subquery(
+            Contributor.objects.filter(project=OuterRef('pk')), 'project'),
+        'issues_count': _count_subquery(
+            Issue.objects.filter(project=OuterRef('pk')), 'project'),
+        'open_issues_count': _count_subquery(
+            Issue.objects.filter(project=OuterRef('pk')).exclude(status=Issue.CLOSED_STATUS), 'project'),
+    }
+
+
+def expected_issue_counters():
+    return {
+        'comments_count': _count_subquery(Comment.objects.filter(issue=OuterRef('pk')), 'issue'),
+    }
+
+
+def _drifted(model, expected):
+    annotations = {f'expected_{field}': value for field, value in expected.items()}
+    mismatch = Q()
+    for field in expected:
+        mismatch |= ~Q(**{field: F(f'expected_{field}')})
+    return model.objects.annotate(**annotations).filter(mismatch)
+
+
+def recount(dry_run=False):
+    """
+    Recalcule les compteurs et retourne le nombre de lignes en écart par modèle.
+    Avec ``dry_run``, se contente de compter les écarts.
+    """
+    report = {}
+    for model, expected in ((Project, expected_project_counters()), (Issue, expected_issue_counters())):
+        drifted = _drifted(model, expected)
+        report[model._meta.model_name] = drifted.count()
+        if not dry_run and report[model._meta.model_name]:
+            model.objects.filter(pk__in=drifted.values('pk')).update(**expected)
+    return report
@@ -0,0 +1,46 @@
+"""
+Réglage des connexions à la base (Green Code)
+
+Le profil de base (``SOFTDESK_DB_PROFILE`` : ``sqlite`` ou ``postgresql``)
+est choisi dans ``config/settings.py`` à partir de l'environnement.
+
+``configure_connection`` est branché sur ``connection_created`` (voir
+``apps.py``) : chaque nouvelle connexion SQLite reçoit les PRAGMA de
+``DEFAULTS``, complétés ou remplacés par ``SOFTDESK_SQLITE_PRAGMAS`` (une
+valeur ``None`` retire un PRAGMA), une fois pour toute sa durée de vie
+(``CONN_MAX_AGE``) :
+- ``journal_mode=wal`` : les lectures ne bloquent plus l'écriture, ni l'inverse ;
+- ``synchronous=normal`` : en WAL, pas de fsync à chaque commit (sûr en cas
+  d'arrêt du processus, seul un arrêt du système peut perdre le dernier commit) ;
+- ``mmap_size`` : lectures par la mémoire projetée, sans copie ;
+- ``cache_size`` : cache de pages par connexion (négatif : en Kio) ;
+- ``busy_timeout`` : attente d'un verrou (ms) au lieu d'un « database is locked ».
+
+Le profil PostgreSQL n'a rien à régler ici : connexions persistantes et
+vérification de leur état passent par ``CONN_MAX_AGE`` et ``CONN_HEALTH_CHECKS``.
+"""
+from django.conf import settings
+
+# busy_timeout d'abord : le passage en WAL attend les autres connexions
+DEFAULTS = {
+    'busy_timeout': 15000,
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -16 * 1024,
+}
+
+
+def sqlite_pragmas():
+    # Lu à chaque connexion : suit override_settings (benchmark database)
+    pragmas = {**DEFAULTS, **getattr(settings, 'SOFTDESK_SQLITE_PRAGMAS', {})}
+    return {name: value for name, value in pragmas.items() if value is not None}
+
+
+def configure_connection(sender, connection, **kwargs):
+    """Applique les PRAGMA du profil à une nouvelle connexion SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    # Connexion sqlite3 brute : ni journalisation des requêtes ni transaction
+    for name, value in sqlite_pragmas().items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,192 @@
+"""
+Jeu de données synthétique et reproductible, remise à zéro (Green Code)
+
+``generate()`` remplit la base par lots de ``bulk_create`` : utilisateurs,
+projets, contributeurs, issues et commentaires, tirés d'un générateur
+aléatoire initialisé par ``seed`` (même graine, mêmes données). Seuls les
+identifiants sont gardés en mémoire (tableaux d'entiers), jamais les objets :
+la taille du jeu n'est bornée que par la base.
+
+Le mot de passe ``PASSWORD`` est haché une seule fois pour tous les
+utilisateurs. ``bulk_create`` n'émet pas de signal : les compteurs
+dénormalisés sont recalculés à la fin (``counters.recount``) ; l'index de
+recherche est tenu à jour par ses triggers. Le tout dans une transaction :
+en cas d'erreur, rien n'est écrit.
+
+``reset()`` vide les tables par des ``DELETE`` directs, sans passer par le
+collecteur de Django (qui charge chaque ligne pour les cascades et les
+signaux) : un ``DELETE`` par table, dans l'ordre des dépendances. Les
+superutilisateurs sont gardés.
+"""
+import random
+import uuid
+from array import array
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, connections, reset_queries, transaction
+
+from .counters import recount
+from .models import Comment, Contributor, Issue, Project, User
+
+PASSWORD = 'SoftDesk-pass-123'
+
+WORDS = (
+    'serveur', 'client', 'connexion', 'base', 'requête', 'cache', 'page', 'liste', 'export',
+    'erreur', 'lenteur', 'affichage', 'bouton', 'formulaire', 'compte', 'profil', 'projet',
+    'ticket', 'commentaire', 'recherche', 'filtre', 'tri', 'mobile', 'android', 'ios',
+    'interface', 'menu', 'notification', 'courriel', 'mot', 'passe', 'jeton', 'session',
+    'migration', 'index', 'mémoire', 'disque', 'réseau', 'délai', 'timeout', 'version',
+    'déploiement', 'test', 'correctif', 'régression', 'documentation', 'traduction',
+    'image', 'fichier', 'import', 'sauvegarde', 'restauration', 'droits', 'accès',
+    'tableau', 'statistiques', 'graphique', 'calendrier', 'date', 'fuseau',
+)
+
+# Répartitions réalistes : surtout des issues ouvertes, peu de priorités hautes
+STATUS_WEIGHTS = (('To Do', 5), ('In Progress', 3), ('Finished', 2))
+PRIORITY_WEIGHTS = (('LOW', 3), ('MEDIUM', 5), ('HIGH', 2))
+TAG_WEIGHTS = (('BUG', 4), ('FEATURE', 3), ('TASK', 3))
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def sentence(rng, low, high):
+    return ' '.join(rng.choices(WORDS, k=rng.randint(low, high)))
+
+
+def weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def insert(model, objects, batch_size, progress=None):
+    """``bulk_create`` par lots ; retourne les clés primaires créées, dans l'ordre."""
+    pks = array('q')
+    with transaction.atomic():
+        for batch in batched(objects, batch_size):
+            pks.extend(obj.pk for obj in model.objects.bulk_create(batch))
+            # Avec DEBUG, le journal garderait chaque requête avec toutes ses valeurs
+            reset_queries()
+            if progress is not None:
+                progress(model, len(pks))
+    return pks
+
+
+def reset(using=DEFAULT_DB_ALIAS):
+    """
+    Supprime commentaires, issues, contributeurs, projets et utilisateurs
+    (hors superutilisateurs) ; retourne le nombre de lignes supprimées par modèle.
+    Sans signal : les caches de l'API ne sont pas invalidés.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    tables = (Comment, Issue, Contributor, Project)
+    user_table = qn(User._meta.db_table)
+    not_superuser = f"{qn(User._meta.get_field('is_superuser').column)} = %s"
+    users = f'SELECT {qn(User._meta.pk.column)} FROM {user_table} WHERE {not_superuser}'
+
+    deleted = {}
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        def delete(table, where='', params=()):
+            cursor.execute(f'DELETE FROM {qn(table)}{where}', params)
+            return cursor.rowcount
+
+        if connection.vendor == 'sqlite':
+            # Index vidé d'un coup : les triggers de suppression ne trouvent plus rien à retirer
+            delete('softdesk_search')
+        for model in tables:
+            deleted[model._meta.model_name] = delete(model._meta.db_table)
+
+        # Autres tables liées aux utilisateurs : journal de l'admin, groupes, permissions
+        for relation in User._meta.related_objects:
+            if relation.related_model not in tables and not relation.many_to_many:
+                delete(relation.related_model._meta.db_table,
+                       f' WHERE {qn(relation.field.column)} IN ({users})', [False])
+        for field in User._meta.many_to_many:
+            delete(field.remote_field.through._meta.db_table,
+                   f' WHERE {qn(field.m2m_column_name())} IN ({users})', [False])
+        deleted['user'] = delete(User._meta.db_table, f' WHERE {not_superuser}', [False])
+    return deleted
+
+
+@transaction.atomic
+def generate(users=50, projects=20, contributors=10, issues=2000, comments=10000,
+             seed=0, batch_size=5000, username_prefix='user', progress=None):
+    """
+    Crée le jeu de données et retourne le nombre de lignes par modèle.
+    ``contributors`` : contributeurs par projet, en plus de l'auteur.
+    ``progress(model, count)`` est appelé après chaque lot.
+    """
+    rng = random.Random(seed)
+    password = make_password(PASSWORD)
+
+    user_ids = insert(User, (
+        User(
+            username=f'{username_prefix}{index}', email=f'{username_prefix}{index}@example.com',
+            password=password, age=rng.randint(15, 80),
+            can_be_contacted=rng.random() < 0.5, can_data_be_shared=rng.random() < 0.3,
+        )
+        for index in range(users)
+    ), batch_size, progress)
+
+    authors = [rng.choice(user_ids) for _ in range(projects)]
+    project_ids = insert(Project, (
+        Project(
+            name=f'Projet {index} {sentence(rng, 1, 3)}', description=sentence(rng, 10, 40),
+            type=rng.choice(Project.TYPE_CHOICES)[0], author_id=authors[index],
+        )
+        for index in range(projects)
+    ), batch_size, progress)
+
+    # Membres de chaque projet : l'auteur d'abord
+    members = []
+    for author_id in authors:
+        others = rng.sample(user_ids, min(contributors + 1, len(user_ids)))
+        members.append(array('q', [author_id] + [pk for pk in others if pk != author_id][:contributors]))
+    insert(Contributor, (
+        Contributor(user_id=user_id, project_id=project_id)
+        for project_id, project_members in zip(project_ids, members)
+        for user_id in project_members
+    ), batch_size, progress)
+
+    # Projet (indice) de chaque issue, pour choisir les auteurs des commentaires
+    issue_projects = array('l')
+
+    def issue(index):
+        project = rng.randrange(projects)
+        issue_projects.append(project)
+        project_members = members[project]
+        return Issue(
+            name=f'Issue {index} {sentence(rng, 2, 5)}', description=sentence(rng, 10, 60),
+            project_id=project_ids[project], author_id=rng.choice(project_members),
+            assigned_to_id=rng.choice(project_members) if rng.random() < 0.7 else None,
+            status=weighted(rng, STATUS_WEIGHTS), priority=weighted(rng, PRIORITY_WEIGHTS),
+            tag=weighted(rng, TAG_WEIGHTS),
+        )
+
+    issue_ids = insert(Issue, (issue(index) for index in range(issues if projects else 0)),
+                       batch_size, progress)
+
+    def comment():
+        index = rng.randrange(len(issue_ids))
+        return Comment(
+            uuid=uuid.UUID(int=rng.getrandbits(128), version=4),
+            description=sentence(rng, 5, 30), issue_id=issue_ids[index],
+            author_id=rng.choice(members[issue_projects[index]]),
+        )
+
+    comment_ids = insert(Comment, (comment() for _ in range(comments if issue_ids else 0)),
+                         batch_size, progress)
+
+    recount()
+    return {
+        'users': len(user_ids),
+        'projects': len(project_ids),
+        'contributors': sum(len(project_members) for project_members in members),
+        'issues': len(issue_ids),
+        'comments': len(comment_ids),
+    }
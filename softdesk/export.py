@@ -0,0 +1,180 @@
+"""
+Export en flux d'un projet (Green Code)
+
+``GET /projects/{id}/export/?format=ndjson|csv`` envoie les issues puis les
+commentaires du projet sous forme de ``StreamingHttpResponse`` :
+- lecture par paquets de ``CHUNK_SIZE`` lignes (``.iterator()`` /
+  ``.aiterator()``), en dictionnaires (``values``), sans instances de modèles ;
+- envoi par morceaux d'environ ``FLUSH_SIZE`` octets, le premier dès la
+  première ligne.
+La mémoire utilisée reste donc constante, quelle que soit la taille du projet.
+
+Sous ASGI, la vue async (voir ``async_views.py``) utilise ``aiter_chunks`` :
+Django garderait sinon en mémoire tout le contenu d'un itérateur synchrone.
+"""
+import csv
+import io
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.fields import DateTimeField
+
+from .models import Comment, Issue
+from .renderers import json_dumps
+
+CHUNK_SIZE = 2000       # Lignes lues par aller-retour vers la base
+FLUSH_SIZE = 64 * 1024  # Octets envoyés par morceau
+
+# (colonne exportée, champ lu en base)
+ISSUE_FIELDS = (
+    ('id', 'id'),
+    ('name', 'name'),
+    ('description', 'description'),
+    ('priority', 'priority'),
+    ('tag', 'tag'),
+    ('status', 'status'),
+    ('author', 'author__username'),
+    ('assigned_to', 'assigned_to__username'),
+    ('comments_count', 'comments_count'),
+    ('created_time', 'created_time'),
+    ('updated_time', 'updated_time'),
+)
+COMMENT_FIELDS = (
+    ('id', 'id'),
+    ('uuid', 'uuid'),
+    ('issue', 'issue_id'),
+    ('description', 'description'),
+    ('author', 'author__username'),
+    ('created_time', 'created_time'),
+    ('updated_time', 'updated_time'),
+)
+# Colonnes du CSV : une ligne par issue ou commentaire, distingués par ``type``
+CSV_COLUMNS = ['type'] + list(dict.fromkeys(
+    name for name, _ in ISSUE_FIELDS + COMMENT_FIELDS
+))
+DATE_COLUMNS = ('created_time', 'updated_time')
+
+
+def issue_rows(project_id):
+    # Parcours de l'index (project, created_time, id) : pas de tri
+    return Issue.objects.filter(project_id=project_id).order_by(
+        'created_time', 'id'
+    ).values(*(field for _, field in ISSUE_FIELDS))
+
+
+def comment_rows(project_id):
+    # Issues dans l'ordre de l'index (project, created_time, id), puis leurs
+    # commentaires : tri limité aux commentaires d'une même issue, jamais au projet
+    return Comment.objects.filter(issue__project_id=project_id).order_by(
+        'issue__created_time', 'issue_id', 'created_time', 'id'
+    ).values(*(field for _, field in COMMENT_FIELDS))
+
+
+class NDJSONFormat:
+    """Un objet JSON par ligne (dates et UUID rendus comme par l'API)."""
+    extension = 'ndjson'
+    content_type = 'application/x-ndjson'
+
+    def header(self):
+        return b''
+
+    def row(self, row):
+        return json_dumps(row) + b'\n'
+
+
+class CSVFormat:
+    """En-tête puis une ligne par objet ; colonnes absentes laissées vides."""
+    extension = 'csv'
+    content_type = 'text/csv; charset=utf-8'
+
+    def __init__(self):
+        self.buffer = io.StringIO()
+        self.writer = csv.DictWriter(self.buffer, CSV_COLUMNS)
+
+    def header(self):
+        self.writer.writeheader()
+        return self.drain()
+
+    def row(self, row):
+        self.writer.writerow(row)
+        return self.drain()
+
+    def drain(self):
+        data = self.buffer.getvalue().encode('utf-8')
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+
+FORMATS = {'ndjson': NDJSONFormat, 'csv': CSVFormat}
+
+
+class ProjectExport:
+    """Itérateurs d'octets (sync et async) pour l'export d'un projet."""
+
+    def __init__(self, project, export_format):
+        self.project = project
+        self.format = FORMATS[export_format]()
+        # Dates rendues comme par l'API ; fuseau résolu une fois pour tout l'export
+        self.datetime_field = DateTimeField(default_timezone=timezone.get_current_timezone())
+
+    @property
+    def content_type(self):
+        return self.format.content_type
+
+    @property
+    def filename(self):
+        return f'project-{self.project.pk}.{self.format.extension}'
+
+    def response(self, chunks):
+        response = StreamingHttpResponse(chunks, content_type=self.content_type)
+        response['Content-Disposition'] = f'attachment; filename="{self.filename}"'
+        # Pas de mise en tampon par un proxy nginx : les octets partent tout de suite
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def sources(self):
+        return (
+            ('issue', ISSUE_FIELDS, issue_rows(self.project.pk)),
+            ('comment', COMMENT_FIELDS, comment_rows(self.project.pk)),
+        )
+
+    def encode(self, kind, fields, values):
+        row = {'type': kind}
+        for name, field in fields:
+            value = values[field]
+            if name in DATE_COLUMNS and value is not None:
+                value = self.datetime_field.to_representation(value)
+            row[name] = value
+        return self.format.row(row)
+
+    def iter_chunks(self):
+        pending = [self.format.header()]
+        size = len(pending[0])
+        first = True
+        for kind, fields, queryset in self.sources():
+            for values in queryset.iterator(chunk_size=CHUNK_SIZE):
+                data = self.encode(kind, fields, values)
+                pending.append(data)
+                size += len(data)
+                if first or size >= FLUSH_SIZE:
+                    yield b''.join(pending)
+                    pending, size, first = [], 0, False
+        if size:
+            yield b''.join(pending)
+
+    async def aiter_chunks(self):
+        # Même découpage que iter_chunks, avec l'ORM async
+        pending = [self.format.header()]
+        size = len(pending[0])
+        first = True
+        for kind, fields, queryset in self.sources():
+            async for values in queryset.aiterator(chunk_size=CHUNK_SIZE):
+                data = self.encode(kind, fields, values)
+                pending.append(data)
+                size += len(data)
+                if first or size >= FLUSH_SIZE:
+                    yield b''.join(pending)
+                    pending, size, first = [], 0, False
+        if size:
+            yield b''.join(pending)
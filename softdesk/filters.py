@@ -0,0 +1,159 @@
+"""
+Filtres et tri déclaratifs adossés aux index (Green Code)
+
+Un ViewSet déclare ses filtres d'égalité (``index_filters``), la portée de
+ses routes imbriquées (``index_scope`` : clé de l'URL et champ du modèle)
+et ses tris (``index_orderings``). ``IndexedFilterBackend`` n'accepte une
+combinaison que si un index composite du modèle la couvre exactement :
+
+    [portée] + [filtres, dans n'importe quel ordre] + [colonnes du tri]
+
+La requête se résout alors par une lecture d'index ordonnée, sans tri ni
+parcours de table. Toute autre combinaison est refusée (400) avec la liste
+de celles qui sont possibles. Les combinaisons se déduisent de
+``Meta.indexes`` : ajouter un index suffit à en ouvrir une nouvelle.
+
+Les tests (``IndexedFilterPlanTests``, ``python manage.py test softdesk``)
+vérifient le plan de chaque combinaison déclarée, dans les deux sens de tri ;
+``python manage.py explain_queries --fail-on-scan`` fait de même sur une
+base remplie.
+"""
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+# Clés primaires (BigAutoField) : entier signé 64 bits, au-delà l'adaptateur de la base lève OverflowError
+MAX_ID = 2 ** 63 - 1
+
+
+def parse_id(raw):
+    """Identifiant en chiffres ASCII, dans les bornes d'une clé primaire ; None sinon."""
+    raw = str(raw).strip()
+    if not (raw.isascii() and raw.isdigit()):
+        return None
+    value = int(raw)
+    return value if value <= MAX_ID else None
+
+
+class ChoiceFilter:
+    """Égalité sur un champ à choix (``?status=To Do``)."""
+
+    def __init__(self, field, choices):
+        self.field = field
+        self.values = [value for value, _ in choices]
+
+    def lookup(self, name, raw):
+        if raw not in self.values:
+            raise ValidationError({name: f"Valeurs possibles : {', '.join(self.values)}."})
+        return {self.field: raw}
+
+    def example(self, user):
+        return self.values[0]
+
+
+class RelatedFilter:
+    """Égalité sur une clé étrangère par id (``?author=3``), ``none`` si ``nullable``."""
+
+    def __init__(self, field, nullable=False):
+        self.field = field
+        self.nullable = nullable
+
+    def lookup(self, name, raw):
+        if self.nullable and raw == 'none':
+            return {self.field: None}
+        value = parse_id(raw)
+        if value is None:
+            raise ValidationError({name: "Identifiant attendu" + (" ou 'none'." if self.nullable else ".")})
+        return {f'{self.field}_id': value}
+
+    def example(self, user):
+        return str(user.pk)
+
+
+class IndexedFilterBackend(BaseFilterBackend):
+    """Applique les filtres et le tri déclarés par la vue (action ``list`` seulement)."""
+    ordering_param = 'ordering'
+
+    def filter_queryset(self, request, queryset, view):
+        if getattr(view, 'action', None) != 'list':
+            return queryset
+        filters = getattr(view, 'index_filters', {})
+
+        lookups, fields = {}, []
+        for name, index_filter in filters.items():
+            raw = request.query_params.get(name)
+            if raw is not None:
+                lookups.update(index_filter.lookup(name, raw))
+                fields.append(index_filter.field)
+        ordering = self.get_ordering(request, view)
+        scope = self.get_scope(view)
+
+        columns = [column.lstrip('-') for column in ordering]
+        if not covering_index(queryset.model, scope, fields, columns):
+            combinations = [
+                '+'.join(combination) or '(aucun filtre)'
+                for combination in supported_combinations(view, queryset.model, scope, columns)
+            ]
+            raise ValidationError({'detail': (
+                "Combinaison de filtres sans index : "
+                f"{'+'.join(sorted(name for name in filters if name in request.query_params))}. "
+                f"Combinaisons possibles : {', '.join(combinations)}."
+            )})
+        return queryset.filter(**lookups).order_by(*ordering)
+
+    def get_scope(self, view):
+        """Champ de la portée (``['project']``) si la route imbriquée la fournit."""
+        scope = getattr(view, 'index_scope', None)
+        if scope is None:
+            return []
+        url_kwarg, field = scope
+        return [field] if view.kwargs.get(url_kwarg) is not None else []
+
+    def get_ordering(self, request, view):
+        orderings = getattr(view, 'index_orderings', {})
+        if not orderings:
+            return ()
+        name = request.query_params.get(self.ordering_param)
+        if name is None:
+            return next(iter(orderings.values()))
+        if name not in orderings:
+            raise ValidationError({self.ordering_param: f"Valeurs possibles : {', '.join(orderings)}."})
+        return orderings[name]
+
+    def get_schema_operation_parameters(self, view):
+        parameters = [
+            {'name': name, 'required': False, 'in': 'query', 'schema': {'type': 'string'}}
+            for name in getattr(view, 'index_filters', {})
+        ]
+        if getattr(view, 'index_orderings', None):
+            parameters.append({
+                'name': self.ordering_param, 'required': False, 'in': 'query',
+                'schema': {'type': 'string', 'enum': list(view.index_orderings)},
+            })
+        return parameters
+
+
+def covering_index(model, scope, fields, columns):
+    """Index dont les colonnes sont exactement portée + filtres + tri, ou None."""
+    size = len(scope) + len(fields)
+    for index in model._meta.indexes:
+        index_fields = [field.lstrip('-') for field in index.fields]
+        if (index_fields[:len(scope)] == scope
+                and sorted(index_fields[len(scope):size]) == sorted(fields)
+                and index_fields[size:] == columns):
+            return index
+    return None
+
+
+def supported_combinations(view, model, scope, columns):
+    """Combinaisons de paramètres de ``view.index_filters`` couvertes par un index."""
+    params = {index_filter.field: name for name, index_filter in view.index_filters.items()}
+    combinations = []
+    for index in model._meta.indexes:
+        index_fields = [field.lstrip('-') for field in index.fields]
+        if (index_fields[:len(scope)] != scope
+                or index_fields[len(index_fields) - len(columns):] != columns):
+            continue
+        middle = index_fields[len(scope):len(index_fields) - len(columns)]
+        if all(field in params for field in middle):
+            combinations.append(tuple(sorted(params[field] for field in middle)))
+    return sorted(set(combinations), key=lambda combination: (len(combination), combination))
@@ -0,0 +1,69 @@
+"""
+Micro-benchmarks de l'API, exécutés sur une base de test jetable.
+
+    python manage.py benchmark pagination --issues 100010
+    python manage.py benchmark membership --projects 300
+    python manage.py benchmark auth --repeat 500
+    python manage.py benchmark asgi --concurrency 32 --wsgi-threads 4 --db-latency 5
+    python manage.py benchmark fields --issues 2000 --page-size 100
+    python manage.py benchmark renderers --repeat 200
+    python manage.py benchmark export --issues 20000
+    python manage.py benchmark search --comments 1000000
+    python manage.py benchmark board --issues 20000
+    python manage.py benchmark database --concurrency 16 --requests 4000
+    python manage.py benchmark login --logins 50 --wsgi-threads 8
+    python manage.py benchmark refresh --repeat 200
+    python manage.py benchmark throttling --concurrency 256 --db-latency 5
+
+Un module par scénario dans ``softdesk/benchmarks/``.
+"""
+import os
+import tempfile
+from importlib import import_module
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment
+
+from softdesk import throttling
+from softdesk.benchmarks import FILE_SCENARIOS, SCENARIOS
+from softdesk.benchmarks.harness import Bench
+
+
+class Command(BaseCommand):
+    help = "Lance un micro-benchmark sur une base de test jetable"
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenario', choices=SCENARIOS)
+        parser.add_argument('--issues', type=int, default=100010)
+        parser.add_argument('--page-size', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--projects', type=int, default=300)
+        parser.add_argument('--contributors', type=int, default=20,
+                            help="Contributeurs supplémentaires par projet")
+        parser.add_argument('--concurrency', type=int, default=32,
+                            help="Clients simultanés (scénario asgi)")
+        parser.add_argument('--wsgi-threads', type=int, default=4,
+                            help="Threads du serveur WSGI simulé (scénario asgi)")
+        parser.add_argument('--requests', type=int, default=2000,
+                            help="Nombre total de requêtes (scénario asgi)")
+        parser.add_argument('--comments', type=int, default=100000,
+                            help="Nombre de commentaires (scénario search)")
+        parser.add_argument('--db-latency', type=float, default=0,
+                            help="Latence simulée par requête SQL, en ms (base distante)")
+        parser.add_argument('--logins', type=int, default=50,
+                            help="Nombre de connexions, 4 lectures par connexion (scénario login)")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        scenario = import_module(f"softdesk.benchmarks.{options['scenario']}")
+        # Un seul client envoie des milliers de requêtes : pas de 429 hors du scénario dédié
+        throttling.conf['ENABLED'] = options['scenario'] == 'throttling'
+        with tempfile.TemporaryDirectory() as directory:
+            if options['scenario'] in FILE_SCENARIOS and connection.vendor == 'sqlite':
+                connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'bench.sqlite3')
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            try:
+                scenario.run(Bench(self.stdout), options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
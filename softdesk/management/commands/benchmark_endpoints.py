@@ -0,0 +1,509 @@
+"""
+Banc d'essai de toutes les routes de l'API, sur une base de test jetable.
+
+    python manage.py benchmark_endpoints --json bench.json
+    python manage.py benchmark_endpoints --issues 20000 --comments 100000 --concurrency 8
+    python manage.py benchmark_endpoints --only issues --compare bench.json --threshold 20
+
+Le jeu de données synthétique (voir ``softdesk/dataset.py``) est construit
+selon les tailles demandées et la graine ``--seed``. Chaque route de
+``softdesk/urls.py``, pour chacune de ses méthodes, passe par le client de
+test de Django, authentifié par un vrai token JWT :
+- en séquence (``--repeat`` fois) : latences p50/p95/p99, requêtes SQL, pic
+  mémoire (tracemalloc) d'une requête ;
+- en concurrence (``--requests`` requêtes, ``--concurrency`` threads) :
+  débit et latences sous charge.
+La préparation d'une requête (objet à supprimer, utilisateur à ajouter,
+refresh token...) est faite avant la mesure et n'est pas comptée. Une route
+dont l'adresse mène à une autre, déclarée plus haut, est signalée « masquée »
+et non mesurée ; une route sans mesure est signalée « non mesurée ». Une
+route qui répond un autre statut que celui attendu n'est ni enregistrée ni
+comparée, et fait échouer le banc (ses mesures ne portent pas sur le bon
+traitement).
+
+``--json`` enregistre les résultats ; ``--compare`` les compare à un fichier
+précédent (un autre commit) et échoue si une route régresse : requêtes SQL
+en plus, ou p95, pic mémoire ou débit dégradés de plus de ``--threshold`` %.
+Les limites de débit (throttling) sont coupées pendant le banc.
+Connexion et inscription mesurent surtout le hachage des mots de passe :
+``SOFTDESK_PASSWORD_ITERATIONS`` en règle le coût.
+"""
+import itertools
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.urls import URLResolver, get_resolver, resolve
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from softdesk import throttling
+from softdesk.passwords import last_login_buffer
+from softdesk.dataset import PASSWORD, generate
+from softdesk.models import Comment, Contributor, Issue, Project, User
+
+URLCONF = 'softdesk.urls'
+PREFIX = '/api/'
+METHODS = ('get', 'post', 'put', 'patch', 'delete')
+
+
+class Fixtures:
+    """Objets du jeu de données visés par les requêtes, et objets jetables créés à la demande."""
+
+    def __init__(self):
+        # Le projet le plus fourni, son auteur, et l'issue de cet auteur la plus commentée :
+        # modifier ou supprimer une issue est réservé à son auteur
+        self.sequence = itertools.count()
+        self.project = Project.objects.order_by('-issues_count', 'pk').first()
+        self.author = self.project.author
+        issues = Issue.objects.filter(project=self.project).order_by('-comments_count', 'pk')
+        self.word = issues.first().name.split()[2]
+        self.issue = issues.filter(author=self.author).first() or self.new_issue()
+        self.comment = (Comment.objects.filter(issue=self.issue, author=self.author).order_by('pk').first()
+                        or self.new_comment())
+        self.contributor = Contributor.objects.get(project=self.project, user=self.author)
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def unique(self, prefix):
+        return f'{prefix}{next(self.sequence)}'
+
+    def token(self, user):
+        with self._lock:
+            if user.pk not in self._tokens:
+                self._tokens[user.pk] = str(AccessToken.for_user(user))
+            return self._tokens[user.pk]
+
+    def new_user(self):
+        name = self.unique('bench-user')
+        return User.objects.create(username=name, email=f'{name}@example.com', age=30, password='!')
+
+    def new_contributor(self):
+        return Contributor.objects.create(user=self.new_user(), project=self.project)
+
+    def new_project(self):
+        project = Project.objects.create(
+            name=self.unique('Projet jetable '), description='-', type='back-end', author=self.author
+        )
+        Contributor.objects.create(user=self.author, project=project)
+        return project
+
+    def new_issue(self):
+        return Issue.objects.create(
+            name=self.unique('Issue jetable '), description='-', project=self.project, author=self.author
+        )
+
+    def new_comment(self):
+        return Comment.objects.create(description='-', issue=self.issue, author=self.author)
+
+    # Adresses
+
+    def project_url(self, suffix=''):
+        return f'{PREFIX}projects/{self.project.pk}/{suffix}'
+
+    def issue_url(self, suffix=''):
+        return self.project_url(f'issues/{self.issue.pk}/{suffix}')
+
+
+def issue_data(f):
+    return {'name': f.unique('Nouvelle issue '), 'description': 'Description', 'project': f.project.pk}
+
+
+def own_ids(queryset, create, count=20):
+    """Objets dont l'auteur du projet est aussi l'auteur (seul à pouvoir les modifier)."""
+    ids = list(queryset.order_by('pk').values_list('pk', flat=True)[:count])
+    return ids + [create().pk for _ in range(count - len(ids))]
+
+
+def issue_ids(f):
+    return own_ids(Issue.objects.filter(project=f.project, author=f.author), f.new_issue)
+
+
+def comment_ids(f):
+    return own_ids(Comment.objects.filter(issue=f.issue, author=f.author), f.new_comment)
+
+
+def register(f):
+    name = f.unique('bench-register')
+    return {'url': f'{PREFIX}users/', 'user': None, 'data': {
+        'username': name, 'email': f'{name}@example.com', 'password': PASSWORD,
+        'password2': PASSWORD, 'age': 30,
+    }}
+
+
+def delete_account(f):
+    user = f.new_user()
+    return {'url': f'{PREFIX}users/{user.pk}/', 'user': user}
+
+
+def delete_project(f):
+    return {'url': f'{PREFIX}projects/{f.new_project().pk}/'}
+
+
+def replace_contributor(f):
+    contributor = f.new_contributor()
+    return {'url': f.project_url(f'contributors/{contributor.pk}/'),
+            'data': {'user': f.new_user().pk, 'project': f.project.pk}}
+
+
+# (nom de la route, méthode, préparation -> {'url', 'data', 'user'}, statut attendu)
+# 'user' absent : auteur du projet ; None : requête anonyme
+ENDPOINTS = [
+    ('api-root', 'GET', lambda f: {'url': PREFIX}, 200),
+    ('token_obtain_pair', 'POST', lambda f: {'url': f'{PREFIX}login/', 'user': None, 'data': {
+        'username': f.author.username, 'password': PASSWORD}}, 200),
+    ('token_refresh', 'POST', lambda f: {'url': f'{PREFIX}token/refresh/', 'user': None, 'data': {
+        'refresh': str(RefreshToken.for_user(f.author))}}, 200),
+    ('search', 'GET', lambda f: {'url': f'{PREFIX}search/?q={f.word}'}, 200),
+
+    ('user-list', 'GET', lambda f: {'url': f'{PREFIX}users/'}, 200),
+    ('user-list', 'POST', register, 201),
+    ('user-detail', 'GET', lambda f: {'url': f'{PREFIX}users/{f.author.pk}/'}, 200),
+    ('user-detail', 'PUT', lambda f: {'url': f'{PREFIX}users/{f.author.pk}/', 'data': {
+        'username': f.author.username, 'email': f.author.email, 'age': f.author.age}}, 200),
+    ('user-detail', 'PATCH', lambda f: {'url': f'{PREFIX}users/{f.author.pk}/', 'data': {
+        'can_be_contacted': True}}, 200),
+    ('user-detail', 'DELETE', delete_account, 204),
+
+    ('project-list', 'GET', lambda f: {'url': f'{PREFIX}projects/'}, 200),
+    ('project-list', 'POST', lambda f: {'url': f'{PREFIX}projects/', 'data': {
+        'name': f.unique('Nouveau projet '), 'description': '-', 'type': 'back-end'}}, 201),
+    ('project-detail', 'GET', lambda f: {'url': f.project_url()}, 200),
+    ('project-detail', 'PUT', lambda f: {'url': f.project_url(), 'data': {
+        'name': f.project.name, 'description': f.project.description, 'type': f.project.type}}, 200),
+    ('project-detail', 'PATCH', lambda f: {'url': f.project_url(), 'data': {
+        'description': f.project.description}}, 200),
+    ('project-detail', 'DELETE', delete_project, 204),
+    ('project-add-contributor', 'POST', lambda f: {'url': f.project_url('add-contributor/'), 'data': {
+        'user_id': f.new_user().pk}}, 201),
+    ('project-board-stats', 'GET', lambda f: {'url': f.project_url('board-stats/')}, 200),
+    ('project-bulk-contributors', 'POST', lambda f: {'url': f.project_url('bulk-contributors/'), 'data': {
+        'add': [f.new_user().pk for _ in range(5)]}}, 200),
+    ('project-export', 'GET', lambda f: {'url': f.project_url('export/')}, 200),
+    ('project-list-contributors', 'GET', lambda f: {'url': f.project_url('contributors/')}, 200),
+    ('project-remove-contributor', 'DELETE', lambda f: {
+        'url': f.project_url(f'contributors/{f.new_contributor().pk}/')}, 204),
+
+    ('project-contributors-list', 'GET', lambda f: {'url': f.project_url('contributors/')}, 200),
+    ('project-contributors-list', 'POST', lambda f: {'url': f.project_url('contributors/'), 'data': {
+        'user': f.new_user().pk, 'project': f.project.pk}}, 201),
+    ('project-contributors-detail', 'GET', lambda f: {
+        'url': f.project_url(f'contributors/{f.contributor.pk}/')}, 200),
+    ('project-contributors-detail', 'PUT', replace_contributor, 200),
+    ('project-contributors-detail', 'PATCH', replace_contributor, 200),
+    ('project-contributors-detail', 'DELETE', lambda f: {
+        'url': f.project_url(f'contributors/{f.new_contributor().pk}/')}, 204),
+
+    ('project-issues-list', 'GET', lambda f: {'url': f.project_url('issues/')}, 200),
+    ('project-issues-list', 'POST', lambda f: {'url': f.project_url('issues/'), 'data': issue_data(f)}, 201),
+    ('project-issues-bulk', 'POST', lambda f: {'url': f.project_url('issues/bulk/'), 'data': [
+        issue_data(f) for _ in range(20)]}, 201),
+    ('project-issues-bulk', 'PATCH', lambda f: {'url': f.project_url('issues/bulk/'), 'data': [
+        {'id': pk, 'status': 'In Progress'} for pk in issue_ids(f)]}, 200),
+    ('project-issues-detail', 'GET', lambda f: {'url': f.issue_url()}, 200),
+    ('project-issues-detail', 'PUT', lambda f: {'url': f.issue_url(), 'data': {
+        'name': f.issue.name, 'description': f.issue.description, 'project': f.project.pk}}, 200),
+    ('project-issues-detail', 'PATCH', lambda f: {'url': f.issue_url(), 'data': {'status': 'In Progress'}}, 200),
+    ('project-issues-detail', 'DELETE', lambda f: {
+        'url': f.project_url(f'issues/{f.new_issue().pk}/')}, 204),
+
+    ('issue-comments-list', 'GET', lambda f: {'url': f.issue_url('comments/')}, 200),
+    ('issue-comments-list', 'POST', lambda f: {'url': f.issue_url('comments/'), 'data': {
+        'description': 'Nouveau commentaire', 'issue': f.issue.pk}}, 201),
+    ('issue-comments-bulk', 'POST', lambda f: {'url': f.issue_url('comments/bulk/'), 'data': [
+        {'description': 'Commentaire groupé'} for _ in range(20)]}, 201),
+    ('issue-comments-bulk', 'PATCH', lambda f: {'url': f.issue_url('comments/bulk/'), 'data': [
+        {'id': pk, 'description': 'Commentaire modifié'} for pk in comment_ids(f)]}, 200),
+    ('issue-comments-detail', 'GET', lambda f: {'url': f.issue_url(f'comments/{f.comment.pk}/')}, 200),
+    ('issue-comments-detail', 'PUT', lambda f: {'url': f.issue_url(f'comments/{f.comment.pk}/'), 'data': {
+        'description': f.comment.description, 'issue': f.issue.pk}}, 200),
+    ('issue-comments-detail', 'PATCH', lambda f: {'url': f.issue_url(f'comments/{f.comment.pk}/'), 'data': {
+        'description': f.comment.description}}, 200),
+    ('issue-comments-detail', 'DELETE', lambda f: {
+        'url': f.issue_url(f'comments/{f.new_comment().pk}/')}, 204),
+]
+
+
+def declared_routes():
+    """(nom, méthode) de chaque route de ``softdesk/urls.py`` (hors suffixes de format)."""
+    routes = set()
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns)
+            elif pattern.name and 'format' not in pattern.pattern.regex.groupindex:
+                callback = pattern.callback
+                actions = getattr(callback, 'actions', None)
+                if actions:
+                    methods = actions
+                else:
+                    methods = [m for m in METHODS if hasattr(getattr(callback, 'cls', None), m)]
+                routes.update((pattern.name, method.upper()) for method in methods)
+
+    walk(get_resolver(URLCONF).url_patterns)
+    return routes
+
+
+def percentile(timings, fraction):
+    ordered = sorted(timings)
+    return ordered[max(int(len(ordered) * fraction + 0.5) - 1, 0)]
+
+
+def latency_stats(timings):
+    return {
+        'p50_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'p99_ms': round(percentile(timings, 0.99), 3),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "Mesure débit, latences, requêtes SQL et mémoire de chaque route de l'API"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--projects', type=int, default=20)
+        parser.add_argument('--contributors', type=int, default=10,
+                            help="Contributeurs par projet, en plus de l'auteur")
+        parser.add_argument('--issues', type=int, default=2000)
+        parser.add_argument('--comments', type=int, default=10000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--repeat', type=int, default=30,
+                            help="Requêtes en séquence par route et méthode")
+        parser.add_argument('--requests', type=int, default=60,
+                            help="Requêtes concurrentes par route et méthode")
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--only', default='',
+                            help="Seulement les routes dont le nom contient ce texte")
+        parser.add_argument('--json', help="Fichier où enregistrer les résultats")
+        parser.add_argument('--compare', help="Résultats précédents (JSON) à comparer")
+        parser.add_argument('--threshold', type=float, default=20,
+                            help="Dégradation tolérée, en %% (p95, mémoire, débit)")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as baseline_file:
+                baseline = json.load(baseline_file)
+        setup_test_environment()
+        enabled = throttling.conf['ENABLED']
+        throttling.conf['ENABLED'] = False
+        request_logger = logging.getLogger('django.request')
+        level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)  # Statuts inattendus comptés dans « erreurs »
+        with tempfile.TemporaryDirectory() as directory:
+            # Base SQLite dans un fichier : écritures concurrentes avec WAL et busy_timeout
+            if connection.vendor == 'sqlite':
+                connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'bench.sqlite3')
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            try:
+                results = self.run_suite(options)
+            finally:
+                last_login_buffer.flush()  # Dates de connexion en attente, avant la suppression de la base
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                throttling.conf['ENABLED'] = enabled
+                request_logger.setLevel(level)
+        if options['json']:
+            with open(options['json'], 'w', encoding='utf-8') as output:
+                json.dump(results, output, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"✓ Résultats enregistrés dans {options['json']}"))
+        failures = []
+        if results['failed']:
+            failures.append(
+                f"{len(results['failed'])} route(s) en erreur (statut inattendu) : " + ', '.join(results['failed'])
+            )
+        if baseline is not None:
+            regressions = self.compare(baseline, results, options['threshold'])
+            if regressions:
+                failures.append(f"{len(regressions)} route(s) en régression : " + ', '.join(regressions))
+        if failures:
+            raise CommandError(' ; '.join(failures))
+
+    def run_suite(self, options):
+        sizes = {name: options[name] for name in ('users', 'projects', 'contributors', 'issues', 'comments')}
+        start = time.perf_counter()
+        created = generate(seed=options['seed'], **sizes)
+        self.stdout.write(
+            f"Jeu de données (graine {options['seed']}) : "
+            + ', '.join(f'{count} {name}' for name, count in created.items())
+            + f" en {time.perf_counter() - start:.1f} s"
+        )
+        fixtures = Fixtures()
+        endpoints = [endpoint for endpoint in ENDPOINTS if options['only'] in endpoint[0]]
+        uncovered = sorted(declared_routes() - {(route, method) for route, method, _, _ in ENDPOINTS})
+        if uncovered:
+            self.stdout.write(self.style.WARNING(
+                "Routes non mesurées : " + ', '.join(f'{method} {route}' for route, method in uncovered)
+            ))
+
+        self.stdout.write(
+            f"{'route':<38} {'p50':>8} {'p95':>8} {'p99':>8} {'SQL':>4} {'Kio':>7} "
+            f"{'req/s':>7} {'p95 charge':>10}  erreurs"
+        )
+        measured, shadowed, failed = {}, {}, {}
+        for route, method, prepare, expected in endpoints:
+            key = f'{method} {route}'
+            # L'adresse doit mener à la route mesurée : une route déclarée plus haut peut la masquer
+            resolved = resolve(prepare(fixtures)['url'].split('?')[0]).url_name
+            if resolved != route:
+                shadowed[key] = resolved
+                self.stdout.write(self.style.WARNING(f"{key:<38} masquée par {resolved}"))
+                continue
+            result = self.measure(fixtures, route, method, prepare, expected, options)
+            # Statut inattendu : mesure d'un autre traitement (refus, erreur), hors résultats
+            if result['errors']:
+                failed[key] = result['errors']
+            else:
+                measured[key] = result
+            self.stdout.write(
+                f"{key:<38} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                f"{result['queries']:>4} {result['peak_kib']:>7.0f} {result['throughput_rps']:>7.1f} "
+                f"{result['concurrent']['p95_ms']:>10.2f}  {result['errors'] or ''}"
+            )
+        return {
+            'meta': {
+                'created': timezone.now().isoformat(),
+                'commit': git_commit(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'cpus': os.cpu_count(),
+                'seed': options['seed'],
+                'sizes': sizes,
+                'repeat': options['repeat'],
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+            },
+            'endpoints': measured,
+            'shadowed': shadowed,
+            'failed': failed,
+            'uncovered': [f'{method} {route}' for route, method in uncovered],
+        }
+
+    def request(self, client, fixtures, method, prepared):
+        """Envoie une requête préparée ; retourne (statut, durée en ms)."""
+        user = prepared.get('user', fixtures.author)
+        headers = {'Authorization': f'Bearer {fixtures.token(user)}'} if user is not None else {}
+        send = getattr(client, method.lower())
+        kwargs = {'headers': headers}
+        if 'data' in prepared:
+            kwargs.update(data=json.dumps(prepared['data']), content_type='application/json')
+        start = time.perf_counter()
+        response = send(prepared['url'], **kwargs)
+        if getattr(response, 'streaming', False):
+            b''.join(response.streaming_content)  # Export : le flux fait partie de la requête
+        return response.status_code, (time.perf_counter() - start) * 1000
+
+    def measure(self, fixtures, route, method, prepare, expected, options):
+        client = Client(raise_request_exception=False)
+        errors = {}
+
+        def check(status_code):
+            if status_code != expected:
+                errors[str(status_code)] = errors.get(str(status_code), 0) + 1
+
+        check(self.request(client, fixtures, method, prepare(fixtures))[0])  # Préchauffage
+
+        timings, queries = [], []
+        for _ in range(options['repeat']):
+            prepared = prepare(fixtures)
+            with CaptureQueriesContext(connection) as captured:
+                status_code, elapsed = self.request(client, fixtures, method, prepared)
+            check(status_code)
+            timings.append(elapsed)
+            queries.append(len(captured.captured_queries))
+
+        prepared = prepare(fixtures)
+        tracemalloc.start()
+        check(self.request(client, fixtures, method, prepared)[0])
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        # Charge : toutes les requêtes préparées d'abord, puis envoyées par `concurrency` threads
+        batch = [prepare(fixtures) for _ in range(options['requests'])]
+        local = threading.local()
+
+        def send(prepared):
+            if not hasattr(local, 'client'):
+                local.client = Client(raise_request_exception=False)
+            return self.request(local.client, fixtures, method, prepared)
+
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            start = time.perf_counter()
+            concurrent = list(pool.map(send, batch))
+            elapsed = time.perf_counter() - start
+            # Connexions ouvertes par les threads du pool
+            list(pool.map(lambda _: connection.close(), range(options['concurrency'])))
+        for status_code, _ in concurrent:
+            check(status_code)
+
+        return {
+            'route': route,
+            'method': method,
+            'status': expected,
+            **latency_stats(timings),
+            'queries': int(statistics.median(queries)),
+            'peak_kib': round(peak / 1024, 1),
+            'throughput_rps': round(len(concurrent) / elapsed, 1),
+            'concurrent': latency_stats([ms for _, ms in concurrent]),
+            'errors': errors,
+        }
+
+    def compare(self, baseline, results, threshold):
+        """Écarts par rapport à un banc précédent ; retourne les routes en régression."""
+        limit = 1 + threshold / 100
+        regressions = []
+        self.stdout.write(
+            f"\nComparaison avec {baseline['meta'].get('commit') or 'la référence'} "
+            f"(seuil {threshold:.0f} %)"
+        )
+        for field in ('sizes', 'seed', 'repeat', 'requests', 'concurrency'):
+            if baseline['meta'].get(field) != results['meta'][field]:
+                self.stdout.write(self.style.WARNING(
+                    f"{field} différent : {baseline['meta'].get(field)} -> {results['meta'][field]}"
+                ))
+        for key, result in results['endpoints'].items():
+            before = baseline['endpoints'].get(key)
+            if before is None:
+                self.stdout.write(f"{key:<38} nouvelle route")
+                continue
+            problems = []
+            if result['queries'] > before['queries']:
+                problems.append(f"SQL {before['queries']} -> {result['queries']}")
+            for field, label in (('p95_ms', 'p95'), ('peak_kib', 'mémoire')):
+                if before[field] and result[field] > before[field] * limit:
+                    problems.append(f"{label} {before[field]:.1f} -> {result[field]:.1f}")
+            if result['throughput_rps'] * limit < before['throughput_rps']:
+                problems.append(f"débit {before['throughput_rps']:.1f} -> {result['throughput_rps']:.1f} req/s")
+            if problems:
+                regressions.append(key)
+                self.stdout.write(self.style.ERROR(f"{key:<38} " + ', '.join(problems)))
+            else:
+                p95_change = (result['p95_ms'] / before['p95_ms'] - 1) * 100 if before['p95_ms'] else 0
+                self.stdout.write(f"{key:<38} ok (p95 {p95_change:+.0f} %)")
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("✓ Aucune régression"))
+        return regressions
@@ -0,0 +1,148 @@
+"""
+Vérifie la couverture des index : passe les requêtes principales des
+endpoints dans ``EXPLAIN QUERY PLAN`` et signale les parcours complets.
+Chaque combinaison de filtres et de tri déclarée (voir ``filters.py``) est
+vérifiée dans les deux sens de tri : le plan doit utiliser l'index qui la
+couvre, sans tri temporaire.
+
+    python manage.py explain_queries [--user ID] [--project ID] [--fail-on-scan]
+"""
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from softdesk.filters import IndexedFilterBackend, covering_index, supported_combinations
+from softdesk.membership import membership_cache
+from softdesk.models import Contributor, Issue
+from softdesk.pagination import KeysetPagination
+from softdesk.views import CommentViewSet, ContributorViewSet, IssueViewSet, ProjectViewSet
+
+# Motifs de parcours complet selon le moteur
+FULL_SCAN_PATTERNS = {
+    # "SCAN table" sans index ; "SCAN table USING COVERING INDEX" reste un parcours complet
+    'sqlite': re.compile(r'\bSCAN (?!CONSTANT ROW)(\S+)'),
+    'postgresql': re.compile(r'Seq Scan on (\S+)'),
+}
+SORT_PATTERNS = {
+    'sqlite': re.compile(r'USE TEMP B-TREE FOR (?:ORDER BY|RIGHT PART OF ORDER BY)'),
+    'postgresql': re.compile(r'^\s*(?:->\s*)?Sort\b', re.MULTILINE),
+}
+
+
+class Command(BaseCommand):
+    help = "Passe les requêtes des endpoints dans EXPLAIN et signale les parcours complets"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help="Utilisateur simulé (par défaut : un contributeur existant)")
+        parser.add_argument('--project', type=int, help="Projet simulé (par défaut : un projet de l'utilisateur)")
+        parser.add_argument('--fail-on-scan', action='store_true',
+                            help="Code de sortie non nul si un parcours complet est détecté")
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in FULL_SCAN_PATTERNS:
+            raise CommandError(f"Moteur non pris en charge : {vendor}")
+
+        contributor = self.pick_contributor(options)
+        user, project_id = contributor.user, contributor.project_id
+        issue = Issue.objects.filter(project_id=project_id).first()
+
+        queries = [(label, queryset, None) for label, queryset in self.get_queries(user, project_id, issue)]
+        queries += self.get_filter_queries(user, project_id, issue)
+
+        problems = 0
+        for label, queryset, expected_index in queries:
+            plan = queryset.explain()
+            scans = FULL_SCAN_PATTERNS[vendor].findall(plan)
+            sorts = SORT_PATTERNS[vendor].findall(plan)
+            if scans:
+                problems += 1
+                tables = ', '.join(scans)
+                self.stdout.write(self.style.ERROR(f"✗ {label} : parcours complet de {tables}"))
+            elif expected_index and (sorts or expected_index not in plan):
+                problems += 1
+                self.stdout.write(self.style.ERROR(f"✗ {label} : index {expected_index} non utilisé"))
+            elif sorts:
+                # Tri borné par la semi-jointure sur les projets de l'utilisateur
+                self.stdout.write(self.style.WARNING(f"~ {label} : tri temporaire"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"✓ {label}"))
+            if (scans or sorts or expected_index and expected_index not in plan) and options['verbosity'] > 1:
+                self.stdout.write(plan)
+
+        if problems and options['fail_on_scan']:
+            raise CommandError(f"{problems} requête(s) sans index adapté.")
+
+    def pick_contributor(self, options):
+        queryset = Contributor.objects.select_related('user')
+        if options['user']:
+            queryset = queryset.filter(user_id=options['user'])
+        if options['project']:
+            queryset = queryset.filter(project_id=options['project'])
+        contributor = queryset.order_by('id').first()
+        if contributor is None:
+            raise CommandError("Aucun contributeur trouvé : créez d'abord des données de test.")
+        return contributor
+
+    def make_view(self, viewset_class, user, action='list', params=None, **kwargs):
+        request = Request(RequestFactory().get('/', params or {}))
+        request.user = user
+        return viewset_class(request=request, kwargs=kwargs, action=action, format_kwarg=None)
+
+    def view_queryset(self, viewset_class, user, action='list', **kwargs):
+        """Reconstruit le queryset exact de la vue pour l'utilisateur donné."""
+        return self.make_view(viewset_class, user, action, **kwargs).get_queryset()
+
+    def page(self, queryset):
+        """Première page triée comme la pagination de l'API."""
+        ordering = KeysetPagination().get_ordering(queryset)
+        return queryset.order_by(*ordering)[:KeysetPagination.page_size + 1]
+
+    def get_filter_queries(self, user, project_id, issue):
+        """Une requête par combinaison de filtres déclarée et par sens de tri."""
+        routes = [(IssueViewSet, {'project_pk': project_id})]
+        if issue is not None:
+            routes.append((CommentViewSet, {'project_pk': project_id, 'issue_pk': issue.pk}))
+
+        backend = IndexedFilterBackend()
+        queries = []
+        for viewset_class, kwargs in routes:
+            view = self.make_view(viewset_class, user, **kwargs)
+            model = view.get_queryset().model
+            scope = backend.get_scope(view)
+            for ordering_name, ordering in viewset_class.index_orderings.items():
+                columns = [column.lstrip('-') for column in ordering]
+                for combination in supported_combinations(view, model, scope, columns):
+                    params = {name: view.index_filters[name].example(user) for name in combination}
+                    params['ordering'] = ordering_name
+                    view = self.make_view(viewset_class, user, params=params, **kwargs)
+                    queryset = view.filter_queryset(view.get_queryset())
+                    fields = [view.index_filters[name].field for name in combination]
+                    label = ' + '.join(combination) or 'sans filtre'
+                    queries.append((
+                        f"filtre {model._meta.model_name} : {label} ({ordering_name})",
+                        self.page(queryset), covering_index(model, scope, fields, columns).name,
+                    ))
+        return queries
+
+    def get_queries(self, user, project_id, issue):
+        issues = self.view_queryset(IssueViewSet, user, project_pk=project_id)
+        yield 'projets (liste)', self.page(self.view_queryset(ProjectViewSet, user))
+        yield 'projets (détail)', self.view_queryset(ProjectViewSet, user).filter(pk=project_id)
+        yield 'contributeurs du projet', self.page(
+            self.view_queryset(ContributorViewSet, user, project_pk=project_id))
+        yield 'appartenances (cache)', membership_cache.queryset(user.pk)
+        yield 'issues du projet', self.page(issues)
+        yield 'issues par statut', self.page(issues.filter(status='To Do'))
+        yield 'issues par priorité', self.page(issues.filter(priority='HIGH'))
+        yield 'issues par assigné', self.page(issues.filter(assigned_to=user))
+        yield 'issues (toutes)', self.page(self.view_queryset(IssueViewSet, user))
+        yield 'commentaires (tous)', self.page(self.view_queryset(CommentViewSet, user))
+        if issue is not None:
+            yield 'commentaires de l\'issue', self.page(
+                self.view_queryset(CommentViewSet, user, project_pk=project_id, issue_pk=issue.pk))
+            yield 'issue (détail)', issues.filter(pk=issue.pk)
+
@@ -0,0 +1,25 @@
+"""
+Reconstruit l'index de recherche plein texte (issues et commentaires).
+
+    python manage.py rebuild_search_index
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from softdesk.search import rebuild
+
+
+class Command(BaseCommand):
+    help = "Reconstruit l'index FTS5 de la recherche (issues et commentaires)"
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("L'index de recherche FTS5 n'existe que sous SQLite.")
+        start = time.perf_counter()
+        total = rebuild()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Index de recherche reconstruit : {total} entrée(s) en {elapsed:.1f} s"
+        ))
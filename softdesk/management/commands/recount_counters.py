@@ -0,0 +1,28 @@
+"""
+Recalcule les compteurs dénormalisés et répare les écarts.
+
+    python manage.py recount_counters [--dry-run]
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from softdesk.counters import recount
+
+
+class Command(BaseCommand):
+    help = "Recalcule les compteurs dénormalisés (contributeurs, issues, commentaires)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Signale les écarts sans les corriger")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            report = recount(dry_run=options['dry_run'])
+        for model_name, drifted in report.items():
+            if not drifted:
+                self.stdout.write(self.style.SUCCESS(f"✓ {model_name} : aucun écart"))
+            elif options['dry_run']:
+                self.stdout.write(self.style.WARNING(f"✗ {model_name} : {drifted} ligne(s) en écart"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"✓ {model_name} : {drifted} ligne(s) corrigée(s)"))
@@ -0,0 +1,79 @@
+"""
+Réinitialise la base de test, puis la remplit d'un jeu de données synthétique.
+
+    python manage.py reset_db
+    python manage.py reset_db --users 10000 --projects 1000 --issues 500000 --comments 2000000
+    python manage.py reset_db --no-reset --users 500 --prefix lot2-
+
+Sans taille, se contente de vider les tables (superutilisateurs gardés),
+comme l'ancien script ``reset_db.py``. Suppressions par ``DELETE`` directs et
+génération par lots de ``bulk_create`` : voir ``softdesk/dataset.py``. Même
+``--seed``, mêmes données. Les utilisateurs créés ont tous le mot de passe
+``dataset.PASSWORD``.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+
+from softdesk.dataset import PASSWORD, generate, reset
+
+
+class Command(BaseCommand):
+    help = "Vide les tables (hors superutilisateurs) et génère un jeu de données de test"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=0)
+        parser.add_argument('--projects', type=int, default=0)
+        parser.add_argument('--contributors', type=int, default=10,
+                            help="Contributeurs par projet, en plus de l'auteur")
+        parser.add_argument('--issues', type=int, default=0)
+        parser.add_argument('--comments', type=int, default=0)
+        parser.add_argument('--seed', type=int, default=0, help="Graine du générateur aléatoire")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--prefix', default='user', help="Préfixe des noms d'utilisateur générés")
+        parser.add_argument('--no-reset', action='store_true',
+                            help="Ajoute les données sans vider les tables")
+
+    def handle(self, *args, **options):
+        if options['projects'] and not options['users']:
+            raise CommandError("--projects nécessite --users (auteurs des projets).")
+
+        if not options['no_reset']:
+            self.stdout.write("🗑️  Suppression des données de test...")
+            start = time.perf_counter()
+            deleted = reset()
+            # Sans signal, réponses et appartenances en cache ne seraient pas invalidées
+            for alias in settings.CACHES:
+                caches[alias].clear()
+            for model_name, count in deleted.items():
+                self.stdout.write(f"   ✅ {model_name} : {count} ligne(s) supprimée(s)")
+            self.stdout.write(f"   en {time.perf_counter() - start:.1f} s")
+
+        if options['users']:
+            self.stdout.write(f"🌱 Génération du jeu de données (graine {options['seed']})...")
+            start = time.perf_counter()
+            created = generate(
+                users=options['users'], projects=options['projects'],
+                contributors=options['contributors'], issues=options['issues'],
+                comments=options['comments'], seed=options['seed'],
+                batch_size=options['batch_size'], username_prefix=options['prefix'],
+                progress=self.progress,
+            )
+            elapsed = time.perf_counter() - start
+            total = sum(created.values())
+            self.stdout.write('')
+            for model_name, count in created.items():
+                self.stdout.write(f"   ✅ {model_name} : {count} ligne(s)")
+            self.stdout.write(f"   {total} lignes en {elapsed:.1f} s ({total / elapsed:.0f} lignes/s)")
+            self.stdout.write(
+                f"   Connexion : {options['prefix']}0 ... {options['prefix']}{options['users'] - 1}, "
+                f"mot de passe {PASSWORD}"
+            )
+
+        self.stdout.write(self.style.SUCCESS("\n✨ Base de données réinitialisée avec succès !"))
+
+    def progress(self, model, count):
+        self.stdout.write(f"\r   {model._meta.verbose_name_plural:<20} {count:>10}", ending='')
+        self.stdout.flush()
@@ -0,0 +1,49 @@
+"""
+Copie la base SQLite primaire vers ses réplicas (réplication simulée, en local).
+
+    SOFTDESK_DB_REPLICAS=replica.sqlite3 python manage.py sync_replicas
+    SOFTDESK_DB_REPLICAS=replica.sqlite3 python manage.py sync_replicas --interval 2
+
+Avec ``--interval``, la copie est refaite toutes les N secondes : le retard
+des réplicas reste inférieur à N secondes, à comparer à ``STICKY_SECONDS``.
+En production (PostgreSQL), la réplication est celle du serveur.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from softdesk.replicas import conf
+
+
+class Command(BaseCommand):
+    help = "Copie la base SQLite primaire vers les réplicas (SOFTDESK_DB_REPLICAS)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0,
+                            help="Recopier toutes les N secondes (0 : une seule copie)")
+
+    def handle(self, *args, **options):
+        if not conf['ALIASES']:
+            raise CommandError("Aucun réplica configuré (SOFTDESK_DB_REPLICAS).")
+        if connections[DEFAULT_DB_ALIAS].vendor != 'sqlite':
+            raise CommandError("Copie propre à SQLite : ailleurs, la réplication est celle du serveur.")
+        while True:
+            start = time.perf_counter()
+            self.sync()
+            elapsed = time.perf_counter() - start
+            self.stdout.write(self.style.SUCCESS(
+                f"✓ {len(conf['ALIASES'])} réplica(s) à jour en {elapsed * 1000:.0f} ms"
+            ))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
+
+    def sync(self):
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        for alias in conf['ALIASES']:
+            replica = connections[alias]
+            replica.ensure_connection()
+            # API de sauvegarde de SQLite : copie cohérente, même pendant des écritures
+            primary.connection.backup(replica.connection)
@@ -0,0 +1,195 @@
+"""
+Cache des appartenances utilisateur -> projets (Green Code)
+
+Chaque requête vérifie que l'utilisateur est contributeur du projet visé.
+Plutôt que de relancer un ``Contributor.objects.filter(...).exists()`` à chaque
+fois, on charge en une seule requête la carte ``{project_id: rôle}`` de
+l'utilisateur, stockée sur deux niveaux :
+
+1. un cache local au processus, borné et évincé en LRU, avec une courte
+   durée de vie pour limiter l'écart entre workers ;
+2. le backend de cache Django (partagé entre les processus).
+
+L'invalidation est déclenchée par les signaux de ``Contributor`` et
+``Project`` (voir ``signals.py``). Elle fait avancer la génération de
+l'utilisateur, qui fait partie de la clé des rôles : une requête qui a lu
+les rôles avant l'invalidation et les range après les range sous l'ancienne
+génération, où plus personne ne les lit. Le cache local ne garde de même
+que les chargements commencés après la dernière invalidation du processus.
+
+Les méthodes préfixées par ``a`` (``aget_roles``, ``ais_member``...) sont
+les variantes async, pour les vues de ``async_views.py``.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .localcache import LocalLRUCache
+
+ROLE_AUTHOR = 'author'
+ROLE_CONTRIBUTOR = 'contributor'
+
+DEFAULTS = {
+    'LOCAL_MAXSIZE': 1024,  # Nombre maximal d'utilisateurs gardés en mémoire
+    'LOCAL_TTL': 5,         # Durée de vie (s) d'une entrée du cache local
+    'TIMEOUT': 300,         # Durée de vie (s) dans le backend de cache Django
+    'KEY_PREFIX': 'softdesk:membership',
+}
+
+
+def _to_int(value):
+    """Convertit un identifiant (souvent issu de l'URL) en entier, ou None."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class MembershipCache:
+    """Carte ``user_id -> {project_id: rôle}`` partagée entre les requêtes."""
+
+    def __init__(self):
+        conf = {**DEFAULTS, **getattr(settings, 'SOFTDESK_MEMBERSHIP_CACHE', {})}
+        self.timeout = conf['TIMEOUT']
+        self.key_prefix = conf['KEY_PREFIX']
+        self.local = LocalLRUCache(conf['LOCAL_MAXSIZE'], conf['LOCAL_TTL'])
+        # Invalidations vues par ce processus (voir _store_local)
+        self.local_epoch = 0
+
+    def _key(self, user_id):
+        return f"{self.key_prefix}:{user_id}"
+
+    def _generation_key(self, user_id):
+        return f"{self.key_prefix}:generation:{user_id}"
+
+    def _roles_key(self, user_id, generation):
+        return f"{self.key_prefix}:{user_id}:{generation}"
+
+    def _generation(self, user_id):
+        key = self._generation_key(user_id)
+        generation = cache.get(key)
+        if generation is None:
+            # add() ne remplace pas une génération posée entre-temps par une invalidation
+            cache.add(key, time.time_ns(), None)
+            generation = cache.get(key)
+        return generation
+
+    async def _ageneration(self, user_id):
+        key = self._generation_key(user_id)
+        generation = await cache.aget(key)
+        if generation is None:
+            await cache.aadd(key, time.time_ns(), None)
+            generation = await cache.aget(key)
+        return generation
+
+    def _store_local(self, key, roles, epoch):
+        """Seulement si aucune invalidation n'a eu lieu depuis le début du chargement."""
+        if epoch == self.local_epoch:
+            self.local.set(key, roles)
+
+    def queryset(self, user_id):
+        """Requête unique de chargement des appartenances d'un utilisateur."""
+        # Import local pour éviter un import circulaire models <-> signals
+        from .models import Contributor
+
+        return Contributor.objects.filter(user_id=user_id).values_list(
+            'project_id', 'project__author_id'
+        )
+
+    def _load(self, user_id):
+        rows = self.queryset(user_id)
+        return {
+            project_id: ROLE_AUTHOR if author_id == user_id else ROLE_CONTRIBUTOR
+            for project_id, author_id in rows
+        }
+
+    async def _aload(self, user_id):
+        return {
+            project_id: ROLE_AUTHOR if author_id == user_id else ROLE_CONTRIBUTOR
+            async for project_id, author_id in self.queryset(user_id)
+        }
+
+    def get_roles(self, user):
+        """Retourne ``{project_id: rôle}`` pour l'utilisateur (jamais None)."""
+        user_id = getattr(user, 'pk', user)
+        if user_id is None:
+            return {}
+        key = self._key(user_id)
+
+        roles = self.local.get(key)
+        if roles is not None:
+            return roles
+
+        epoch = self.local_epoch
+        # Génération lue avant les rôles : un chargement périmé est rangé sous l'ancienne
+        roles_key = self._roles_key(user_id, self._generation(user_id))
+        roles = cache.get(roles_key)
+        if roles is None:
+            roles = self._load(user_id)
+            cache.set(roles_key, roles, self.timeout)
+        self._store_local(key, roles, epoch)
+        return roles
+
+    async def aget_roles(self, user):
+        user_id = getattr(user, 'pk', user)
+        if user_id is None:
+            return {}
+        key = self._key(user_id)
+
+        roles = self.local.get(key)
+        if roles is not None:
+            return roles
+
+        epoch = self.local_epoch
+        roles_key = self._roles_key(user_id, await self._ageneration(user_id))
+        roles = await cache.aget(roles_key)
+        if roles is None:
+            roles = await self._aload(user_id)
+            await cache.aset(roles_key, roles, self.timeout)
+        self._store_local(key, roles, epoch)
+        return roles
+
+    def project_ids(self, user):
+        """Ensemble des projets dont l'utilisateur est contributeur."""
+        return set(self.get_roles(user))
+
+    def get_role(self, user, project_id):
+        """Rôle de l'utilisateur dans le projet, ou None s'il n'en fait pas partie."""
+        return self.get_roles(user).get(_to_int(project_id))
+
+    def is_member(self, user, project_id):
+        return self.get_role(user, project_id) is not None
+
+    async def aproject_ids(self, user):
+        return set(await self.aget_roles(user))
+
+    async def ais_member(self, user, project_id):
+        roles = await self.aget_roles(user)
+        return roles.get(_to_int(project_id)) is not None
+
+    def invalidate_user(self, user_id):
+        self.invalidate_users([user_id])
+
+    def invalidate_users(self, user_ids):
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        self.local_epoch += 1
+        for user_id in user_ids:
+            self.local.delete(self._key(user_id))
+        generation = time.time_ns()
+        cache.set_many({self._generation_key(user_id): generation for user_id in user_ids}, None)
+
+    def invalidate_users_on_commit(self, user_ids):
+        """Invalide après le commit pour ne pas recharger un état non validé."""
+        user_ids = set(user_ids)
+        if user_ids:
+            transaction.on_commit(lambda: self.invalidate_users(user_ids))
+
+    def clear_local(self):
+        self.local.clear()
+
+
+membership_cache = MembershipCache()
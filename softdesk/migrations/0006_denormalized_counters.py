@@ -0,0 +1,57 @@
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_of(queryset, group_field):
+    subquery = queryset.order_by().values(group_field).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), 0)
+
+
+def fill_counters(apps, schema_editor):
+    Project = apps.get_model('softdesk', 'Project')
+    Contributor = apps.get_model('softdesk', 'Contributor')
+    Issue = apps.get_model('softdesk', 'Issue')
+    Comment = apps.get_model('softdesk', 'Comment')
+
+    Project.objects.update(
+        contributors_count=count_of(Contributor.objects.filter(project=OuterRef('pk')), 'project'),
+        issues_count=count_of(Issue.objects.filter(project=OuterRef('pk')), 'project'),
+        open_issues_count=count_of(
+            Issue.objects.filter(project=OuterRef('pk')).exclude(status='Finished'), 'project'
+        ),
+    )
+    Issue.objects.update(
+        comments_count=count_of(Comment.objects.filter(issue=OuterRef('pk')), 'issue'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('softdesk', '0005_updated_time'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='contributors_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='issues_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='open_issues_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,114 @@
+from django.db import migrations
+
+# Index plein texte SQLite FTS5 des issues et commentaires (voir softdesk/search.py).
+# rowid = 2 * id pour une issue, 2 * id + 1 pour un commentaire.
+# project_id est indexé : le filtre sur les projets de l'utilisateur se fait dans l'index.
+# Tenu à jour par des triggers : les écritures groupées (bulk_create,
+# bulk_update, update()) et les suppressions en cascade sont couvertes.
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE softdesk_search USING fts5(
+        name, description, project_id, issue_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER softdesk_issue_search_insert AFTER INSERT ON softdesk_issue BEGIN
+        INSERT INTO softdesk_search (rowid, name, description, project_id, issue_id)
+        VALUES (new.id * 2, new.name, new.description, new.project_id, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER softdesk_issue_search_update AFTER UPDATE OF name, description, project_id
+    ON softdesk_issue
+    WHEN old.name IS NOT new.name OR old.description IS NOT new.description
+        OR old.project_id IS NOT new.project_id
+    BEGIN
+        UPDATE softdesk_search
+        SET name = new.name, description = new.description, project_id = new.project_id
+        WHERE rowid = new.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER softdesk_issue_search_move AFTER UPDATE OF project_id ON softdesk_issue
+    WHEN old.project_id IS NOT new.project_id
+    BEGIN
+        UPDATE softdesk_search SET project_id = new.project_id
+        WHERE rowid IN (SELECT id * 2 + 1 FROM softdesk_comment WHERE issue_id = new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER softdesk_issue_search_delete AFTER DELETE ON softdesk_issue BEGIN
+        DELETE FROM softdesk_search WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER softdesk_comment_search_insert AFTER INSERT ON softdesk_comment BEGIN
+        INSERT INTO softdesk_search (rowid, name, description, project_id, issue_id)
+        VALUES (
+            new.id * 2 + 1, NULL, new.description,
+            (SELECT project_id FROM softdesk_issue WHERE id = new.issue_id), new.issue_id
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER softdesk_comment_search_update AFTER UPDATE OF description, issue_id
+    ON softdesk_comment
+    WHEN old.description IS NOT new.description OR old.issue_id IS NOT new.issue_id
+    BEGIN
+        UPDATE softdesk_search
+        SET description = new.description, issue_id = new.issue_id,
+            project_id = (SELECT project_id FROM softdesk_issue WHERE id = new.issue_id)
+        WHERE rowid = new.id * 2 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER softdesk_comment_search_delete AFTER DELETE ON softdesk_comment BEGIN
+        DELETE FROM softdesk_search WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS softdesk_comment_search_delete',
+    'DROP TRIGGER IF EXISTS softdesk_comment_search_update',
+    'DROP TRIGGER IF EXISTS softdesk_comment_search_insert',
+    'DROP TRIGGER IF EXISTS softdesk_issue_search_delete',
+    'DROP TRIGGER IF EXISTS softdesk_issue_search_move',
+    'DROP TRIGGER IF EXISTS softdesk_issue_search_update',
+    'DROP TRIGGER IF EXISTS softdesk_issue_search_insert',
+    'DROP TABLE IF EXISTS softdesk_search',
+]
+
+FILL_SQL = [
+    """
+    INSERT INTO softdesk_search (rowid, name, description, project_id, issue_id)
+    SELECT id * 2, name, description, project_id, id FROM softdesk_issue
+    """,
+    """
+    INSERT INTO softdesk_search (rowid, name, description, project_id, issue_id)
+    SELECT c.id * 2 + 1, NULL, c.description, i.project_id, c.issue_id
+    FROM softdesk_comment c JOIN softdesk_issue i ON i.id = c.issue_id
+    """,
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        # FTS5 est propre à SQLite : rien à faire sur les autres bases
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('softdesk', '0006_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(CREATE_SQL + FILL_SQL), run(DROP_SQL)),
+    ]
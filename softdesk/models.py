@@ -37,6 +37,18 @@ class Project(models.Model):
     type = models.CharField(max_length=20, choices=TYPE_CHOICES)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='authored_projects')
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+
+    # Compteurs dénormalisés (voir counters.py, réparables par recount_counters)
+    contributors_count = models.PositiveIntegerField(default=0, editable=False)
+    issues_count = models.PositiveIntegerField(default=0, editable=False)
+    open_issues_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # Pagination par curseur (created_time, id)
+            models.Index(fields=['created_time', 'id'], name='project_created_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -50,6 +62,9 @@ class Contributor(models.Model):
 
     class Meta:
         unique_together = ('user', 'project')
+        indexes = [
+            models.Index(fields=['project', 'created_time', 'id'], name='contributor_project_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.project.name}"
@@ -90,6 +105,71 @@ class Issue(models.Model):
         related_name='assigned_issues'
     )
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+
+    # Compteur dénormalisé (voir counters.py)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+
+    CLOSED_STATUS = 'Finished'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'created_time', 'id'], name='issue_project_created_idx'),
+            models.Index(fields=['created_time', 'id'], name='issue_created_idx'),
+            # Filtres par projet + statut/priorité/assigné, triés par date
+            models.Index(fields=['project', 'status', 'created_time', 'id'], name='issue_project_status_idx'),
+            models.Index(fields=['project', 'priority', 'created_time', 'id'], name='issue_project_priority_idx'),
+            models.Index(fields=['project', 'assigned_to', 'created_time', 'id'], name='issue_project_assignee_idx'),
+            models.Index(fields=['project', 'tag', 'created_time', 'id'], name='issue_project_tag_idx'),
+            models.Index(fields=['project', 'author', 'created_time', 'id'], name='issue_project_author_idx'),
+            # "Mes issues en cours" : assigné + statut
+            models.Index(fields=['project', 'assigned_to', 'status', 'created_time', 'id'],
+                         name='issue_project_assignee_st_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Mémoriser l'état chargé pour ajuster les compteurs en cas de changement
+        instance = super().from_db(db, field_names, values)
+        instance.remember_saved_state()
+        return instance
+
+    def remember_saved_state(self):
+        """Note le projet et le statut comme étant ceux de la base (chargement, enregistrement)."""
+        # Champ différé : absent de __dict__, l'état reste inconnu
+        self._saved_state = (self.__dict__.get('project_id'), self.__dict__.get('status'))
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using, fields)
+        # Seuls les champs relus (par exemple un champ différé) reflètent la base
+        project_id, status = getattr(self, '_saved_state', (None, None))
+        if fields is None or {'project', 'project_id'} & set(fields):
+            project_id = self.__dict__.get('project_id')
+        if fields is None or 'status' in fields:
+            status = self.__dict__.get('status')
+        self._saved_state = (project_id, status)
+
+    def saved_state(self):
+        """
+        ``(project_id, status)`` tels qu'en base avant les modifications en
+        cours, ou None si l'issue n'y est pas. Lus en base si l'instance ne
+        les connaît pas (construite à la main, champs différés) : à appeler
+        avant ``save()`` (signal ``pre_save``). Les ``UPDATE`` groupés
+        (``QuerySet.update``) ne passent pas par là : voir ``recount_counters``.
+        """
+        state = getattr(self, '_saved_state', (None, None))
+        if None in state:
+            if self.pk is None:
+                return None
+            state = Issue.objects.filter(pk=self.pk).values_list('project_id', 'status').first()
+            if state is None:
+                return None
+            self._saved_state = state
+        return state
+
+    @property
+    def is_open(self):
+        return self.status != self.CLOSED_STATUS
 
     def __str__(self):
         return f"{self.name} - {self.project.name}"
@@ -102,6 +182,29 @@ class Comment(models.Model):
     issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name='comments')
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='authored_comments')
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['issue', 'created_time', 'id'], name='comment_issue_created_idx'),
+            models.Index(fields=['created_time', 'id'], name='comment_created_idx'),
+            models.Index(fields=['issue', 'author', 'created_time', 'id'], name='comment_issue_author_idx'),
+        ]
+
+    def __str__(self):
+        return f"Comment {self.uuid} on {self.issue.name}"
+
+
+class BlacklistedRefreshToken(models.Model):
+    """Refresh token déjà échangé (rotation), refusé jusqu'à son expiration (voir blacklist.py)"""
+    jti = models.CharField(max_length=64, primary_key=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # Purge des entrées expirées : DELETE ... WHERE expires_at <= now
+            models.Index(fields=['expires_at'], name='blacklist_expires_idx'),
+        ]
 
     def __str__(self):
-        return f"Comment {self.uuid} on {self.issue.name}"
\ No newline at end of file
+        return self.jti
\ No newline at end of file
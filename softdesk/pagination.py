@@ -0,0 +1,229 @@
+"""
+Pagination de l'API (Green Code)
+
+- ``StandardResultsSetPagination`` : pagination historique par numéro de page.
+- ``KeysetPagination`` : pagination par curseur opaque sur ``(created_time, id)``.
+  Chaque page est une simple lecture d'index (pas de ``COUNT(*)`` ni d'``OFFSET``),
+  son coût ne dépend donc pas de la profondeur.
+- ``HybridPagination`` : curseur si le client le demande (``?cursor=`` ou
+  ``?pagination=cursor``), numéro de page sinon (compatibilité).
+
+Chaque classe a une variante async ``apaginate_queryset`` (vues de ``async_views.py``).
+"""
+import base64
+import binascii
+from collections import OrderedDict
+from datetime import datetime
+
+from django.core.paginator import InvalidPage, Page
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def reverse_ordering(ordering):
+    return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    """Pagination standard pour toutes les listes (Green Code)"""
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    async def apaginate_queryset(self, queryset, request, view=None, count=None):
+        """
+        Variante async de ``paginate_queryset``. ``count``, s'il est déjà
+        connu (validateurs de la vue), évite le ``COUNT(*)``.
+        """
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Pré-remplit la propriété mise en cache, que Paginator calculerait en synchrone
+        paginator.count = await queryset.acount() if count is None else count
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        bottom = (number - 1) * page_size
+        top = min(bottom + page_size, paginator.count)
+        objects = [obj async for obj in queryset[bottom:top]] if top > bottom else []
+        self.page = Page(objects, number, paginator)
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return objects
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination par curseur sur ``(created_time, id)`` décroissants (ou
+    croissants si le queryset est déjà trié ainsi).
+    Le curseur encode la clé de la dernière (ou première) ligne vue et le sens.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('-created_time', '-id')
+    invalid_cursor_message = 'Curseur invalide.'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+            if size > 0:
+                return min(size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def encode_cursor(self, obj, reverse):
+        raw = f"{obj.created_time.isoformat()}|{obj.pk}|{'p' if reverse else 'n'}"
+        token = base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, token.rstrip('=')
+        )
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('ascii')
+            created, pk, direction = raw.split('|')
+            if direction not in ('n', 'p'):
+                raise ValueError(direction)
+            return datetime.fromisoformat(created), int(pk), direction == 'p'
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_ordering(self, queryset):
+        """
+        Tri déjà posé sur le queryset (``?ordering=``, voir ``filters.py``)
+        s'il porte sur la clé du curseur, dans un sens ou dans l'autre.
+        """
+        ordering = tuple(queryset.query.order_by)
+        if ordering in (self.ordering, reverse_ordering(self.ordering)):
+            return ordering
+        return self.ordering
+
+    def page_queryset(self, queryset, request):
+        """Prépare la requête de la page (sans l'exécuter)."""
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+
+        ordering = self.get_ordering(queryset)
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            created, pk, reverse = self.cursor
+            # Clés suivantes : plus petites en ordre décroissant, plus grandes sinon
+            op = 'gt' if reverse == ordering[0].startswith('-') else 'lt'
+            # La borne simple sur created_time permet un parcours d'index par plage
+            queryset = queryset.filter(
+                Q(**{f'created_time__{op}': created}) | Q(created_time=created, **{f'id__{op}': pk}),
+                **{f'created_time__{op}e': created},
+            )
+            if reverse:
+                queryset = queryset.order_by(*reverse_ordering(ordering))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        """Découpe les lignes lues (une de plus que la page) et fixe les liens."""
+        reverse = self.cursor is not None and self.cursor[2]
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        self.page = results
+        return results
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None, count=None):
+        # ``count`` est ignoré : la pagination par curseur ne compte pas
+        return self.set_page([obj async for obj in self.page_queryset(queryset, request)])
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Page précédente vide : repartir du début
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class HybridPagination(BasePagination):
+    """
+    Curseur (keyset) à la demande, numéro de page par défaut.
+    Les deux modes trient par ``(created_time, id)``, décroissants par défaut.
+    """
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+    page_number_class = StandardResultsSetPagination
+
+    def uses_keyset(self, request):
+        return (
+            self.keyset_class.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == 'cursor'
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.uses_keyset(request):
+            self.paginator = self.keyset_class()
+        else:
+            self.paginator = self.page_number_class()
+            queryset = queryset.order_by(*self.keyset_class().get_ordering(queryset))
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None, count=None):
+        if self.uses_keyset(request):
+            self.paginator = self.keyset_class()
+        else:
+            self.paginator = self.page_number_class()
+            queryset = queryset.order_by(*self.keyset_class().get_ordering(queryset))
+        return await self.paginator.apaginate_queryset(queryset, request, view, count)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number_class().get_paginated_response_schema(schema)
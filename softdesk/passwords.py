@@ -0,0 +1,208 @@
+"""
+Mots de passe : hachage borné et dernière connexion différée (Green Code)
+
+Hacher ou vérifier un mot de passe (PBKDF2 : 720 000 itérations par défaut)
+coûte des centaines de millisecondes de calcul. Les hacheurs de ce module
+(``PASSWORD_HASHERS``, voir ``config/settings.py``) confient ce calcul à un
+pool de ``WORKERS`` threads, partagé par tout le processus :
+- une rafale de connexions ou d'inscriptions occupe au plus ``WORKERS``
+  cœurs, les autres requêtes de l'API gardent les leurs ;
+- sous WSGI, le thread de la requête attend le hachage : au plus
+  ``SERVER_THREADS - 1`` threads attendent ainsi (``WORKERS`` si le nombre
+  de threads du serveur n'est pas donné), les suivants reçoivent tout de
+  suite un 503 (``Retry-After``) et il reste toujours un thread pour le
+  reste de l'API ;
+- sous ASGI, l'attente ne bloque aucun thread : au-delà de ``MAX_PENDING``
+  hachages en attente, la requête est refusée de la même façon.
+``hashlib`` libère le GIL pendant PBKDF2 : les threads de l'API continuent
+de servir pendant le hachage.
+
+Le coût se règle par environnement (``ITERATIONS``, ``ARGON2_TIME_COST``,
+``ARGON2_MEMORY_COST``) ; l'algorithme garde son nom d'origine : les
+mots de passe déjà enregistrés restent valides et sont réhachés au nouveau
+coût à la connexion suivante.
+
+``LastLoginBuffer`` remplace ``UPDATE_LAST_LOGIN`` de simplejwt (un
+``UPDATE`` par connexion) : les dates sont regroupées en mémoire et écrites
+par un seul ``UPDATE`` toutes les ``LAST_LOGIN_INTERVAL`` secondes, ou dès
+``LAST_LOGIN_MAXSIZE`` utilisateurs. Un arrêt brutal du processus perd au
+plus cet intervalle de dates de connexion.
+"""
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers, get_user_model
+from django.db import connection
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'WORKERS': 2,                 # Hachages simultanés par processus
+    'MAX_PENDING': 64,            # Hachages en attente au-delà desquels on répond 503
+    'SERVER_THREADS': None,       # Threads par processus WSGI (gunicorn --threads), None : inconnu
+    'RETRY_AFTER': 1,             # Secondes, en-tête Retry-After des 503
+    'ITERATIONS': None,           # PBKDF2 (None : valeur de Django)
+    'ARGON2_TIME_COST': None,     # Argon2 (None : valeurs de Django)
+    'ARGON2_MEMORY_COST': None,   # En Kio
+    'LAST_LOGIN_INTERVAL': 10,    # Délai maximal (s) avant l'écriture des dates de connexion
+    'LAST_LOGIN_MAXSIZE': 500,    # Utilisateurs en attente au-delà desquels on écrit
+}
+
+conf = {**DEFAULTS, **getattr(settings, 'SOFTDESK_PASSWORDS', {})}
+
+
+class HashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Trop de connexions simultanées, réessayez dans un instant."
+    default_code = 'hashing_unavailable'
+    wait = conf['RETRY_AFTER']  # Repris par DRF dans l'en-tête Retry-After
+
+
+class HashingPool:
+    """
+    Pool de threads borné, avec une file d'attente bornée elle aussi, et un
+    nombre borné de threads appelants bloqués dans ``run``.
+    """
+
+    def __init__(self, workers, max_pending, max_waiting):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_waiting = max_waiting
+        self._local = threading.local()
+        self._reset()
+        # Ni threads ni verrous ne survivent à un fork (workers gunicorn) : repartir de zéro
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_pending)
+        self._waiting = threading.BoundedSemaphore(self.max_waiting)
+
+    def submit(self, func, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            raise HashingUnavailable()
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='softdesk-hash')
+        try:
+            future = self._executor.submit(self._call, func, args, kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _call(self, func, args, kwargs):
+        self._local.inside = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._local.inside = False
+
+    def run(self, func, *args, **kwargs):
+        """
+        Exécute ``func`` dans le pool et attend son résultat en bloquant le
+        thread appelant ; 503 si ``max_waiting`` threads attendent déjà.
+        """
+        if getattr(self._local, 'inside', False):
+            return func(*args, **kwargs)  # Déjà dans le pool (hachage imbriqué)
+        if not self._waiting.acquire(blocking=False):
+            raise HashingUnavailable()
+        try:
+            return self.submit(func, *args, **kwargs).result()
+        finally:
+            self._waiting.release()
+
+    async def arun(self, func, *args, **kwargs):
+        """Variante async de ``run`` : la boucle d'événements n'est pas bloquée."""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+
+hashing_pool = HashingPool(
+    conf['WORKERS'], conf['MAX_PENDING'],
+    max(conf['SERVER_THREADS'] - 1, 1) if conf['SERVER_THREADS'] else conf['WORKERS'],
+)
+
+
+class PooledHasherMixin:
+    """À placer avant un hacheur de Django : ``encode`` et ``verify`` passent par le pool."""
+
+    def encode(self, password, salt, *args, **kwargs):
+        return hashing_pool.run(super().encode, password, salt, *args, **kwargs)
+
+    def verify(self, password, encoded):
+        return hashing_pool.run(super().verify, password, encoded)
+
+
+class PBKDF2PasswordHasher(PooledHasherMixin, hashers.PBKDF2PasswordHasher):
+    iterations = conf['ITERATIONS'] or hashers.PBKDF2PasswordHasher.iterations
+
+
+class Argon2PasswordHasher(PooledHasherMixin, hashers.Argon2PasswordHasher):
+    """Nécessite ``argon2-cffi`` (voir requirements.txt)."""
+    time_cost = conf['ARGON2_TIME_COST'] or hashers.Argon2PasswordHasher.time_cost
+    memory_cost = conf['ARGON2_MEMORY_COST'] or hashers.Argon2PasswordHasher.memory_cost
+
+
+class LastLoginBuffer:
+    """Dates de dernière connexion en attente, écrites par lots."""
+
+    def __init__(self, interval, maxsize):
+        self.interval = interval
+        self.maxsize = maxsize
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+        atexit.register(self.flush)
+
+    def _reset(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def record(self, user_id):
+        with self._lock:
+            self._pending[user_id] = timezone.now()
+            full = len(self._pending) >= self.maxsize
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.interval, self._flush_in_thread)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def _flush_in_thread(self):
+        try:
+            self.flush()
+        finally:
+            connection.close()  # Connexion propre au thread du minuteur
+
+    def flush(self):
+        """Écrit les dates en attente (un ``UPDATE ... CASE`` par lot de 500)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return
+        user_model = get_user_model()
+        try:
+            user_model.objects.bulk_update(
+                [user_model(pk=user_id, last_login=date) for user_id, date in pending.items()],
+                ['last_login'], batch_size=500,
+            )
+        except Exception:
+            # Information non critique : perdue plutôt que de bloquer les connexions
+            logger.exception("Écriture de %d dates de connexion impossible", len(pending))
+
+
+last_login_buffer = LastLoginBuffer(conf['LAST_LOGIN_INTERVAL'], conf['LAST_LOGIN_MAXSIZE'])
@@ -1,5 +1,5 @@
 from rest_framework import permissions
-from .models import Contributor
+from .membership import membership_cache
 
 
 class IsAuthenticated(permissions.BasePermission):
@@ -19,7 +19,7 @@ class IsAuthorOrReadOnly(permissions.BasePermission):
             return True
         
         # Modification/suppression uniquement pour l'auteur
-        return obj.author == request.user
+        return obj.author_id == request.user.pk
 
 
 class IsProjectContributor(permissions.BasePermission):
@@ -31,22 +31,30 @@ class IsProjectContributor(permissions.BasePermission):
         # Pour la création, vérifier dans la vue
         return request.user and request.user.is_authenticated
 
-    def has_object_permission(self, request, view, obj):
+    def get_project_id(self, obj):
         # Déterminer le projet selon le type d'objet
-        if hasattr(obj, 'project'):
-            project = obj.project
+        if hasattr(obj, 'project_id'):
+            return obj.project_id
         elif obj.__class__.__name__ == 'Project':
-            project = obj
+            return obj.pk
         elif hasattr(obj, 'issue'):
-            project = obj.issue.project
-        else:
+            return obj.issue.project_id
+        return None
+
+    def has_object_permission(self, request, view, obj):
+        project_id = self.get_project_id(obj)
+        if project_id is None:
             return False
 
-        # Vérifier que l'utilisateur est contributeur
-        return Contributor.objects.filter(
-            user=request.user,
-            project=project
-        ).exists()
+        # Vérifier que l'utilisateur est contributeur (cache des appartenances)
+        return membership_cache.is_member(request.user, project_id)
+
+    async def ahas_object_permission(self, request, view, obj):
+        """Variante async, utilisée par les vues de ``async_views.py``."""
+        project_id = self.get_project_id(obj)
+        if project_id is None:
+            return False
+        return await membership_cache.ais_member(request.user, project_id)
 
 
 class IsProjectAuthor(permissions.BasePermission):
@@ -58,7 +66,7 @@ class IsProjectAuthor(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         # obj est le Project
-        return obj.author == request.user
+        return obj.author_id == request.user.pk
 
 
 class IsAuthorOrProjectAuthor(permissions.BasePermission):
@@ -72,6 +80,6 @@ class IsAuthorOrProjectAuthor(permissions.BasePermission):
         
         # Le créateur du projet peut gérer les contributeurs
         if hasattr(obj, 'project'):
-            return obj.project.author == request.user
+            return obj.project.author_id == request.user.pk
         
         return False
\ No newline at end of file
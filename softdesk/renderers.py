@@ -0,0 +1,113 @@
+"""
+Rendu et lecture JSON rapides (Green Code)
+
+``FastJSONRenderer`` et ``FastJSONParser`` s'appuient sur ``orjson``
+(encodeur natif, UTF-8 direct, sans passer par des ``str`` intermédiaires).
+La sortie est identique à celle du ``JSONRenderer`` de DRF : les dates,
+``Decimal``, textes traduits... passent par l'encodeur de DRF, les UUID
+(``Comment.uuid``) sont rendus en chaîne.
+
+Si ``orjson`` n'est pas installé, ou si le client demande une indentation
+(``Accept: application/json; indent=4``), on revient au rendu de DRF.
+"""
+import codecs
+import csv
+import io
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Dépendance optionnelle
+    orjson = None
+
+if orjson is not None:
+    # Dates confiées à l'encodeur de DRF (format ECMA 262, "Z" pour UTC)
+    DUMPS_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` compatible, rendu par ``orjson``."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_encoder.default, option=DUMPS_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Type exotique refusé par orjson (entier hors 64 bits...) : rendu standard
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Comme DRF : \u2028 et \u2029 échappés (JSON sous-ensemble strict de JavaScript)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """``JSONParser`` compatible, lu par ``orjson`` (NaN/Infinity refusés)."""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            raw = stream.read()
+            if codecs.lookup(encoding).name != 'utf-8':
+                raw = raw.decode(encoding).encode('utf-8')
+            return orjson.loads(raw)
+        except (ValueError, LookupError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+def json_dumps(data):
+    """Sérialise ``data`` en JSON compact (octets UTF-8), comme ``FastJSONRenderer``."""
+    return FastJSONRenderer().render(data)
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    """
+    Négociation de ``?format=ndjson`` (export en flux, voir ``export.py``).
+    Rend les réponses ordinaires (erreurs) sur une seule ligne JSON.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        ret = super().render(data, None, renderer_context)
+        return ret + b'\n' if ret else ret
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Négociation de ``?format=csv`` (export en flux, voir ``export.py``).
+    Rend les réponses ordinaires (erreurs) en un en-tête et une ligne.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not isinstance(data, dict):
+            data = {'detail': data}
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(data.keys())
+        writer.writerow(data.values())
+        return buffer.getvalue().encode(self.charset)
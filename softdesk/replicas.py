@@ -0,0 +1,196 @@
+"""
+Lectures sur réplicas, avec lecture de ses propres écritures (Green Code)
+
+``ReplicaRouter`` envoie les lectures des requêtes sûres (``GET``, ``HEAD``,
+``OPTIONS`` : listes, détails, exports, statistiques) vers un réplica tiré au
+hasard parmi ``SOFTDESK_REPLICAS['ALIASES']`` ; tout le reste va au primaire
+(``default``). Le choix est fait une fois par requête par
+``ReplicaRoutingMiddleware``.
+
+Restent sur le primaire :
+- les requêtes qui écrivent, lectures comprises ;
+- les requêtes d'un utilisateur qui a écrit depuis moins de
+  ``STICKY_SECONDS`` : il voit ses propres modifications ;
+- le reste d'une requête dont un projet a changé depuis moins de
+  ``STICKY_SECONDS`` (``pin_recent``, appelé par ``versioning.py``) : le
+  cache des réponses, les ETag et les statistiques du tableau, rangés sous la
+  nouvelle version, ne sont jamais calculés depuis un réplica en retard ;
+- les modèles de ``PRIMARY_MODELS`` (utilisateurs, contributeurs) : leurs
+  lectures remplissent les caches d'authentification et d'appartenance ;
+- les modèles des applications hors de ``REPLICA_APPS`` (sessions, admin,
+  auth, contenttypes) : peu lus, et lus juste après avoir été écrits.
+
+``STICKY_SECONDS`` doit donc couvrir le retard de réplication.
+Sans réplica configuré, tout va au primaire et le middleware ne fait rien.
+"""
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+DEFAULTS = {
+    'ALIASES': [],           # Alias de DATABASES des réplicas
+    'STICKY_SECONDS': 5,     # Durée (s) sur le primaire après une écriture
+    'PRIMARY_MODELS': ['softdesk.User', 'softdesk.Contributor'],
+    'REPLICA_APPS': ['softdesk'],  # Seules applications lues sur les réplicas
+    'KEY_PREFIX': 'softdesk:primary-until',
+}
+
+conf = {**DEFAULTS, **getattr(settings, 'SOFTDESK_REPLICAS', {})}
+
+# Base de lecture de la requête en cours (None : primaire)
+_read_alias = ContextVar('softdesk_read_alias', default=None)
+
+
+class Routing:
+    """Base de lecture d'une requête, modifiable jusqu'à sa fin (``pin_recent``)."""
+
+    def __init__(self, alias):
+        self.alias = alias
+
+
+def _sticky_key(user_id):
+    return f"{conf['KEY_PREFIX']}:{user_id}"
+
+
+def request_user_id(request):
+    """Utilisateur du token JWT de la requête (cache des tokens vérifiés), ou None."""
+    from .authentication import CachedJWTAuthentication
+
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    try:
+        raw_token = authentication.get_raw_token(header) if header else None
+        if raw_token is None:
+            return None
+        return authentication.get_validated_token(raw_token).get(jwt_settings.USER_ID_CLAIM)
+    except AuthenticationFailed:
+        return None  # La vue répondra 401
+
+
+def pin_recent(versions):
+    """Garde le reste de la requête sur le primaire si un projet vient de changer."""
+    routing = _read_alias.get()
+    if routing is None or routing.alias is None:
+        return
+    since = time.time_ns() - conf['STICKY_SECONDS'] * 1_000_000_000
+    if any(version > since for version in versions):
+        routing.alias = None
+
+
+class ReplicaRouter:
+    """Lectures vers le réplica choisi pour la requête, écritures vers le primaire."""
+
+    def db_for_read(self, model, **hints):
+        routing = _read_alias.get()
+        if routing is None or routing.alias is None:
+            return DEFAULT_DB_ALIAS
+        if model._meta.app_label not in conf['REPLICA_APPS'] or model._meta.label in conf['PRIMARY_MODELS']:
+            return DEFAULT_DB_ALIAS
+        return routing.alias
+
+    def db_for_write(self, model, **hints):
+        # Explicite : sinon Django écrirait dans la base d'où l'instance a été lue
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *conf['ALIASES']}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Les réplicas sont des copies du primaire : jamais migrés directement
+        if db in conf['ALIASES']:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Choisit la base de lecture de chaque requête et marque l'auteur d'une
+    écriture réussie pour ``STICKY_SECONDS``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not conf['ALIASES']:
+            return self.get_response(request)
+        user_id = request_user_id(request)
+        sticky = user_id is not None and cache.get(_sticky_key(user_id)) is not None
+        routing = self.start(request, sticky)
+        token = _read_alias.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        if self.is_write(request, response) and user_id is not None:
+            cache.set(_sticky_key(user_id), True, conf['STICKY_SECONDS'])
+        return self.wrap_streaming(response, routing)
+
+    async def __acall__(self, request):
+        if not conf['ALIASES']:
+            return await self.get_response(request)
+        user_id = request_user_id(request)
+        sticky = user_id is not None and await cache.aget(_sticky_key(user_id)) is not None
+        routing = self.start(request, sticky)
+        token = _read_alias.set(routing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        if self.is_write(request, response) and user_id is not None:
+            await cache.aset(_sticky_key(user_id), True, conf['STICKY_SECONDS'])
+        return self.wrap_streaming(response, routing)
+
+    def start(self, request, sticky):
+        if request.method not in SAFE_METHODS or sticky:
+            return Routing(None)
+        return Routing(random.choice(conf['ALIASES']))
+
+    def is_write(self, request, response):
+        return request.method not in SAFE_METHODS and response.status_code < 400
+
+    def wrap_streaming(self, response, routing):
+        """Le contenu d'une réponse en flux (export) est lu après le middleware."""
+        if not getattr(response, 'streaming', False):
+            return response
+        if response.is_async:
+            response.streaming_content = self._aiter_with(response.streaming_content, routing)
+        else:
+            response.streaming_content = self._iter_with(response.streaming_content, routing)
+        return response
+
+    # Valeur précédente restaurée sans jeton : un générateur peut être fermé
+    # depuis un autre contexte que celui de sa première itération
+    def _iter_with(self, content, routing):
+        previous = _read_alias.get()
+        _read_alias.set(routing)
+        try:
+            yield from content
+        finally:
+            _read_alias.set(previous)
+
+    async def _aiter_with(self, content, routing):
+        previous = _read_alias.get()
+        _read_alias.set(routing)
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            _read_alias.set(previous)
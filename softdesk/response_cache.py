@@ -0,0 +1,155 @@
+"""
+Cache des réponses ``list`` / ``retrieve`` (Green Code)
+
+La clé combine l'utilisateur, l'hôte, le chemin avec ses paramètres et les
+versions des projets concernés (voir ``versioning.py``). Toute écriture sur
+un projet fait avancer sa version : les anciennes entrées ne sont plus
+jamais lues et expirent d'elles-mêmes. Une lecture répétée ne touche donc
+ni l'ORM ni le serializer (seul le rendu JSON est refait).
+
+Fonctionne avec n'importe quel backend de cache Django (mémoire locale,
+fichiers, Redis...), choisi par ``SOFTDESK_RESPONSE_CACHE['ALIAS']``.
+"""
+import hashlib
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from .versioning import get_project_versions
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'ALIAS': 'default',
+    'TIMEOUT': 300,
+    'KEY_PREFIX': 'softdesk:response',
+}
+
+
+class ResponseCache:
+    """Stockage des données sérialisées, avec compteurs de hits/misses."""
+
+    def __init__(self):
+        self.conf = {**DEFAULTS, **getattr(settings, 'SOFTDESK_RESPONSE_CACHE', {})}
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    @property
+    def enabled(self):
+        return self.conf['ENABLED']
+
+    @property
+    def backend(self):
+        return caches[self.conf['ALIAS']]
+
+    def make_key(self, request, versions):
+        raw = '|'.join([
+            str(request.user.pk),
+            request.get_host(),
+            request.get_full_path(),
+            *(f'{key}:{versions[key]}' for key in sorted(versions)),
+        ])
+        digest = hashlib.sha1(raw.encode(), usedforsecurity=False).hexdigest()
+        return f"{self.conf['KEY_PREFIX']}:{digest}"
+
+    def get(self, key):
+        entry = self.backend.get(key)
+        self._count('hits' if entry is not None else 'misses')
+        return entry
+
+    def set(self, key, entry):
+        self.backend.set(key, entry, self.conf['TIMEOUT'])
+        self._count('stores')
+
+    async def aget(self, key):
+        entry = await self.backend.aget(key)
+        self._count('hits' if entry is not None else 'misses')
+        return entry
+
+    async def aset(self, key, entry):
+        await self.backend.aset(key, entry, self.conf['TIMEOUT'])
+        self._count('stores')
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {'hits': 0, 'misses': 0, 'stores': 0}
+
+    def stats(self):
+        """Compteurs du processus courant, avec le taux de succès."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+response_cache = ResponseCache()
+
+
+class CachedResponseMixin:
+    """
+    À placer avant ``ConditionalGetMixin`` : sert ``list``/``retrieve``
+    depuis le cache, y compris les ``304`` à partir de l'ETag mémorisé.
+    """
+
+    def get_response_cache_key(self):
+        user = self.request.user
+        if not response_cache.enabled or not user.is_authenticated:
+            return None
+        versions = get_project_versions(self.get_version_project_ids())
+        return response_cache.make_key(self.request, versions)
+
+    def cached_response(self, request, build_response):
+        key = self.get_response_cache_key()
+        if key is None:
+            return build_response()
+
+        entry = response_cache.get(key)
+        if entry is not None:
+            return self.cache_hit_response(request, entry)
+
+        response = build_response()
+        entry = self.make_cache_entry(response)
+        if entry is not None:
+            response_cache.set(key, entry)
+        response['X-Cache'] = 'MISS'
+        logger.debug("Cache des réponses : %s", response_cache.stats())
+        return response
+
+    def cache_hit_response(self, request, entry):
+        data, etag, last_modified = entry
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = Response(data)
+            if etag:
+                response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    def make_cache_entry(self, response):
+        """Données et validateurs à mémoriser, ou None si la réponse ne se cache pas."""
+        if response.status_code != status.HTTP_200_OK or not hasattr(response, 'data'):
+            return None
+        last_modified = parse_http_date_safe(response.get('Last-Modified', ''))
+        return response.data, response.get('ETag'), last_modified
+
+    def list(self, request, *args, **kwargs):
+        parent = super()
+        return self.cached_response(request, lambda: parent.list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        parent = super()
+        return self.cached_response(request, lambda: parent.retrieve(request, *args, **kwargs))
@@ -0,0 +1,258 @@
+"""
+Recherche plein texte des issues et commentaires (Green Code)
+
+Index SQLite FTS5 ``softdesk_search`` (migration ``0007_search_index``),
+tenu à jour par des triggers : toute écriture passe par l'index, y compris
+les écritures groupées. Une recherche lit l'index inversé au lieu de
+parcourir les tables avec ``LIKE '%...%'``.
+
+- rowid = ``2 * id`` pour une issue, ``2 * id + 1`` pour un commentaire ;
+- colonne ``project_id`` indexée : la restriction aux projets de l'utilisateur
+  fait partie de la requête FTS5 (``project_id : ("1" OR "2")``) ;
+- classement BM25, le nom d'une issue pesant ``NAME_WEIGHT`` fois sa description,
+  calculé sur les seules ``MAX_CANDIDATES`` correspondances les plus récentes :
+  le coût d'un terme très fréquent reste borné ;
+- extraits avec les termes trouvés entre ``<mark>`` et ``</mark>`` ;
+- pagination par curseur sur ``(score, rowid)``, sans ``OFFSET``.
+
+``python manage.py rebuild_search_index`` reconstruit l'index. Sans SQLite
+(profil PostgreSQL), la migration ne crée pas l'index : la recherche répond
+501.
+"""
+import base64
+import binascii
+import re
+import unicodedata
+
+from django.db import connection, transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+
+NAME_WEIGHT = 10.0
+MAX_CANDIDATES = 1000
+SNIPPET_TOKENS = 12
+MAX_TERMS = 10
+BM25_K1 = 1.2
+BM25_B = 0.75
+KINDS = ('issue', 'comment')
+
+# Mots au sens du tokenizer unicode61 : lettres et chiffres, « _ » sépare
+_term_re = re.compile(r'[^\W_]+')
+
+
+class SearchUnavailable(APIException):
+    status_code = status.HTTP_501_NOT_IMPLEMENTED
+    default_detail = "Recherche plein texte indisponible : l'index FTS5 n'existe que sous SQLite."
+    default_code = 'search_unavailable'
+
+# Candidats : les correspondances les plus récentes, lues dans l'ordre des rowid
+# et coupées à MAX_CANDIDATES avant tout calcul de score ou d'extrait
+CANDIDATES_SQL = """
+    SELECT rowid, project_id, issue_id, name, description
+    FROM softdesk_search
+    WHERE softdesk_search MATCH %s {filters}
+    ORDER BY rowid DESC
+    LIMIT %s
+"""
+
+ISSUE_NAMES_SQL = 'SELECT id, name FROM softdesk_issue WHERE id IN ({ids})'
+
+REBUILD_SQL = [
+    'DELETE FROM softdesk_search',
+    """
+    INSERT INTO softdesk_search (rowid, name, description, project_id, issue_id)
+    SELECT id * 2, name, description, project_id, id FROM softdesk_issue
+    """,
+    """
+    INSERT INTO softdesk_search (rowid, name, description, project_id, issue_id)
+    SELECT c.id * 2 + 1, NULL, c.description, i.project_id, c.issue_id
+    FROM softdesk_comment c JOIN softdesk_issue i ON i.id = c.issue_id
+    """,
+    # Fusionne les segments de l'index (lectures plus rapides)
+    "INSERT INTO softdesk_search (softdesk_search) VALUES ('optimize')",
+]
+
+
+def fold(text):
+    """Comme ``unicode61 remove_diacritics 2`` : minuscules, sans diacritiques."""
+    text = text.lower()
+    if text.isascii():
+        return text
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+
+
+def search_terms(text):
+    """Mots recherchés, normalisés ; le dernier se cherche en préfixe."""
+    terms = [fold(term) for term in _term_re.findall(text or '')[:MAX_TERMS]]
+    if not terms:
+        raise ValidationError({'q': "Saisissez au moins un mot à rechercher."})
+    return terms
+
+
+def match_expression(terms):
+    """
+    Traduit la saisie de l'utilisateur en requête FTS5 sûre : chaque mot
+    devient une phrase entre guillemets (tous requis), le dernier en préfixe
+    (recherche au fil de la frappe). La syntaxe FTS5 n'est pas exposée.
+    """
+    return '{name description} : (%s*)' % ' '.join(f'"{term}"' for term in terms)
+
+
+def term_counts(tokens, terms):
+    """Occurrences de chaque terme parmi ``tokens`` (déjà normalisés)."""
+    *exact, prefix = terms
+    counts = [tokens.count(term) for term in exact]
+    counts.append(sum(1 for token in tokens if token.startswith(prefix)))
+    return counts
+
+
+def scores(candidates, terms):
+    """
+    BM25 des candidats, comme ``bm25()`` de FTS5 avec le nom pesant
+    ``NAME_WEIGHT`` fois la description. Tous les candidats contiennent tous
+    les termes : l'IDF, commun, est omis ; la longueur moyenne est celle des
+    candidats. Scores négatifs (le meilleur d'abord en ordre croissant).
+    """
+    rows = []
+    for name, description in candidates:
+        name_tokens = _term_re.findall(fold(name or ''))
+        description_tokens = _term_re.findall(fold(description or ''))
+        frequencies = [
+            NAME_WEIGHT * in_name + in_description
+            for in_name, in_description in zip(
+                term_counts(name_tokens, terms), term_counts(description_tokens, terms))
+        ]
+        rows.append((frequencies, len(name_tokens) + len(description_tokens)))
+    average = sum(length for _, length in rows) / len(rows) or 1
+    return [
+        -sum(
+            frequency * (BM25_K1 + 1)
+            / (frequency + BM25_K1 * (1 - BM25_B + BM25_B * length / average))
+            for frequency in frequencies
+        )
+        for frequencies, length in rows
+    ]
+
+
+def snippet(text, terms):
+    """
+    Extrait d'au plus ``SNIPPET_TOKENS`` mots autour de la première
+    correspondance, termes trouvés entre ``<mark>`` et ``</mark>``.
+    """
+    *exact, prefix = terms
+    words = list(_term_re.finditer(text))
+    hits = set()
+    for index, word in enumerate(words):
+        token = fold(word.group())
+        if token in exact or token.startswith(prefix):
+            hits.add(index)
+    first = min(hits, default=0)
+    start = max(0, min(first - 2, len(words) - SNIPPET_TOKENS))
+    end = min(len(words), start + SNIPPET_TOKENS)
+    if start >= end:
+        return text
+    parts = ['…'] if start else []
+    position = words[start].start()
+    for index in range(start, end):
+        word = words[index]
+        parts.append(text[position:word.start()])
+        parts.append(f'<mark>{word.group()}</mark>' if index in hits else word.group())
+        position = word.end()
+    if end < len(words):
+        parts.append('…')
+    return ''.join(parts)
+
+
+def best_column(name, description, terms):
+    """Colonne de l'extrait : celle qui contient le plus de termes trouvés."""
+    if not name:
+        return description or ''
+    in_name = sum(map(bool, term_counts(_term_re.findall(fold(name)), terms)))
+    in_description = sum(map(bool, term_counts(_term_re.findall(fold(description or '')), terms)))
+    return name if in_name > in_description else description or ''
+
+
+def scope_expression(project_ids):
+    """Restriction aux projets, résolue par l'index de la colonne ``project_id``."""
+    return 'project_id : (%s)' % ' OR '.join(f'"{int(pk)}"' for pk in project_ids)
+
+
+def encode_cursor(score, rowid):
+    raw = f'{score!r}|{rowid}'
+    return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        score, rowid = base64.urlsafe_b64decode(padded.encode('ascii')).decode('ascii').split('|')
+        return float(score), int(rowid)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise NotFound('Curseur invalide.')
+
+
+def search(text, project_ids, kind=None, limit=10, after=None):
+    """
+    Résultats classés pour ``text`` dans les projets ``project_ids``.
+    ``after`` : clé ``(score, rowid)`` du dernier résultat de la page précédente.
+    Retourne ``limit + 1`` lignes au plus (la dernière signale une page suivante).
+
+    Seuls les ``MAX_CANDIDATES`` candidats les plus récents sont classés :
+    un terme présent partout coûte une lecture d'index bornée, scores et
+    extraits se calculent en Python sur ces seules lignes.
+    """
+    if connection.vendor != 'sqlite':
+        raise SearchUnavailable()
+    terms = search_terms(text)
+    if not project_ids:
+        return []
+
+    filters = ''
+    params = [f'{match_expression(terms)} AND {scope_expression(project_ids)}']
+    if kind is not None:
+        filters = 'AND rowid %% 2 = %s'
+        params.append(KINDS.index(kind))
+    params.append(MAX_CANDIDATES)
+
+    with connection.cursor() as cursor:
+        cursor.execute(CANDIDATES_SQL.format(filters=filters), params)
+        candidates = {row[0]: row[1:] for row in cursor.fetchall()}
+        if not candidates:
+            return []
+        ranked = sorted(zip(
+            scores([(name, description) for _, _, name, description in candidates.values()], terms),
+            candidates,
+        ))
+        if after is not None:
+            ranked = [key for key in ranked if key > after]
+        ranked = ranked[:limit + 1]
+        issue_ids = {candidates[rowid][1] for _, rowid in ranked if rowid % 2}
+        issue_names = {}
+        if issue_ids:
+            cursor.execute(
+                ISSUE_NAMES_SQL.format(ids=', '.join(['%s'] * len(issue_ids))), list(issue_ids))
+            issue_names = dict(cursor.fetchall())
+
+    results = []
+    for score, rowid in ranked:
+        project_id, issue_id, name, description = candidates[rowid]
+        results.append({
+            'type': KINDS[rowid % 2],
+            'id': rowid // 2,
+            'project': int(project_id),
+            'issue': issue_id,
+            'issue_name': name if rowid % 2 == 0 else issue_names.get(issue_id),
+            'snippet': snippet(best_column(name, description, terms), terms),
+            'score': -score,
+            'key': (score, rowid),
+        })
+    return results
+
+
+def rebuild():
+    """Reconstruit l'index à partir des tables ; retourne le nombre d'entrées."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        for sql in REBUILD_SQL:
+            cursor.execute(sql)
+        cursor.execute('SELECT COUNT(*) FROM softdesk_search')
+        return cursor.fetchone()[0]
@@ -1,6 +1,123 @@
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from .models import User, Project, Contributor, Issue, Comment
+from .blacklist import refresh_blacklist
+from .passwords import last_login_buffer
+
+
+def query_param_list(request, name):
+    """Valeurs d'un paramètre séparées par des virgules (``?fields=a,b&fields=c``)."""
+    values = ','.join(request.query_params.getlist(name)).split(',')
+    return [value.strip() for value in values if value.strip()]
+
+
+class SparseFieldsMixin:
+    """
+    Champs à la demande pour les lectures (Green Code) :
+    - ``?fields=id,name`` : ne renvoie que ces champs ;
+    - ``?expand=author`` : remplace l'id d'une relation par un objet résumé
+      (relations déclarées dans ``expandable_fields``).
+    Sans ces paramètres la réponse est inchangée ; les écritures les ignorent.
+    ``get_query_plan()`` donne les jointures et colonnes utiles à la vue.
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.is_sparse = False
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return
+        fields = query_param_list(request, 'fields')
+        expand = query_param_list(request, 'expand')
+        if not fields and not expand:
+            return
+
+        errors = {}
+        unknown = [name for name in expand if name not in self.expandable_fields]
+        if unknown:
+            errors['expand'] = [f"Relation non extensible : {', '.join(unknown)}."]
+        unknown = [name for name in fields if name not in self.fields]
+        if unknown:
+            errors['fields'] = [f"Champ inconnu : {', '.join(unknown)}."]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        self.is_sparse = True
+        for name in expand:
+            self.fields[name] = self.expandable_fields[name](read_only=True)
+        if fields:
+            # Une relation étendue est renvoyée même si elle n'est pas listée
+            keep = set(fields) | set(expand)
+            for name in list(self.fields):
+                if name not in keep:
+                    self.fields.pop(name)
+
+    def get_query_plan(self, required=()):
+        """
+        Retourne ``(relations à joindre, colonnes à charger)`` pour les champs
+        retenus plus les sources ``required`` (ex. ``'issue.project'``), ou
+        None si un champ ne correspond pas à une colonne (pas de ``.only()``).
+        """
+        paths = [tuple(source.split('.')) for source in required]
+        for field in self.fields.values():
+            if field.write_only:
+                continue
+            if field.source == '*':
+                return None
+            if isinstance(field, serializers.BaseSerializer):
+                paths += [
+                    (*field.source_attrs, *child.source_attrs)
+                    for child in field.fields.values()
+                ]
+            else:
+                paths.append(tuple(field.source_attrs))
+
+        related, columns = set(), set()
+        for path in paths:
+            model = self.Meta.model
+            for depth, name in enumerate(path, start=1):
+                try:
+                    model_field = model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    return None
+                if not model_field.concrete:
+                    return None
+                if depth < len(path):
+                    if not model_field.many_to_one:
+                        return None
+                    model = model_field.related_model
+                    related.add('__'.join(path[:depth]))
+                # only() exige aussi la clé étrangère des relations traversées
+                columns.add('__'.join(path[:depth]))
+        return related, columns
+
+
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Utilisateur résumé (``?expand=author``...)"""
+    class Meta:
+        model = User
+        fields = ['id', 'username']
+
+
+class ProjectSummarySerializer(serializers.ModelSerializer):
+    """Projet résumé (``?expand=project``)"""
+    class Meta:
+        model = Project
+        fields = ['id', 'name', 'type']
+
+
+class IssueSummarySerializer(serializers.ModelSerializer):
+    """Issue résumée (``?expand=issue``)"""
+    class Meta:
+        model = Issue
+        fields = ['id', 'name', 'status']
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -28,11 +145,52 @@ class UserSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data.pop('password2')
+        # Hachage du mot de passe dans le pool borné (voir passwords.py)
         user = User.objects.create_user(**validated_data)
         return user
 
 
-class UserDetailSerializer(serializers.ModelSerializer):
+class LoginSerializer(TokenObtainPairSerializer):
+    """
+    Connexion (``login/``) : vérification du mot de passe dans le pool borné
+    (voir passwords.py), date de connexion écrite plus tard, par lot.
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        last_login_buffer.record(self.user.pk)
+        return data
+
+
+class RefreshSerializer(TokenRefreshSerializer):
+    """
+    Échange d'un refresh token (``token/refresh/``) : un token déjà échangé
+    est refusé (liste noire, voir blacklist.py), l'ancien y entre à la rotation.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        jti = refresh[jwt_settings.JTI_CLAIM]
+        if refresh_blacklist.contains(jti):
+            raise TokenError(_("Token is blacklisted"))
+
+        data = {'access': str(refresh.access_token)}
+
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            # INSERT refusé : échangé entre-temps, par ce processus ou un autre
+            if jwt_settings.BLACKLIST_AFTER_ROTATION and not refresh_blacklist.add(jti, refresh['exp']):
+                raise TokenError(_("Token is blacklisted"))
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+
+            data['refresh'] = str(refresh)
+
+        return data
+
+
+class UserDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer pour les détails de l'utilisateur (sans mot de passe)"""
     class Meta:
         model = User
@@ -41,9 +199,10 @@ class UserDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_time']
 
 
-class ContributorSerializer(serializers.ModelSerializer):
+class ContributorSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer pour les contributeurs"""
     user_username = serializers.CharField(source='user.username', read_only=True)
+    expandable_fields = {'user': UserSummarySerializer, 'project': ProjectSummarySerializer}
 
     class Meta:
         model = Contributor
@@ -57,19 +216,18 @@ class ContributorSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer pour les projets"""
     author_username = serializers.CharField(source='author.username', read_only=True)
-    contributors_count = serializers.SerializerMethodField()
+    expandable_fields = {'author': UserSummarySerializer}
 
     class Meta:
         model = Project
         fields = ['id', 'name', 'description', 'type', 'author', 'author_username', 
-                  'contributors_count', 'created_time']
-        read_only_fields = ['id', 'author', 'created_time']
-
-    def get_contributors_count(self, obj):
-        return obj.contributors.count()
+                  'contributors_count', 'issues_count', 'open_issues_count',
+                  'created_time', 'updated_time']
+        read_only_fields = ['id', 'author', 'contributors_count', 'issues_count',
+                            'open_issues_count', 'created_time', 'updated_time']
 
     def create(self, validated_data):
         # L'auteur devient automatiquement contributeur
@@ -77,21 +235,29 @@ class ProjectSerializer(serializers.ModelSerializer):
         validated_data['author'] = request.user
         project = Project.objects.create(**validated_data)
         Contributor.objects.create(user=request.user, project=project)
+        # Compteur incrémenté en base par le signal du contributeur
+        project.refresh_from_db(fields=['contributors_count'])
         return project
 
 
-class IssueSerializer(serializers.ModelSerializer):
+class IssueSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer pour les issues"""
     author_username = serializers.CharField(source='author.username', read_only=True)
     assigned_to_username = serializers.CharField(source='assigned_to.username', read_only=True, allow_null=True)
     project_name = serializers.CharField(source='project.name', read_only=True)
+    expandable_fields = {
+        'author': UserSummarySerializer,
+        'assigned_to': UserSummarySerializer,
+        'project': ProjectSummarySerializer,
+    }
 
     class Meta:
         model = Issue
         fields = ['id', 'name', 'description', 'priority', 'tag', 'status', 
                   'project', 'project_name', 'author', 'author_username', 
-                  'assigned_to', 'assigned_to_username', 'created_time']
-        read_only_fields = ['id', 'author', 'created_time']
+                  'assigned_to', 'assigned_to_username', 'comments_count',
+                  'created_time', 'updated_time']
+        read_only_fields = ['id', 'author', 'comments_count', 'created_time', 'updated_time']
 
     def validate_assigned_to(self, value):
         # Vérifier que l'utilisateur assigné est contributeur du projet
@@ -109,18 +275,73 @@ class IssueSerializer(serializers.ModelSerializer):
         return Issue.objects.create(**validated_data)
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer pour les commentaires"""
     author_username = serializers.CharField(source='author.username', read_only=True)
     issue_name = serializers.CharField(source='issue.name', read_only=True)
+    expandable_fields = {'author': UserSummarySerializer, 'issue': IssueSummarySerializer}
 
     class Meta:
         model = Comment
         fields = ['id', 'uuid', 'description', 'issue', 'issue_name', 
-                  'author', 'author_username', 'created_time']
-        read_only_fields = ['id', 'uuid', 'author', 'created_time']
+                  'author', 'author_username', 'created_time', 'updated_time']
+        read_only_fields = ['id', 'uuid', 'author', 'created_time', 'updated_time']
 
     def create(self, validated_data):
         request = self.context.get('request')
         validated_data['author'] = request.user
-        return Comment.objects.create(**validated_data)
\ No newline at end of file
+        return Comment.objects.create(**validated_data)
+
+
+class ProjectMembersMixin:
+    """
+    Contrôle d'assignation sans requête par élément : la vue fournit dans le
+    contexte l'ensemble ``member_ids`` des contributeurs du projet.
+    """
+    def validate_assigned_to(self, value):
+        if value is not None and value not in self.context['member_ids']:
+            raise serializers.ValidationError(
+                "L'utilisateur assigné doit être contributeur du projet."
+            )
+        return value
+
+
+class IssueBulkCreateSerializer(ProjectMembersMixin, serializers.ModelSerializer):
+    """Élément d'une création groupée d'issues (le projet vient de l'URL)"""
+    assigned_to = serializers.IntegerField(source='assigned_to_id', required=False, allow_null=True)
+
+    class Meta:
+        model = Issue
+        fields = ['name', 'description', 'priority', 'tag', 'status', 'assigned_to']
+
+
+class IssueBulkUpdateSerializer(ProjectMembersMixin, serializers.Serializer):
+    """Élément d'une modification groupée d'issues (statut, priorité, assignation)"""
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Issue.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Issue.PRIORITY_CHOICES, required=False)
+    assigned_to = serializers.IntegerField(source='assigned_to_id', required=False, allow_null=True)
+
+
+class CommentBulkCreateSerializer(serializers.ModelSerializer):
+    """Élément d'une création groupée de commentaires (l'issue vient de l'URL)"""
+    class Meta:
+        model = Comment
+        fields = ['description']
+
+
+class CommentBulkUpdateSerializer(serializers.Serializer):
+    """Élément d'une modification groupée de commentaires"""
+    id = serializers.IntegerField()
+    description = serializers.CharField()
+
+
+class SearchResultSerializer(serializers.Serializer):
+    """Résultat de recherche (issue ou commentaire), voir ``search.py``"""
+    type = serializers.CharField()
+    id = serializers.IntegerField()
+    project = serializers.IntegerField()
+    issue = serializers.IntegerField()
+    issue_name = serializers.CharField()
+    snippet = serializers.CharField()
+    score = serializers.FloatField()
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Signaux de l'application softdesk : invalidation des caches et compteurs
+"""
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .authentication import forget_user
+from .counters import adjust_issue, adjust_project
+from .membership import membership_cache
+from .models import Comment, Contributor, Issue, Project, User
+from .versioning import bump_project_versions, forget_issue_project
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Utilisateur modifié (mot de passe, désactivation...) : oublier la copie en cache"""
+    forget_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def bump_user_project_versions(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Le nom d'utilisateur figure dans les réponses des projets (auteurs,
+    assignés, contributeurs) : les projets où il apparaît changent de version.
+    """
+    if created or (update_fields is not None and 'username' not in update_fields):
+        return
+    project_ids = set(
+        Contributor.objects.filter(user_id=instance.pk).values_list('project_id', flat=True)
+    )
+    project_ids.update(Project.objects.filter(author_id=instance.pk).values_list('pk', flat=True))
+    project_ids.update(Issue.objects.filter(
+        Q(author_id=instance.pk) | Q(assigned_to_id=instance.pk)
+    ).values_list('project_id', flat=True).distinct())
+    project_ids.update(Comment.objects.filter(author_id=instance.pk).values_list(
+        'issue__project_id', flat=True
+    ).distinct())
+    bump_project_versions(project_ids)
+
+
+@receiver(post_save, sender=Contributor)
+@receiver(post_delete, sender=Contributor)
+def invalidate_contributor_membership(sender, instance, **kwargs):
+    """Un ajout ou un retrait de contributeur change les projets de l'utilisateur"""
+    membership_cache.invalidate_users_on_commit([instance.user_id])
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_membership(sender, instance, created=False, **kwargs):
+    """Le changement d'auteur (ou la suppression) d'un projet modifie les rôles"""
+    if created:
+        # L'auteur est ajouté comme contributeur juste après : géré ci-dessus
+        return
+    user_ids = set(
+        Contributor.objects.filter(project_id=instance.pk).values_list('user_id', flat=True)
+    )
+    user_ids.add(instance.author_id)
+    membership_cache.invalidate_users_on_commit(user_ids)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def bump_project_version(sender, instance, **kwargs):
+    bump_project_versions([instance.pk])
+
+
+@receiver(post_save, sender=Contributor)
+@receiver(post_delete, sender=Contributor)
+@receiver(post_save, sender=Issue)
+@receiver(post_delete, sender=Issue)
+def bump_parent_project_version(sender, instance, origin=None, **kwargs):
+    """Contributeurs et issues font partie des réponses de leur projet"""
+    if isinstance(origin, Project):
+        return  # Suppression en cascade : le projet lui-même est versionné
+    bump_project_versions([instance.project_id])
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comment_project_version(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, (Project, Issue)):
+        return  # Suppression en cascade : le parent est déjà versionné
+    if Comment.issue.is_cached(instance):
+        project_id = instance.issue.project_id
+    else:
+        project_id = Issue.objects.filter(pk=instance.issue_id).values_list(
+            'project_id', flat=True
+        ).first()
+    bump_project_versions([project_id])
+
+
+@receiver(post_save, sender=Issue)
+@receiver(post_delete, sender=Issue)
+def forget_issue_project_mapping(sender, instance, **kwargs):
+    """Une issue peut changer de projet : oublier la correspondance en cache"""
+    forget_issue_project(instance.pk)
+
+
+@receiver(post_save, sender=Contributor)
+def count_added_contributor(sender, instance, created, **kwargs):
+    if created:
+        adjust_project(instance.project_id, contributors=1)
+
+
+@receiver(post_delete, sender=Contributor)
+def count_removed_contributor(sender, instance, origin=None, **kwargs):
+    if not isinstance(origin, Project):
+        adjust_project(instance.project_id, contributors=-1)
+
+
+@receiver(pre_save, sender=Issue)
+def load_saved_issue_state(sender, instance, raw=False, **kwargs):
+    """État en base avant l'écriture, lu si l'instance ne le connaît pas"""
+    if not raw and instance.pk is not None:
+        instance.saved_state()
+
+
+@receiver(post_save, sender=Issue)
+def count_saved_issue(sender, instance, created, **kwargs):
+    """Création, changement de statut (ouvert/terminé) ou de projet d'une issue"""
+    state = None if created else instance.saved_state()
+    if state is None:
+        adjust_project(instance.project_id, issues=1, open_issues=int(instance.is_open))
+    else:
+        old_project_id, old_status = state
+        was_open = int(old_status != Issue.CLOSED_STATUS)
+        if old_project_id != instance.project_id:
+            adjust_project(old_project_id, issues=-1, open_issues=-was_open)
+            adjust_project(instance.project_id, issues=1, open_issues=int(instance.is_open))
+            bump_project_versions([old_project_id])
+        elif was_open != instance.is_open:
+            adjust_project(instance.project_id, open_issues=int(instance.is_open) - was_open)
+    instance.remember_saved_state()
+
+
+@receiver(post_delete, sender=Issue)
+def count_deleted_issue(sender, instance, origin=None, **kwargs):
+    if not isinstance(origin, Project):
+        adjust_project(instance.project_id, issues=-1, open_issues=-int(instance.is_open))
+
+
+@receiver(post_save, sender=Comment)
+def count_added_comment(sender, instance, created, **kwargs):
+    if created:
+        adjust_issue(instance.issue_id, comments=1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, origin=None, **kwargs):
+    if not isinstance(origin, (Project, Issue)):
+        adjust_issue(instance.issue_id, comments=-1)
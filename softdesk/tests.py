@@ -1,3 +1,1321 @@
-from django.test import TestCase
+import csv
+import datetime
+import decimal
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+
+from django.conf import settings
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from softdesk import passwords, renderers, replicas, throttling
+from softdesk.authentication import token_cache, user_cache
+from softdesk.backends.sqlite3.base import DatabaseWrapper as SQLiteWrapper
+from softdesk.blacklist import BloomFilter, refresh_blacklist
+from softdesk.checks import check_shared_caches
+from softdesk.counters import recount
+from softdesk.export import CSV_COLUMNS, ProjectExport
+from softdesk.filters import IndexedFilterBackend, covering_index, supported_combinations
+from softdesk.membership import membership_cache
+from softdesk.models import BlacklistedRefreshToken, Comment, Contributor, Issue, Project, User
+from softdesk.pagination import KeysetPagination
+from softdesk.passwords import HashingPool, HashingUnavailable, hashing_pool, last_login_buffer
+from softdesk.renderers import FastJSONParser, FastJSONRenderer
+from softdesk.replicas import ReplicaRouter, ReplicaRoutingMiddleware, Routing, _read_alias
+from softdesk.response_cache import response_cache
+from softdesk.serializers import CommentSerializer, IssueSerializer
+from softdesk.views import CommentViewSet, IssueViewSet
+
+# Plus d'une petite page : une requête par ligne (N+1) changerait le compte entre 10 et 100
+ROWS = 15
+PAGE_SIZES = (10, 100)
+# « SCAN table » sans index, ou « SCAN table USING COVERING INDEX » : parcours complet
+FULL_SCAN = re.compile(r'\bSCAN (?!CONSTANT ROW)')
+
+
+def clear_caches():
+    """Caches partagés et locaux au processus : chaque test part à froid."""
+    for alias in settings.CACHES:
+        caches[alias].clear()
+    membership_cache.clear_local()
+    token_cache.clear()
+    user_cache.clear()
+
+
+def make_user(username, **fields):
+    return User.objects.create(username=username, email=f'{username}@example.com', age=30, password='!', **fields)
+
+
+def make_project(author, name='Projet', contributors=()):
+    """Projet avec son auteur et ``contributors`` comme contributeurs."""
+    project = Project.objects.create(name=name, description='-', type='back-end', author=author)
+    for user in (author, *contributors):
+        Contributor.objects.create(user=user, project=project)
+    return project
+
+
+class APITests(TestCase):
+    """Client authentifié comme ``self.user``, caches vidés, throttling coupé."""
+
+    def setUp(self):
+        clear_caches()
+        patcher = mock.patch.dict(throttling.conf, ENABLED=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+class KeysetPaginationTests(APITests):
+    """Pagination par curseur : ni doublon ni trou, y compris à created_time égal."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+        cls.project = make_project(cls.user)
+        Issue.objects.bulk_create(
+            Issue(name=f'Issue {i}', description='-', project=cls.project, author=cls.user) for i in range(7)
+        )
+        # Égalités sur created_time : l'id départage
+        moment = Issue.objects.earliest('created_time').created_time
+        Issue.objects.filter(pk__in=Issue.objects.order_by('id').values('id')[2:5]).update(created_time=moment)
+        cls.url = f'/api/projects/{cls.project.pk}/issues/'
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.dict(response_cache.conf, ENABLED=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def walk(self, url, link):
+        pages = []
+        while url is not None:
+            data = self.client.get(url).data
+            pages.append([issue['id'] for issue in data['results']])
+            url = data[link]
+        return pages
+
+    def test_forward_and_back(self):
+        for ordering in ('-created_time', 'created_time'):
+            with self.subTest(ordering=ordering):
+                expected = [issue['id'] for issue in self.client.get(
+                    self.url, {'ordering': ordering, 'page_size': 100}).data['results']]
+                pages = self.walk(f'{self.url}?ordering={ordering}&page_size=3&pagination=cursor', 'next')
+                self.assertEqual([len(page) for page in pages], [3, 3, 1])
+                self.assertEqual(sum(pages, []), expected)
+                # Retour en arrière depuis la dernière page
+                last = self.client.get(f'{self.url}?ordering={ordering}&page_size=3&pagination=cursor')
+                while last.data['next']:
+                    last = self.client.get(last.data['next'])
+                backward = self.walk(last.data['previous'], 'previous')
+                self.assertEqual(sum(reversed(backward), []), expected[:6])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(self.url, {'cursor': 'pas-un-curseur'}).status_code, 404)
+
+
+# Cache local : avec le profil « database », ses lectures seraient comptées
+@override_settings(CACHES={'default': settings.CACHE_PROFILES['local']})
+class QueryCountTests(APITests):
+    """
+    Nombre de requêtes SQL de chaque action list/retrieve, identique pour une
+    page de 10 et de 100 lignes. Mesures à froid : caches vidés avant chaque
+    requête, cache des réponses et throttling coupés.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [make_user(f'user{index}') for index in range(ROWS)]
+        cls.user = cls.users[0]
+        cls.projects = [make_project(cls.user, f'Projet {index}') for index in range(ROWS)]
+        cls.project = cls.projects[0]
+        for user in cls.users[1:]:
+            Contributor.objects.create(user=user, project=cls.project)
+        # Auteurs et assignés tous différents : une relation non préchargée se verrait
+        cls.issues = [
+            Issue.objects.create(name=f'Issue {index}', description='-', project=cls.project,
+                                 author=user, assigned_to=user)
+            for index, user in enumerate(cls.users)
+        ]
+        cls.issue = cls.issues[0]
+        cls.comments = [
+            Comment.objects.create(description=f'Commentaire {index}', issue=cls.issue, author=user)
+            for index, user in enumerate(cls.users)
+        ]
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.dict(response_cache.conf, ENABLED=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, url, queries, **params):
+        clear_caches()
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def assertListQueries(self, url, queries, rows=ROWS, paginated=True, **params):
+        for page_size in PAGE_SIZES:
+            with self.subTest(url=url, page_size=page_size, **params):
+                data = self.get(url, queries, page_size=page_size, **params)
+                results = data['results'] if paginated else data
+                self.assertEqual(len(results), min(page_size, rows) if paginated else rows)
+
+    def test_users(self):
+        self.assertListQueries('/api/users/', 2, rows=1)
+        self.get(f'/api/users/{self.user.pk}/', 1)
+
+    def test_projects(self):
+        self.assertListQueries('/api/projects/', 4)
+        self.assertListQueries('/api/projects/', 3, pagination='cursor')
+        self.get(f'/api/projects/{self.project.pk}/', 2)
+
+    def test_project_contributors(self):
+        # Les routes imbriquées /contributors/ sont masquées par les actions du projet.
+        # Liste non paginée : page_size sans effet, le compte ne doit pas bouger
+        self.assertListQueries(f'/api/projects/{self.project.pk}/contributors/', 4, paginated=False)
+
+    def test_issues(self):
+        url = f'/api/projects/{self.project.pk}/issues/'
+        self.assertListQueries(url, 4)
+        self.assertListQueries(url, 3, pagination='cursor')
+        self.get(f'{url}{self.issue.pk}/', 2)
+
+    def test_comments(self):
+        url = f'/api/projects/{self.project.pk}/issues/{self.issue.pk}/comments/'
+        self.assertListQueries(url, 5)
+        self.assertListQueries(url, 4, pagination='cursor')
+        self.get(f'{url}{self.comments[0].pk}/', 3)
+
+
+@skipUnless(connection.vendor == 'sqlite', "EXPLAIN QUERY PLAN : SQLite seulement")
+class IndexedFilterPlanTests(TestCase):
+    """
+    Plan de chaque combinaison de ``supported_combinations()``, dans les deux
+    sens de tri : lecture de l'index qui la couvre, sans parcours complet
+    (``SCAN``) ni tri temporaire (``TEMP B-TREE``).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+        cls.project = make_project(cls.user)
+        cls.issue = Issue.objects.create(name='Issue', description='-', project=cls.project, author=cls.user)
+        Comment.objects.create(description='Commentaire', issue=cls.issue, author=cls.user)
+
+    def setUp(self):
+        clear_caches()
+
+    def make_view(self, viewset_class, params, **kwargs):
+        request = Request(APIRequestFactory().get('/', params))
+        request.user = self.user
+        return viewset_class(request=request, kwargs=kwargs, action='list', format_kwarg=None)
+
+    def assertIndexedPlans(self, viewset_class, **kwargs):
+        backend = IndexedFilterBackend()
+        view = self.make_view(viewset_class, {}, **kwargs)
+        model = view.get_queryset().model
+        scope = backend.get_scope(view)
+        self.assertEqual(len(viewset_class.index_orderings), 2)
+        for ordering_name, ordering in viewset_class.index_orderings.items():
+            columns = [column.lstrip('-') for column in ordering]
+            combinations = supported_combinations(view, model, scope, columns)
+            self.assertTrue(combinations, f"Aucune combinaison pour le tri {ordering_name}")
+            for combination in combinations:
+                params = {name: view.index_filters[name].example(self.user) for name in combination}
+                params['ordering'] = ordering_name
+                with self.subTest(model=model._meta.model_name, combination=combination, ordering=ordering_name):
+                    filtered = self.make_view(viewset_class, params, **kwargs)
+                    queryset = filtered.filter_queryset(filtered.get_queryset())
+                    fields = [view.index_filters[name].field for name in combination]
+                    index = covering_index(model, scope, fields, columns)
+                    plan = queryset[:KeysetPagination.page_size + 1].explain()
+                    self.assertIn(index.name, plan)
+                    self.assertNotRegex(plan, FULL_SCAN)
+                    self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_issue_filters(self):
+        self.assertIndexedPlans(IssueViewSet, project_pk=self.project.pk)
+
+    def test_comment_filters(self):
+        self.assertIndexedPlans(CommentViewSet, project_pk=self.project.pk, issue_pk=self.issue.pk)
+
+
+class ResponseCacheTests(APITests):
+    """Cache des réponses : une écriture, même sur une ligne liée, donne un MISS."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+        cls.project = make_project(cls.user)
+        cls.issue = Issue.objects.create(name='Issue', description='-', project=cls.project, author=cls.user)
+        cls.url = f'/api/projects/{cls.project.pk}/issues/'
+
+    def test_repeated_list_is_a_hit(self):
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+
+    def test_issue_write_is_a_miss(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'{self.url}{self.issue.pk}/', {'name': 'Renommée'}, format='json')
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['name'], 'Renommée')
+
+    def test_author_rename_is_a_miss(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.username = 'alice-renamed'
+            self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['author_username'], 'alice-renamed')
+
+    def test_password_change_keeps_entries(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password('Nouveau-mot-de-passe-1')
+            self.user.save(update_fields=['password'])
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+
+
+class SharedCacheTests(SimpleTestCase):
+    """Plusieurs processus : démarrage refusé avec un cache local au processus."""
+    local = {'default': settings.CACHE_PROFILES['local']}
+    shared = {'default': settings.CACHE_PROFILES['database']}
+
+    def test_single_process_accepts_local_cache(self):
+        with self.settings(SOFTDESK_WORKERS=1, CACHES=self.local):
+            check_shared_caches()
+
+    def test_workers_refuse_local_cache(self):
+        with self.settings(SOFTDESK_WORKERS=4, CACHES=self.local):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'default'):
+                check_shared_caches()
+
+    def test_workers_accept_shared_cache(self):
+        with self.settings(SOFTDESK_WORKERS=4, CACHES=self.shared):
+            check_shared_caches()
+
+    def test_workers_refuse_local_response_cache(self):
+        caches_ = {**self.shared, 'responses': settings.CACHE_PROFILES['local']}
+        with self.settings(SOFTDESK_WORKERS=4, CACHES=caches_), \
+                mock.patch.dict(response_cache.conf, ALIAS='responses'):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'cache des réponses'):
+                check_shared_caches()
+
+
+class MembershipCacheTests(TestCase):
+    """Appartenances en cache : un retrait de contributeur n'est jamais masqué."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = make_user('alice')
+        cls.member = make_user('bob')
+        cls.project = make_project(cls.author, contributors=[cls.member])
+
+    def setUp(self):
+        clear_caches()
+
+    def remove_member(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Contributor.objects.filter(user=self.member, project=self.project).delete()
+
+    def test_removal_is_seen(self):
+        self.assertTrue(membership_cache.is_member(self.member, self.project.pk))
+        self.remove_member()
+        self.assertFalse(membership_cache.is_member(self.member, self.project.pk))
+
+    def test_invalidation_during_load_is_not_overwritten(self):
+        # Retrait validé (et invalidé) entre le chargement des rôles et leur mise en cache
+        load = membership_cache._load
+
+        def load_then_remove(user_id):
+            roles = load(user_id)
+            self.remove_member()
+            return roles
+
+        with mock.patch.object(membership_cache, '_load', side_effect=load_then_remove):
+            self.assertTrue(membership_cache.is_member(self.member, self.project.pk))
+        self.assertFalse(membership_cache.is_member(self.member, self.project.pk))
+        # Cache local vidé : la valeur partagée ne doit pas non plus être l'ancienne
+        membership_cache.clear_local()
+        self.assertFalse(membership_cache.is_member(self.member, self.project.pk))
+
+
+class AsyncViewTests(TestCase):
+    """Lectures async (``config.urls_async``) : mêmes réponses que les vues synchrones."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+        cls.member = make_user('bob')
+        cls.outsider = make_user('carol')
+        cls.project = make_project(cls.user, contributors=[cls.member])
+        cls.issue = Issue.objects.create(name='Issue', description='-', project=cls.project,
+                                         author=cls.user, assigned_to=cls.member)
+        cls.comment = Comment.objects.create(description='Commentaire', issue=cls.issue, author=cls.member)
+        project = f'/api/projects/{cls.project.pk}/'
+        issue = f'{project}issues/{cls.issue.pk}/'
+        cls.urls = [
+            '/api/projects/', project, f'{project}contributors/', f'{project}board-stats/',
+            f'{project}issues/', f'{project}issues/?status=To Do', issue,
+            f'{issue}comments/', f'{issue}comments/{cls.comment.pk}/',
+            f'{project}issues/0/', f'{project}issues/0/comments/',
+            # Issue d'un autre projet que celui de l'URL
+            f'/api/projects/0/issues/{cls.issue.pk}/comments/',
+        ]
+
+    def setUp(self):
+        clear_caches()
+
+    def headers(self, user):
+        return {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+
+    def sync_get(self, url, user):
+        clear_caches()
+        return APIClient().get(url, headers=self.headers(user))
+
+    def async_get(self, url, user):
+        clear_caches()
+        with override_settings(ROOT_URLCONF='config.urls_async'):
+            return async_to_sync(AsyncClient().get)(url, headers=self.headers(user))
+
+    def test_same_responses(self):
+        for user in (self.user, self.outsider):
+            for url in self.urls:
+                with self.subTest(user=user.username, url=url):
+                    expected = self.sync_get(url, user)
+                    response = self.async_get(url, user)
+                    self.assertEqual(response.status_code, expected.status_code)
+                    self.assertEqual(response.json(), expected.json())
+
+    def test_outsider_sees_nothing(self):
+        response = self.async_get(f'/api/projects/{self.project.pk}/issues/', self.outsider)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [])
+        response = self.async_get(f'/api/projects/{self.project.pk}/issues/{self.issue.pk}/', self.outsider)
+        self.assertEqual(response.status_code, 404)
+
+
+class CounterTests(APITests):
+    """Les compteurs dénormalisés restent exacts après chaque écriture (aucun écart pour ``recount``)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+        cls.project = make_project(cls.user)
+        cls.other_project = make_project(cls.user, 'Autre projet')
+
+    def new_issue(self, **fields):
+        return Issue.objects.create(name='Issue', description='-', project=self.project, author=self.user, **fields)
+
+    def assertNoDrift(self):
+        self.assertEqual(recount(dry_run=True), {'project': 0, 'issue': 0})
+        self.project.refresh_from_db()
+        return self.project
+
+    def test_patch_and_delete(self):
+        issue = self.new_issue()
+        url = f'/api/projects/{self.project.pk}/issues/{issue.pk}/'
+        response = self.client.patch(url, {'status': Issue.CLOSED_STATUS})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.assertNoDrift().open_issues_count, 0)
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self.assertNoDrift().issues_count, 0)
+
+    def test_bulk_patch(self):
+        issues = [self.new_issue() for _ in range(3)]
+        response = self.client.patch(
+            f'/api/projects/{self.project.pk}/issues/bulk/',
+            [{'id': issue.pk, 'status': Issue.CLOSED_STATUS} for issue in issues[:2]], format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.assertNoDrift().open_issues_count, 1)
+
+    def test_instance_without_loaded_state(self):
+        issue = self.new_issue()
+        # Construite à la main : l'ancien état est relu en base avant l'écriture
+        Issue(pk=issue.pk, name='Issue', description='-', project=self.other_project,
+              author=self.user, status=Issue.CLOSED_STATUS, created_time=issue.created_time).save()
+        self.assertEqual(self.assertNoDrift().issues_count, 0)
+
+    def test_deferred_status(self):
+        issue = self.new_issue()
+        deferred = Issue.objects.only('id', 'project').get(pk=issue.pk)
+        deferred.status = Issue.CLOSED_STATUS
+        deferred.save()
+        self.assertEqual(self.assertNoDrift().open_issues_count, 0)
+        # Relecture d'un champ différé : l'état connu suit la base
+        deferred = Issue.objects.defer('status').get(pk=issue.pk)
+        self.assertEqual(deferred.status, Issue.CLOSED_STATUS)
+        deferred.status = 'To Do'
+        deferred.save()
+        self.assertEqual(self.assertNoDrift().open_issues_count, 1)
+
+    def test_bulk_contributors_with_concurrent_add(self):
+        bob, carol = make_user('bob'), make_user('carol')
+        bulk_create = Contributor.objects.bulk_create
+
+        def concurrent_bulk_create(objs, **kwargs):
+            # Ajout unitaire validé entre la lecture des contributeurs existants et l'insertion
+            Contributor.objects.create(user=bob, project=self.project)
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(Contributor.objects, 'bulk_create', concurrent_bulk_create):
+            response = self.client.post(f'/api/projects/{self.project.pk}/bulk-contributors/',
+                                        {'add': ['bob', 'carol']}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.assertNoDrift().contributors_count, 3)
+        response = self.client.post(f'/api/projects/{self.project.pk}/bulk-contributors/',
+                                    {'remove': [carol.pk]}, format='json')
+        self.assertEqual(response.data['removed'], [carol.pk])
+        self.assertEqual(self.assertNoDrift().contributors_count, 2)
+
+
+class BulkWriteTests(APITests):
+    """Écritures groupées : tout ou rien, dans le périmètre de l'URL."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+        cls.bob = make_user('bob')
+        cls.project = make_project(cls.user, contributors=[cls.bob])
+        cls.other_project = make_project(cls.user, 'Autre projet')
+        cls.issue = Issue.objects.create(name='Issue', description='-', project=cls.project, author=cls.user)
+        cls.issues_url = f'/api/projects/{cls.project.pk}/issues/bulk/'
+        cls.comments_url = f'/api/projects/{cls.project.pk}/issues/{cls.issue.pk}/comments/bulk/'
+
+    def test_create_and_patch_issues(self):
+        response = self.client.post(self.issues_url, [
+            {'name': 'Une', 'description': '-'},
+            {'name': 'Deux', 'description': '-', 'status': Issue.CLOSED_STATUS},
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([issue['name'] for issue in response.data], ['Une', 'Deux'])
+        ids = [issue['id'] for issue in response.data]
+        response = self.client.patch(self.issues_url, [{'id': pk, 'priority': 'HIGH'} for pk in ids], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(Issue.objects.filter(pk__in=ids).values_list('priority', flat=True)), {'HIGH'})
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.issues_count, self.project.open_issues_count), (3, 2))
+
+    def test_invalid_item_writes_nothing(self):
+        response = self.client.post(self.issues_url, [
+            {'name': 'Valide', 'description': '-'},
+            {'name': 'Invalide', 'description': '-', 'priority': 'URGENT'},
+        ], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'][0], {})
+        self.assertIn('priority', response.data['errors'][1])
+        self.assertFalse(Issue.objects.filter(name='Valide').exists())
+
+    def test_comments(self):
+        response = self.client.post(self.comments_url, [{'description': 'Un'}, {'description': 'Deux'}], format='json')
+        self.assertEqual(response.status_code, 201)
+        ids = [comment['id'] for comment in response.data]
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.comments_count, 2)
+        # Seul l'auteur modifie ses commentaires
+        self.client.force_authenticate(self.bob)
+        response = self.client.patch(self.comments_url, [{'id': ids[0], 'description': 'Modifié'}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Comment.objects.filter(description='Modifié').exists())
+
+    def test_issue_outside_url_project(self):
+        base = f'/api/projects/{self.other_project.pk}/issues/{self.issue.pk}/comments/'
+        response = self.client.post(base + 'bulk/', [{'description': 'Égaré'}], format='json')
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post(base, {'description': 'Égaré', 'issue': self.issue.pk})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.get(base).status_code, 404)
+        self.assertFalse(Comment.objects.exists())
+
+
+class HashingPoolTests(SimpleTestCase):
+    """Sous WSGI, au plus ``max_waiting`` threads attendent un hachage."""
+
+    def test_waiting_threads_are_capped(self):
+        pool = HashingPool(workers=1, max_pending=64, max_waiting=1)
+        started, release = threading.Event(), threading.Event()
+
+        def slow_hash():
+            started.set()
+            release.wait(5)
+            return 'haché'
+
+        with ThreadPoolExecutor(1) as executor:
+            first = executor.submit(pool.run, slow_hash)
+            started.wait(5)
+            with self.assertRaises(HashingUnavailable):
+                pool.run(str)
+            # Sous ASGI, l'attente ne bloque pas de thread : la file d'attente reste ouverte
+            queued = pool.submit(str, 'async')
+            release.set()
+            self.assertEqual(first.result(), 'haché')
+            self.assertEqual(queued.result(), 'async')
+        self.assertEqual(pool.run(str, 'libre'), 'libre')
+
+
+class LoginTests(TestCase):
+    """Connexion : 503 quand le hachage est saturé, dernière connexion écrite par lot."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+        cls.user.set_password('motdepasse-123')
+        cls.user.save()
+
+    def setUp(self):
+        clear_caches()
+        patcher = mock.patch.dict(throttling.conf, ENABLED=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def login(self):
+        return APIClient().post('/api/login/', {'username': 'alice', 'password': 'motdepasse-123'}, format='json')
+
+    def test_saturated_hashing_is_503(self):
+        with mock.patch.object(hashing_pool, '_waiting', threading.BoundedSemaphore(1)) as waiting:
+            waiting.acquire()
+            response = self.login()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], str(passwords.conf['RETRY_AFTER']))
+
+    def test_last_login_is_flushed(self):
+        self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertIsNone(self.user.last_login)
+        last_login_buffer.flush()
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+
+
+class ResetDbTests(TestCase):
+    """``reset_db`` : jeu de données reproductible, remise à zéro sans toucher aux superutilisateurs."""
+
+    def reset_db(self, *args):
+        out = io.StringIO()
+        call_command('reset_db', *args, stdout=out)
+        return out.getvalue()
+
+    def test_generate_then_reset(self):
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'motdepasse-123', age=40)
+        make_project(admin)
+        sizes = ['--users', '6', '--projects', '3', '--contributors', '2', '--issues', '12', '--comments', '30']
+        self.reset_db(*sizes)
+        counts = [model.objects.count() for model in (Project, Issue, Comment)]
+        self.assertEqual(counts, [3, 12, 30])
+        self.assertEqual(User.objects.count(), 7)
+        self.assertEqual(recount(dry_run=True), {'project': 0, 'issue': 0})
+        first = list(Issue.objects.order_by('id').values_list('name', 'status'))
+        self.reset_db(*sizes)
+        self.assertEqual(list(Issue.objects.order_by('id').values_list('name', 'status')), first)
+
+        output = self.reset_db()
+        self.assertIn('user : 6 ligne(s) supprimée(s)', output)
+        self.assertNotIn('test_api.py', output)
+        self.assertEqual(list(User.objects.all()), [admin])
+        self.assertFalse(Contributor.objects.exists() or Project.objects.exists())
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT COUNT(*) FROM softdesk_search')
+                self.assertEqual(cursor.fetchone(), (0,))
+
+
+@mock.patch.dict(replicas.conf, ALIASES=['replica1'])
+class ReplicaRouterTests(SimpleTestCase):
+    """Seules les lectures des modèles de l'API, dans une requête sûre, vont au réplica."""
+
+    def read_alias(self, model, routing):
+        token = _read_alias.set(routing)
+        try:
+            return ReplicaRouter().db_for_read(model)
+        finally:
+            _read_alias.reset(token)
+
+    def test_read_routing(self):
+        routing = Routing('replica1')
+        for model in (Project, Issue, Comment):
+            self.assertEqual(self.read_alias(model, routing), 'replica1')
+        for model in (User, Contributor, Session, ContentType, LogEntry, Permission):
+            with self.subTest(model=model._meta.label):
+                self.assertEqual(self.read_alias(model, routing), 'default')
+        self.assertEqual(self.read_alias(Issue, Routing(None)), 'default')
+        self.assertEqual(self.read_alias(Issue, None), 'default')
+        self.assertEqual(ReplicaRouter().db_for_write(Issue), 'default')
+
+    def test_request_routing(self):
+        middleware = ReplicaRoutingMiddleware(lambda request: None)
+        factory = APIRequestFactory()
+        self.assertEqual(middleware.start(factory.get('/api/projects/'), sticky=False).alias, 'replica1')
+        self.assertIsNone(middleware.start(factory.get('/api/projects/'), sticky=True).alias)
+        self.assertIsNone(middleware.start(factory.post('/api/projects/'), sticky=False).alias)
+
+    def test_recent_project_pins_primary(self):
+        routing = Routing('replica1')
+        token = _read_alias.set(routing)
+        try:
+            replicas.pin_recent([time.time_ns() - 3600 * 1_000_000_000])
+            self.assertEqual(routing.alias, 'replica1')
+            replicas.pin_recent([time.time_ns()])
+            self.assertIsNone(routing.alias)
+        finally:
+            _read_alias.reset(token)
+
+
+class ConditionalGetTests(APITests):
+    """ETag / Last-Modified : 304 tant que rien ne change, nouvel ETag après une écriture."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+        cls.project = make_project(cls.user)
+        cls.issue = Issue.objects.create(name='Issue', description='-', project=cls.project, author=cls.user)
+        cls.url = f'/api/projects/{cls.project.pk}/issues/'
+
+    def assertNotModified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def assertModified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        return response['ETag']
+
+    def write(self, method, url, data=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = getattr(self.client, method)(url, data, format='json')
+        self.assertLess(response.status_code, 300)
+
+    def test_list(self):
+        response = self.client.get(self.url)
+        self.assertIn('Last-Modified', response)
+        etag = response['ETag']
+        self.assertNotModified(self.url, etag)
+        self.write('patch', f'{self.url}{self.issue.pk}/', {'status': 'In Progress'})
+        etag = self.assertModified(self.url, etag)
+        self.assertNotModified(self.url, etag)
+        # Suppression
+        other = Issue.objects.create(name='Autre', description='-', project=self.project, author=self.user)
+        etag = self.client.get(self.url)['ETag']
+        self.write('delete', f'{self.url}{other.pk}/')
+        self.assertModified(self.url, etag)
+
+    def test_detail(self):
+        url = f'{self.url}{self.issue.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.assertNotModified(url, etag)
+        self.write('post', f'{url}comments/', {'description': 'Nouveau', 'issue': self.issue.pk})
+        self.assertModified(url, etag)
+
+    def test_etag_is_per_user(self):
+        etag = self.client.get(self.url)['ETag']
+        bob = make_user('bob')
+        Contributor.objects.create(user=bob, project=self.project)
+        self.client.force_authenticate(bob)
+        self.assertModified(self.url, etag)
+
+
+class AuthCacheTests(TestCase):
+    """Utilisateur en cache : oublié dès qu'il change, token révoqué au changement de mot de passe."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+        cls.project = make_project(cls.user)
+        cls.url = f'/api/projects/{cls.project.pk}/'
+
+    def setUp(self):
+        clear_caches()
+        patcher = mock.patch.dict(throttling.conf, ENABLED=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, token):
+        return APIClient().get(self.url, headers={'Authorization': f'Bearer {token}'})
+
+    def test_user_is_cached_until_saved(self):
+        token = AccessToken.for_user(self.user)
+        self.assertEqual(self.get(token).status_code, 200)
+        self.assertEqual(user_cache.get(self.user.pk).password, '!')
+        self.user.set_password('Nouveau-mot-de-passe-1')
+        self.user.save(update_fields=['password'])
+        self.assertIsNone(user_cache.get(self.user.pk))
+        self.assertEqual(self.get(token).status_code, 200)
+        self.assertEqual(user_cache.get(self.user.pk).password, self.user.password)
+
+    def test_deactivated_user_is_refused(self):
+        token = AccessToken.for_user(self.user)
+        self.assertEqual(self.get(token).status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get(token).status_code, 401)
+
+    # override_settings recréerait api_settings, déjà importé par les modules de simplejwt
+    @mock.patch.object(jwt_settings, 'CHECK_REVOKE_TOKEN', True)
+    def test_password_change_revokes_cached_token(self):
+        token = AccessToken.for_user(self.user)
+        self.assertEqual(self.get(token).status_code, 200)
+        self.assertEqual(self.get(token).status_code, 200)  # Token et utilisateur en cache
+        self.user.set_password('Nouveau-mot-de-passe-1')
+        self.user.save(update_fields=['password'])
+        self.assertEqual(self.get(token).status_code, 401)
+        self.assertEqual(self.get(AccessToken.for_user(self.user)).status_code, 200)
+
+
+class SparseFieldsTests(APITests):
+    """``?fields=`` / ``?expand=`` : champs renvoyés, colonnes chargées, erreurs."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+        cls.bob = make_user('bob')
+        cls.project = make_project(cls.user, contributors=[cls.bob])
+        cls.issue = Issue.objects.create(name='Issue', description='Longue description', project=cls.project,
+                                         author=cls.user, assigned_to=cls.bob)
+        cls.url = f'/api/projects/{cls.project.pk}/issues/'
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.dict(response_cache.conf, ENABLED=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'fields': 'id,name'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [{'id': self.issue.pk, 'name': 'Issue'}])
+        # .only() : la description n'est pas lue
+        issue_queries = [query['sql'] for query in queries.captured_queries if 'softdesk_issue' in query['sql']]
+        self.assertTrue(issue_queries)
+        self.assertFalse([sql for sql in issue_queries if '"description"' in sql])
+
+    def test_expand(self):
+        response = self.client.get(f'{self.url}{self.issue.pk}/', {'fields': 'id', 'expand': 'author,assigned_to'})
+        self.assertEqual(response.data, {
+            'id': self.issue.pk,
+            'author': {'id': self.user.pk, 'username': 'alice'},
+            'assigned_to': {'id': self.bob.pk, 'username': 'bob'},
+        })
+        full = self.client.get(f'{self.url}{self.issue.pk}/').data
+        self.assertEqual(full['author'], self.user.pk)
+        self.assertIn('description', full)
+
+    def test_unknown_names_are_rejected(self):
+        response = self.client.get(self.url, {'fields': 'id,secret', 'expand': 'comments'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {'fields', 'expand'})
+
+    def test_writes_ignore_parameters(self):
+        response = self.client.patch(f'{self.url}{self.issue.pk}/?fields=id', {'name': 'Renommée'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['name'], 'Renommée')
+        self.assertIn('description', response.data)
+
+
+@skipUnless(renderers.orjson, "orjson n'est pas installé")
+class RendererTests(TestCase):
+    """``FastJSONRenderer`` / ``FastJSONParser`` : mêmes octets et mêmes erreurs que DRF."""
+
+    payload = {
+        'date': datetime.datetime(2024, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.timezone.utc),
+        'jour': datetime.date(2024, 1, 2),
+        'montant': decimal.Decimal('12.50'),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'texte': gettext_lazy('Texte'),
+        'unicode': 'éà — 中文 \u2028 \u2029',
+        'liste': [1, 2.5, None, True, {'imbriqué': []}],
+        1: 'clé entière',
+    }
+
+    def test_same_bytes_as_drf(self):
+        self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_indent_falls_back_to_drf(self):
+        media_type = 'application/json; indent=4'
+        self.assertEqual(FastJSONRenderer().render(self.payload, media_type),
+                         JSONRenderer().render(self.payload, media_type))
+
+    def test_api_pages(self):
+        user = make_user('alice')
+        project = make_project(user)
+        issue = Issue.objects.create(name='Issue « 1 »', description='-', project=project, author=user)
+        Comment.objects.create(description='Commentaire', issue=issue, author=user)
+        for serializer_class, queryset in ((IssueSerializer, Issue.objects.all()),
+                                           (CommentSerializer, Comment.objects.all())):
+            data = serializer_class(queryset, many=True).data
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_parser(self):
+        raw = JSONRenderer().render({'liste': [1, 'é', None], 'nombre': 1.5})
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(raw)), JSONParser().parse(io.BytesIO(raw)))
+        for invalid in (b'{"a": NaN}', b'{"a": '):
+            with self.subTest(invalid=invalid), self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(invalid))
+
+
+class ExportTests(APITests):
+    """Export en flux : issues puis commentaires, en NDJSON ou en CSV."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+        cls.outsider = make_user('carol')
+        cls.project = make_project(cls.user)
+        cls.first = Issue.objects.create(name='Première', description='Ligne 1\nLigne 2, « citée »',
+                                         project=cls.project, author=cls.user)
+        cls.second = Issue.objects.create(name='Seconde', description='-', project=cls.project,
+                                          author=cls.user, assigned_to=cls.user)
+        cls.comment = Comment.objects.create(description='Commentaire', issue=cls.first, author=cls.user)
+        other = make_project(cls.user, 'Autre projet')
+        Issue.objects.create(name='Ailleurs', description='-', project=other, author=cls.user)
+        cls.url = f'/api/projects/{cls.project.pk}/export/'
+
+    def export(self, export_format):
+        response = self.client.get(self.url, {'format': export_format})
+        self.assertEqual(response.status_code, 200)
+        return response, list(response.streaming_content)
+
+    def test_ndjson(self):
+        response, chunks = self.export('ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(response['Content-Disposition'], f'attachment; filename="project-{self.project.pk}.ndjson"')
+        # Premier morceau envoyé dès la première ligne
+        self.assertEqual(chunks[0].count(b'\n'), 1)
+        rows = [json.loads(line) for line in b''.join(chunks).splitlines()]
+        self.assertEqual([(row['type'], row['id']) for row in rows], [
+            ('issue', self.first.pk), ('issue', self.second.pk), ('comment', self.comment.pk),
+        ])
+        issue = IssueSerializer(self.first).data
+        self.assertEqual(rows[0]['description'], issue['description'])
+        self.assertEqual(rows[0]['created_time'], issue['created_time'])
+        self.assertEqual((rows[0]['author'], rows[0]['assigned_to']), ('alice', None))
+        self.assertEqual(rows[1]['assigned_to'], 'alice')
+        self.assertEqual((rows[2]['issue'], rows[2]['uuid']), (self.first.pk, str(self.comment.uuid)))
+
+    def test_csv(self):
+        response, chunks = self.export('csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.DictReader(io.StringIO(b''.join(chunks).decode('utf-8'))))
+        self.assertEqual(list(rows[0]), CSV_COLUMNS)
+        self.assertEqual([(row['type'], row['id']) for row in rows], [
+            ('issue', str(self.first.pk)), ('issue', str(self.second.pk)), ('comment', str(self.comment.pk)),
+        ])
+        self.assertEqual(rows[0]['description'], self.first.description)
+        # Colonnes propres aux issues laissées vides pour un commentaire
+        self.assertEqual((rows[2]['name'], rows[2]['issue']), ('', str(self.first.pk)))
+
+    def test_async_chunks(self):
+        for export_format in ('ndjson', 'csv'):
+            with self.subTest(export_format=export_format):
+                export = ProjectExport(self.project, export_format)
+
+                async def collect():
+                    return [chunk async for chunk in export.aiter_chunks()]
+
+                self.assertEqual(async_to_sync(collect)(), list(export.iter_chunks()))
+
+    def test_outsider(self):
+        self.client.force_authenticate(self.outsider)
+        self.assertEqual(self.client.get(self.url, {'format': 'csv'}).status_code, 404)
+
+
+class SearchTests(APITests):
+    """Recherche plein texte : classement, périmètre, pagination et index tenu par les triggers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+        cls.outsider = make_user('carol')
+        cls.project = make_project(cls.user)
+        cls.in_name = Issue.objects.create(name='Connexion impossible', description='Depuis hier.',
+                                           project=cls.project, author=cls.user)
+        cls.in_description = Issue.objects.create(
+            name='Écran blanc', description="Après la connexion, l'écran reste blanc.",
+            project=cls.project, author=cls.user)
+        cls.comment = Comment.objects.create(description='Même souci de connexion au café.',
+                                             issue=cls.in_description, author=cls.user)
+        cls.other = make_project(cls.outsider, 'Autre projet')
+        Issue.objects.create(name='Connexion lente', description='-', project=cls.other, author=cls.outsider)
+
+    def search(self, **params):
+        response = self.client.get('/api/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_name_ranks_first(self):
+        results = self.search(q='connexion')['results']
+        # Nom pesant NAME_WEIGHT fois la description : l'issue nommée d'abord
+        self.assertEqual((results[0]['type'], results[0]['id']), ('issue', self.in_name.pk))
+        self.assertEqual(results[0]['snippet'], '<mark>Connexion</mark> impossible')
+        self.assertGreater(results[0]['score'], max(result['score'] for result in results[1:]))
+        self.assertEqual({(result['type'], result['id']) for result in results[1:]},
+                         {('issue', self.in_description.pk), ('comment', self.comment.pk)})
+        comment, = (result for result in results if result['type'] == 'comment')
+        self.assertEqual((comment['issue'], comment['issue_name']), (self.in_description.pk, 'Écran blanc'))
+
+    def test_prefix_and_accents(self):
+        results = self.search(q='ECRAN bla')['results']
+        self.assertEqual([result['id'] for result in results], [self.in_description.pk])
+        self.assertEqual(results[0]['snippet'].count('<mark>'), 2)
+        self.assertEqual([result['id'] for result in self.search(q='cafe')['results']], [self.comment.pk])
+
+    def test_scope(self):
+        self.assertEqual(len(self.search(q='connexion', type='comment')['results']), 1)
+        self.assertEqual(self.search(q='connexion', project=self.other.pk)['results'], [])
+        self.client.force_authenticate(self.outsider)
+        self.assertEqual([result['project'] for result in self.search(q='connexion')['results']],
+                         [self.other.pk])
+
+    def test_cursor(self):
+        seen, params = [], {'q': 'connexion', 'page_size': 1}
+        while True:
+            data = self.search(**params)
+            seen += [(result['type'], result['id']) for result in data['results']]
+            if data['next'] is None:
+                break
+            params['cursor'] = re.search(r'cursor=([^&]+)', data['next']).group(1)
+        self.assertEqual(seen, [(result['type'], result['id']) for result in self.search(q='connexion')['results']])
+        self.assertEqual(self.client.get('/api/search/', {'q': 'connexion', 'cursor': '!'}).status_code, 404)
+
+    def test_index_follows_writes(self):
+        self.in_name.name = 'Déconnexion'
+        self.in_name.save()
+        Comment.objects.filter(pk=self.comment.pk).delete()
+        self.assertEqual([result['id'] for result in self.search(q='connexion')['results']],
+                         [self.in_description.pk])
+        self.assertEqual([result['id'] for result in self.search(q='deconnexion')['results']], [self.in_name.pk])
+
+    def test_invalid_queries(self):
+        for params in ({}, {'q': ' ; '}, {'q': 'connexion', 'type': 'projet'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/search/', params).status_code, 400)
+
+    def test_unavailable_without_sqlite(self):
+        with mock.patch.object(connection, 'vendor', 'postgresql'):
+            response = self.client.get('/api/search/', {'q': 'connexion'})
+        self.assertEqual(response.status_code, 501)
+
+
+class BoardStatsTests(APITests):
+    """Statistiques du tableau : un seul GROUP BY, en cache jusqu'à la prochaine écriture."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+        cls.bob = make_user('bob')
+        cls.project = make_project(cls.user, contributors=[cls.bob])
+        for status, priority, tag, assigned_to in (
+            ('To Do', 'HIGH', 'BUG', cls.bob),
+            ('To Do', 'LOW', 'BUG', cls.bob),
+            ('In Progress', 'HIGH', 'FEATURE', cls.user),
+            ('Finished', 'MEDIUM', 'TASK', None),
+        ):
+            Issue.objects.create(name='Issue', description='-', project=cls.project, author=cls.user,
+                                 status=status, priority=priority, tag=tag, assigned_to=assigned_to)
+        Issue.objects.create(name='Ailleurs', description='-', project=make_project(cls.user, 'Autre'),
+                             author=cls.user, assigned_to=cls.bob)
+        cls.url = f'/api/projects/{cls.project.pk}/board-stats/'
+
+    def get_stats(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        grouped = [query for query in queries.captured_queries if 'GROUP BY' in query['sql']]
+        return response.json(), len(grouped)
+
+    def test_counts(self):
+        stats, grouped = self.get_stats()
+        self.assertEqual(grouped, 1)
+        self.assertEqual(stats, {
+            'project': self.project.pk,
+            'total': 4,
+            'status': {'To Do': 2, 'In Progress': 1, 'Finished': 1},
+            'priority': {'LOW': 1, 'MEDIUM': 1, 'HIGH': 2},
+            'tag': {'BUG': 2, 'FEATURE': 1, 'TASK': 1},
+            'assignees': [
+                {'id': self.bob.pk, 'username': 'bob', 'count': 2},
+                {'id': self.user.pk, 'username': 'alice', 'count': 1},
+                {'id': None, 'username': None, 'count': 1},
+            ],
+        })
+
+    def test_cached_until_write(self):
+        stats, _ = self.get_stats()
+        self.assertEqual(self.get_stats(), (stats, 0))
+        issue = Issue.objects.filter(project=self.project, status='To Do').first()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f'/api/projects/{self.project.pk}/issues/{issue.pk}/',
+                                         {'status': 'Finished'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        stats, grouped = self.get_stats()
+        self.assertEqual(grouped, 1)
+        self.assertEqual(stats['status'], {'To Do': 1, 'In Progress': 1, 'Finished': 2})
+
+    def test_outsider(self):
+        self.client.force_authenticate(make_user('carol'))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class RefreshBlacklistTests(TestCase):
+    """Rotation des refresh tokens : un token déjà échangé est refusé (401)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+
+    def setUp(self):
+        # Filtre vide propre au test, sans thread de purge
+        for name, value in (('_bloom', BloomFilter(1000, 0.001)), ('_start', lambda: None)):
+            patcher = mock.patch.object(refresh_blacklist, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def refresh(self, token):
+        return APIClient().post('/api/token/refresh/', {'refresh': str(token)}, format='json')
+
+    def test_replay_is_refused(self):
+        token = RefreshToken.for_user(self.user)
+        # Échange d'un token neuf : le seul INSERT de la rotation
+        with self.assertNumQueries(1):
+            response = self.refresh(token)
+        self.assertEqual(response.status_code, 200)
+        rotated = response.data['refresh']
+        self.assertNotEqual(rotated, str(token))
+        with self.assertNumQueries(1):
+            self.assertEqual(self.refresh(token).status_code, 401)
+        self.assertEqual(self.refresh(rotated).status_code, 200)
+        self.assertEqual(self.refresh(rotated).status_code, 401)
+
+    def test_exchanged_by_another_process(self):
+        # Absent du filtre de ce processus, mais déjà en base : l'INSERT fait foi
+        token = RefreshToken.for_user(self.user)
+        BlacklistedRefreshToken.objects.create(jti=token['jti'], expires_at=token.current_time)
+        self.assertEqual(self.refresh(token).status_code, 401)
+        self.assertEqual(BlacklistedRefreshToken.objects.count(), 1)
+
+    def test_purge(self):
+        expired, valid = RefreshToken.for_user(self.user), RefreshToken.for_user(self.user)
+        for token in (expired, valid):
+            self.assertEqual(self.refresh(token).status_code, 200)
+        BlacklistedRefreshToken.objects.filter(pk=expired['jti']).update(expires_at=expired.current_time)
+        self.assertEqual(refresh_blacklist.purge(), 1)
+        self.assertEqual(list(BlacklistedRefreshToken.objects.values_list('jti', flat=True)), [valid['jti']])
+        self.assertNotIn(expired['jti'], refresh_blacklist._bloom)
+        self.assertEqual(self.refresh(valid).status_code, 401)
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(1000, 0.01)
+        keys = [uuid.uuid4().hex for _ in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class ThrottlingTests(TestCase):
+    """Fenêtres glissantes (429 et ``Retry-After``) et délestage (503)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+        cls.bob = make_user('bob')
+        cls.project = make_project(cls.user, contributors=[cls.bob])
+        cls.url = f'/api/projects/{cls.project.pk}/issues/'
+
+    def setUp(self):
+        clear_caches()
+        throttling.local_store.clear()
+        self.addCleanup(throttling.local_store.clear)
+        # Début d'une fenêtre d'une minute : attentes exactes
+        self.now = 1000 * 60
+        patcher = mock.patch('softdesk.throttling.time')
+        patcher.start().time.side_effect = lambda: self.now
+        self.addCleanup(patcher.stop)
+
+    def rates(self, **rates):
+        return mock.patch.dict(throttling.api_settings.DEFAULT_THROTTLE_RATES, rates)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_sliding_window(self):
+        self.assertEqual(throttling.sliding_window(0, 2, 3, 60, 0), (True, None))
+        self.assertEqual(throttling.sliding_window(0, 3, 3, 60, 0), (False, 60))
+        # Fenêtre précédente pleine, à moitié couverte : 1,5 requête comptée
+        self.assertEqual(throttling.sliding_window(3, 1, 3, 60, 30), (True, None))
+        allowed, wait = throttling.sliding_window(3, 2, 3, 60, 30)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 10)
+
+    def test_user_rate(self):
+        client = self.client_for(self.user)
+        with self.rates(user='3/min'):
+            for _ in range(3):
+                self.assertEqual(client.get(self.url).status_code, 200)
+            response = client.get(self.url)
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response['Retry-After'], '60')
+            # Autre utilisateur : son propre compteur
+            self.assertEqual(self.client_for(self.bob).get(self.url).status_code, 200)
+            # Fenêtre suivante, à moitié : 3 x 0,5 de la précédente encore comptées
+            self.now += 60 + 30
+            self.assertEqual(client.get(self.url).status_code, 200)
+            self.assertEqual(client.get(self.url).status_code, 200)
+            self.assertEqual(client.get(self.url).status_code, 429)
+
+    def test_project_rate_is_shared(self):
+        with self.rates(project='2/min'):
+            self.assertEqual(self.client_for(self.user).get(self.url).status_code, 200)
+            self.assertEqual(self.client_for(self.bob).get(self.url).status_code, 200)
+            self.assertEqual(self.client_for(self.user).get(self.url).status_code, 429)
+            # Hors de ce projet : non limité par ce compteur
+            self.assertEqual(self.client_for(self.user).get('/api/projects/').status_code, 200)
+
+    def test_endpoint_scope(self):
+        client = self.client_for(self.user)
+        with self.rates(search='1/min'):
+            self.assertEqual(client.get('/api/search/', {'q': 'issue'}).status_code, 200)
+            self.assertEqual(client.get('/api/search/', {'q': 'issue'}).status_code, 429)
+            self.assertEqual(client.get(self.url).status_code, 200)
+
+    def test_disabled(self):
+        client = self.client_for(self.user)
+        with self.rates(user='1/min'), mock.patch.dict(throttling.conf, ENABLED=False):
+            for _ in range(3):
+                self.assertEqual(client.get(self.url).status_code, 200)
+
+    def test_local_store_is_bounded(self):
+        store = throttling.LocalWindowStore(2)
+        for key in ('a', 'b', 'a', 'c'):
+            store.hit(key, 10, 60, self.now)
+        self.assertEqual(list(store._data), ['a', 'c'])
+
+    def test_load_shedding(self):
+        client = self.client_for(self.user)
+        self.assertEqual(client.get(self.url).status_code, 200)
+        self.assertEqual(throttling.in_flight.value, 0)
+        with mock.patch.dict(throttling.conf, MAX_IN_FLIGHT=0), self.assertNumQueries(0):
+            response = client.get(self.url)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], str(throttling.conf['RETRY_AFTER']))
+        self.assertEqual(throttling.in_flight.value, 0)
+
+
+class SQLiteProfileTests(SimpleTestCase):
+    """Profil SQLite : PRAGMA appliqués à chaque nouvelle connexion, BEGIN IMMEDIATE."""
+
+    def connect(self, **options):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_dict = {**connection.settings_dict, 'NAME': os.path.join(directory.name, 'test.sqlite3'),
+                         'OPTIONS': {'transaction_mode': 'IMMEDIATE', **options}}
+        wrapper = SQLiteWrapper(settings_dict, alias='pragmas')
+        self.addCleanup(wrapper.close)
+        wrapper.ensure_connection()
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        return wrapper.connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+    def test_pragmas(self):
+        wrapper = self.connect()
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(wrapper, 'synchronous'), 1)
+        self.assertEqual(self.pragma(wrapper, 'busy_timeout'), 15000)
+        self.assertEqual(self.pragma(wrapper, 'cache_size'), -16 * 1024)
+
+    @override_settings(SOFTDESK_SQLITE_PRAGMAS={'journal_mode': None, 'cache_size': -1024})
+    def test_overrides(self):
+        wrapper = self.connect()
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'delete')
+        self.assertEqual(self.pragma(wrapper, 'cache_size'), -1024)
+
+    def test_transaction_mode(self):
+        wrapper = self.connect()
+        with CaptureQueriesContext(wrapper) as queries:
+            wrapper._start_transaction_under_autocommit()
+        self.assertEqual([query['sql'] for query in queries.captured_queries], ['BEGIN IMMEDIATE'])
+        self.assertTrue(wrapper.connection.in_transaction)
+        wrapper.connection.rollback()
+        with self.assertRaises(ImproperlyConfigured):
+            self.connect(transaction_mode='LAZY')
+
+
+class MembershipScopeTests(APITests):
+    """Listes restreintes aux projets de l'utilisateur par semi-jointure, sans DISTINCT."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('alice')
+        cls.bob = make_user('bob')
+        cls.project = make_project(cls.user, contributors=[cls.bob])
+        cls.issue = Issue.objects.create(name='Issue', description='-', project=cls.project,
+                                         author=cls.bob, assigned_to=cls.user)
+        Comment.objects.create(description='Commentaire', issue=cls.issue, author=cls.user)
+        hidden = make_project(cls.bob, 'Projet de bob')
+        Issue.objects.create(name='Cachée', description='-', project=hidden, author=cls.bob)
+        project = f'/api/projects/{cls.project.pk}/'
+        cls.urls = ['/api/projects/', f'{project}issues/', f'{project}issues/{cls.issue.pk}/comments/']
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.dict(response_cache.conf, ENABLED=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_each_row_once(self):
+        # Auteur, contributeur et assignée à la fois : une seule ligne par objet
+        for url in self.urls:
+            with self.subTest(url=url):
+                clear_caches()
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+                self.assertEqual(response.data['count'], 1)
+                self.assertFalse([query['sql'] for query in queries.captured_queries
+                                  if 'DISTINCT' in query['sql']])
+
+    def test_outsider(self):
+        self.client.force_authenticate(make_user('carol'))
+        self.assertEqual(self.client.get('/api/projects/').data['count'], 0)
+        for url in self.urls[1:]:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['results'], [])
@@ -0,0 +1,279 @@
+"""
+Limitation de débit par fenêtre glissante et délestage (Green Code)
+
+Trois throttles DRF (``DEFAULT_THROTTLE_CLASSES``), débits dans
+``DEFAULT_THROTTLE_RATES`` :
+- ``UserRateThrottle`` : par utilisateur (``user``), par IP sans token (``anon``) ;
+- ``ProjectRateThrottle`` : par projet de l'URL, tous utilisateurs confondus
+  (``project``) ;
+- ``EndpointRateThrottle`` : par utilisateur et par classe de vue (portée
+  ``throttle_scope`` de la vue, ``endpoint`` par défaut).
+Au-delà, DRF répond 429 avec ``Retry-After``.
+
+Fenêtre glissante approchée : pour chaque clé, le nombre de requêtes de la
+fenêtre en cours et celui de la précédente, pondéré par la part de celle-ci
+encore couverte. Trois entiers par clé au lieu d'un horodatage par requête
+(``SimpleRateThrottle`` de DRF), et pas d'effet de bord entre deux fenêtres.
+
+Les compteurs sont gardés dans le processus (``MAXSIZE`` clés, éviction des
+plus anciennes). Avec ``SHARED_CACHE`` (alias d'un cache partagé : Redis,
+Memcached), ils sont aussi comptés dans ce cache, pour tous les processus :
+le compteur local, qui ne voit qu'une partie des requêtes, refuse d'abord
+sans aller au cache.
+
+``LoadSheddingMiddleware``, en tête de ``MIDDLEWARE``, compte les requêtes
+en cours dans le processus : au-delà de ``MAX_IN_FLIGHT``, il répond 503
+(``Retry-After``) avant toute authentification ou requête SQL.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+DEFAULTS = {
+    'ENABLED': True,
+    'MAXSIZE': 100000,       # Clés gardées en mémoire (3 entiers chacune)
+    'SHARED_CACHE': None,    # Alias de CACHES partagé entre processus (None : local seulement)
+    'KEY_PREFIX': 'softdesk:throttle',
+    'MAX_IN_FLIGHT': 64,     # Requêtes en cours par processus au-delà desquelles on répond 503
+    'RETRY_AFTER': 1,        # Secondes annoncées par le délestage
+}
+
+conf = {**DEFAULTS, **getattr(settings, 'SOFTDESK_THROTTLING', {})}
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """``'100/min'`` -> (100, 60), comme ``SimpleRateThrottle.parse_rate``."""
+    num, period = rate.split('/')
+    return int(num), DURATIONS[period[0]]
+
+
+def sliding_window(previous, current, limit, duration, now):
+    """Retourne (autorisé, attente en secondes) pour les compteurs de deux fenêtres."""
+    elapsed = (now % duration) / duration
+    if previous * (1 - elapsed) + current < limit:
+        return True, None
+    if current >= limit:
+        # Attendre la fenêtre suivante, puis que la fenêtre actuelle y pèse assez peu
+        return False, duration * (1 - elapsed) + duration * (1 - limit / current)
+    return False, duration * (1 - (limit - current) / previous - elapsed)
+
+
+class LocalWindowStore:
+    """Compteurs ``[fenêtre, en cours, précédente]`` par clé, bornés (éviction LRU)."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, duration, now):
+        window = int(now // duration)
+        with self._lock:
+            counts = self._data.get(key)
+            if counts is None:
+                counts = self._data[key] = [window, 0, 0]
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+            else:
+                self._data.move_to_end(key)
+            if counts[0] != window:
+                counts[2] = counts[1] if counts[0] == window - 1 else 0
+                counts[0], counts[1] = window, 0
+            allowed, wait = sliding_window(counts[2], counts[1], limit, duration, now)
+            if allowed:
+                counts[1] += 1
+            return allowed, wait
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SharedWindowStore:
+    """Mêmes compteurs dans un cache Django partagé : une entrée par clé et par fenêtre."""
+
+    def __init__(self, alias, prefix):
+        self.alias = alias
+        self.prefix = prefix
+
+    def _keys(self, key, duration, now):
+        window = int(now // duration)
+        return f'{self.prefix}:{key}:{window - 1}', f'{self.prefix}:{key}:{window}'
+
+    def hit(self, key, limit, duration, now):
+        cache = caches[self.alias]
+        previous_key, current_key = self._keys(key, duration, now)
+        counts = cache.get_many([previous_key, current_key])
+        allowed, wait = sliding_window(
+            counts.get(previous_key, 0), counts.get(current_key, 0), limit, duration, now
+        )
+        if allowed and not cache.add(current_key, 1, 2 * duration):
+            cache.incr(current_key)
+        return allowed, wait
+
+    async def ahit(self, key, limit, duration, now):
+        cache = caches[self.alias]
+        previous_key, current_key = self._keys(key, duration, now)
+        counts = await cache.aget_many([previous_key, current_key])
+        allowed, wait = sliding_window(
+            counts.get(previous_key, 0), counts.get(current_key, 0), limit, duration, now
+        )
+        if allowed and not await cache.aadd(current_key, 1, 2 * duration):
+            await cache.aincr(current_key)
+        return allowed, wait
+
+
+local_store = LocalWindowStore(conf['MAXSIZE'])
+shared_store = SharedWindowStore(conf['SHARED_CACHE'], conf['KEY_PREFIX']) if conf['SHARED_CACHE'] else None
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Base des throttles : ``get_scope_and_ident`` donne la portée (débit dans
+    ``DEFAULT_THROTTLE_RATES``) et l'identifiant compté, ou None pour ne pas limiter.
+    """
+    scope = None
+
+    def __init__(self):
+        self._wait = None
+
+    def get_scope_and_ident(self, request, view):
+        """Par défaut : portée ``scope`` de la classe, comptée par utilisateur (ou IP)."""
+        if self.scope is None:
+            return None
+        return self.scope, self.user_ident(request)
+
+    def prepare(self, request, view):
+        """Retourne (clé, limite, durée) ou None."""
+        if not conf['ENABLED']:
+            return None
+        scope_and_ident = self.get_scope_and_ident(request, view)
+        if scope_and_ident is None:
+            return None
+        scope, ident = scope_and_ident
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        if rate is None:
+            return None
+        limit, duration = parse_rate(rate)
+        return f'{scope}:{ident}', limit, duration
+
+    def allow_request(self, request, view):
+        prepared = self.prepare(request, view)
+        if prepared is None:
+            return True
+        now = time.time()
+        allowed, self._wait = local_store.hit(*prepared, now)
+        if allowed and shared_store is not None:
+            allowed, self._wait = shared_store.hit(*prepared, now)
+        return allowed
+
+    async def aallow_request(self, request, view):
+        """Variante async (vues de ``async_views.py``) : cache partagé sans bloquer la boucle."""
+        prepared = self.prepare(request, view)
+        if prepared is None:
+            return True
+        now = time.time()
+        allowed, self._wait = local_store.hit(*prepared, now)
+        if allowed and shared_store is not None:
+            allowed, self._wait = await shared_store.ahit(*prepared, now)
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+    def user_ident(self, request):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return self.get_ident(request)
+
+
+class UserRateThrottle(SlidingWindowThrottle):
+    """Par utilisateur authentifié (``user``), sinon par adresse IP (``anon``)."""
+
+    def get_scope_and_ident(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return 'user', request.user.pk
+        return 'anon', self.get_ident(request)
+
+
+class ProjectRateThrottle(SlidingWindowThrottle):
+    """Par projet de l'URL (``throttle_project_kwarg`` de la vue), tous utilisateurs confondus."""
+
+    def get_scope_and_ident(self, request, view):
+        project_id = view.kwargs.get(getattr(view, 'throttle_project_kwarg', 'project_pk'))
+        if project_id is None:
+            return None
+        return 'project', project_id
+
+
+class EndpointRateThrottle(SlidingWindowThrottle):
+    """Par utilisateur et par classe de vue (``basename`` du routeur, identique sous ASGI)."""
+
+    def get_scope_and_ident(self, request, view):
+        endpoint = getattr(view, 'basename', None) or type(view).__name__
+        scope = getattr(view, 'throttle_scope', None) or 'endpoint'
+        return scope, f'{endpoint}:{self.user_ident(request)}'
+
+
+class InFlightCounter:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def enter(self, limit):
+        with self._lock:
+            if self.value >= limit:
+                return False
+            self.value += 1
+            return True
+
+    def leave(self):
+        with self._lock:
+            self.value -= 1
+
+
+in_flight = InFlightCounter()
+
+
+class LoadSheddingMiddleware:
+    """Répond 503 tout de suite quand trop de requêtes sont déjà en cours dans le processus."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not in_flight.enter(conf['MAX_IN_FLIGHT']):
+            return self.shed()
+        try:
+            return self.get_response(request)
+        finally:
+            in_flight.leave()
+
+    async def __acall__(self, request):
+        if not in_flight.enter(conf['MAX_IN_FLIGHT']):
+            return self.shed()
+        try:
+            return await self.get_response(request)
+        finally:
+            in_flight.leave()
+
+    def shed(self):
+        return JsonResponse(
+            {'detail': "Serveur surchargé, réessayez dans un instant."},
+            status=503, headers={'Retry-After': str(conf['RETRY_AFTER'])},
+        )
@@ -19,30 +19,41 @@ from rest_framework_nested import routers
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from .views import (
     UserViewSet, ProjectViewSet, ContributorViewSet,
-    IssueViewSet, CommentViewSet
+    IssueViewSet, CommentViewSet, SearchView
 )
 
-# Router principal
-router = routers.DefaultRouter()
-router.register(r'users', UserViewSet, basename='user')
-router.register(r'projects', ProjectViewSet, basename='project')
-
-# Router imbriqué pour les contributeurs
-projects_router = routers.NestedDefaultRouter(router, r'projects', lookup='project')
-projects_router.register(r'contributors', ContributorViewSet, basename='project-contributors')
-projects_router.register(r'issues', IssueViewSet, basename='project-issues')
-
-# Router imbriqué pour les commentaires
-issues_router = routers.NestedDefaultRouter(projects_router, r'issues', lookup='issue')
-issues_router.register(r'comments', CommentViewSet, basename='issue-comments')
-
-urlpatterns = [
-    # Authentification JWT
-    path('login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-    
-    # Routes de l'API
-    path('', include(router.urls)),
-    path('', include(projects_router.urls)),
-    path('', include(issues_router.urls)),
-]
+
+def build_urlpatterns(project_viewset=ProjectViewSet, contributor_viewset=ContributorViewSet,
+                      issue_viewset=IssueViewSet, comment_viewset=CommentViewSet,
+                      user_viewset=UserViewSet, login_view=TokenObtainPairView):
+    """Routes de l'API pour un jeu de ViewSets (synchrones ici, async dans urls_async.py)"""
+    # Router principal
+    router = routers.DefaultRouter()
+    router.register(r'users', user_viewset, basename='user')
+    router.register(r'projects', project_viewset, basename='project')
+
+    # Router imbriqué pour les contributeurs
+    projects_router = routers.NestedDefaultRouter(router, r'projects', lookup='project')
+    projects_router.register(r'contributors', contributor_viewset, basename='project-contributors')
+    projects_router.register(r'issues', issue_viewset, basename='project-issues')
+
+    # Router imbriqué pour les commentaires
+    issues_router = routers.NestedDefaultRouter(projects_router, r'issues', lookup='issue')
+    issues_router.register(r'comments', comment_viewset, basename='issue-comments')
+
+    return [
+        # Authentification JWT
+        path('login/', login_view.as_view(), name='token_obtain_pair'),
+        path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+
+        # Recherche plein texte
+        path('search/', SearchView.as_view(), name='search'),
+
+        # Routes de l'API
+        path('', include(router.urls)),
+        path('', include(projects_router.urls)),
+        path('', include(issues_router.urls)),
+    ]
+
+
+urlpatterns = build_urlpatterns()
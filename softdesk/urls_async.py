@@ -0,0 +1,18 @@
+"""
+Routes de l'API servies sous ASGI : lectures natives async, connexion et
+inscription hors du thread partagé (voir async_views.py)
+"""
+from .async_views import (
+    AsyncCommentViewSet, AsyncContributorViewSet, AsyncIssueViewSet,
+    AsyncLoginView, AsyncProjectViewSet, AsyncUserViewSet
+)
+from .urls import build_urlpatterns
+
+urlpatterns = build_urlpatterns(
+    user_viewset=AsyncUserViewSet,
+    login_view=AsyncLoginView,
+    project_viewset=AsyncProjectViewSet,
+    contributor_viewset=AsyncContributorViewSet,
+    issue_viewset=AsyncIssueViewSet,
+    comment_viewset=AsyncCommentViewSet,
+)
@@ -0,0 +1,126 @@
+"""
+Version de changement par projet (Green Code)
+
+Chaque projet a un numéro de version stocké dans le cache Django. Il est
+incrémenté (après commit) à chaque modification du projet, de ses
+contributeurs, de ses issues ou de leurs commentaires (voir ``signals.py``
+et les écritures groupées de ``views.py``).
+
+La version est un horodatage en nanosecondes : elle sert à la fois de
+marqueur pour les ETag et de date de dernière modification (y compris pour
+les suppressions, invisibles dans ``updated_time``).
+
+Avec plusieurs processus, le cache ``default`` doit être partagé pour que
+les versions le soient : ``checks.py`` refuse sinon le démarrage.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .replicas import pin_recent
+
+KEY_PREFIX = 'softdesk:project-version'
+ISSUE_PROJECT_PREFIX = 'softdesk:issue-project'
+
+
+def _key(project_id):
+    return f"{KEY_PREFIX}:{project_id}"
+
+
+def get_project_versions(project_ids):
+    """Retourne ``{project_id: version}``, en initialisant les versions absentes."""
+    keys = {_key(project_id): project_id for project_id in project_ids}
+    found = cache.get_many(keys)
+    versions = {keys[key]: value for key, value in found.items()}
+    missing = [key for key in keys if key not in found]
+    if missing:
+        now = time.time_ns()
+        for key in missing:
+            # add() ne remplace pas une version posée entre-temps par un autre worker
+            cache.add(key, now, None)
+            versions[keys[key]] = now
+    # Projet modifié à l'instant : la suite de la requête lit le primaire
+    pin_recent(versions.values())
+    return versions
+
+
+async def aget_project_versions(project_ids):
+    """Variante async de ``get_project_versions``."""
+    keys = {_key(project_id): project_id for project_id in project_ids}
+    found = await cache.aget_many(keys)
+    versions = {keys[key]: value for key, value in found.items()}
+    missing = [key for key in keys if key not in found]
+    if missing:
+        now = time.time_ns()
+        for key in missing:
+            await cache.aadd(key, now, None)
+            versions[keys[key]] = now
+    pin_recent(versions.values())
+    return versions
+
+
+def get_project_version(project_id):
+    return get_project_versions([project_id])[project_id]
+
+
+def bump_project_versions(project_ids):
+    """Fait avancer la version des projets, après le commit de la transaction."""
+    project_ids = {project_id for project_id in project_ids if project_id is not None}
+    if not project_ids:
+        return
+
+    def bump():
+        now = time.time_ns()
+        cache.set_many({_key(project_id): now for project_id in project_ids}, None)
+
+    transaction.on_commit(bump)
+
+
+def version_timestamp(version):
+    """Convertit une version en timestamp (secondes)."""
+    return version / 1e9
+
+
+def get_issue_project_id(issue_id):
+    """
+    Projet d'une issue, mis en cache pour les routes imbriquées des
+    commentaires (invalidé par les signaux de ``Issue``). None si inconnue.
+    """
+    try:
+        issue_id = int(issue_id)
+    except (TypeError, ValueError):
+        return None
+    key = f"{ISSUE_PROJECT_PREFIX}:{issue_id}"
+    project_id = cache.get(key)
+    if project_id is None:
+        # Import local pour éviter un import circulaire models <-> signals
+        from .models import Issue
+
+        project_id = Issue.objects.filter(pk=issue_id).values_list('project_id', flat=True).first()
+        if project_id is not None:
+            cache.set(key, project_id, None)
+    return project_id
+
+
+async def aget_issue_project_id(issue_id):
+    """Variante async de ``get_issue_project_id``."""
+    try:
+        issue_id = int(issue_id)
+    except (TypeError, ValueError):
+        return None
+    key = f"{ISSUE_PROJECT_PREFIX}:{issue_id}"
+    project_id = await cache.aget(key)
+    if project_id is None:
+        from .models import Issue
+
+        project_id = await Issue.objects.filter(pk=issue_id).values_list(
+            'project_id', flat=True
+        ).afirst()
+        if project_id is not None:
+            await cache.aset(key, project_id, None)
+    return project_id
+
+
+def forget_issue_project(issue_id):
+    cache.delete(f"{ISSUE_PROJECT_PREFIX}:{issue_id}")
@@ -2,27 +2,249 @@ from rest_framework import viewsets, status, generics
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.utils.urls import replace_query_param
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from .models import User, Project, Contributor, Issue, Comment
 from .serializers import (
     UserSerializer, UserDetailSerializer, ProjectSerializer,
-    ContributorSerializer, IssueSerializer, CommentSerializer
+    ContributorSerializer, IssueSerializer, CommentSerializer,
+    IssueBulkCreateSerializer, IssueBulkUpdateSerializer,
+    CommentBulkCreateSerializer, CommentBulkUpdateSerializer, SearchResultSerializer
 )
+from .conditional import ConditionalGetMixin
+from .membership import membership_cache
+from .response_cache import CachedResponseMixin
+from .pagination import HybridPagination, StandardResultsSetPagination
+from .board import get_board_stats
+from .counters import adjust_issue, adjust_project, count_contributors
+from .export import ProjectExport
+from .filters import ChoiceFilter, IndexedFilterBackend, RelatedFilter, parse_id
+from .search import KINDS, decode_cursor, encode_cursor, search
+from .renderers import CSVRenderer, NDJSONRenderer
+from .versioning import bump_project_versions, get_issue_project_id, get_project_versions
 from .permissions import (
     IsAuthorOrReadOnly, IsProjectContributor, 
     IsProjectAuthor, IsAuthorOrProjectAuthor
 )
 
 
-class StandardResultsSetPagination(PageNumberPagination):
-    """Pagination standard pour toutes les listes (Green Code)"""
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+def contributed_project_ids(user):
+    """
+    Sous-requête des projets de l'utilisateur, à utiliser en semi-jointure
+    (``project_id__in``) : pas de jointure multipliant les lignes, donc pas de DISTINCT.
+    """
+    return Contributor.objects.filter(user=user).values('project_id')
+
+
+# Tris des listes : sur la clé du curseur, dans un sens ou dans l'autre
+CREATED_ORDERINGS = {
+    '-created_time': ('-created_time', '-id'),
+    'created_time': ('created_time', 'id'),
+}
+
+
+class ScopedQuerysetMixin:
+    """
+    Portée des querysets, commune aux vues synchrones et async
+    (``async_views.py``). Seules les E/S ont deux variantes : le projet de la
+    route (``get_scope_project_id``) et l'appartenance de l'utilisateur ; les
+    règles de visibilité sont dans ``scoped_queryset(project_id, is_member)``,
+    sans E/S, appelée par les deux.
+    """
+
+    def get_scope_project_id(self):
+        """Projet de la route imbriquée, None hors route imbriquée."""
+        return self.kwargs.get('project_pk')
+
+    def get_queryset(self):
+        project_id = self.get_scope_project_id()
+        is_member = project_id is not None and membership_cache.is_member(self.request.user, project_id)
+        return self.scoped_queryset(project_id, is_member)
+
+
+def resolve_users(identifiers):
+    """
+    Résout des identifiants d'utilisateurs (id, username ou email) en une
+    seule requête. Retourne ``({identifiant: user_id}, [non trouvés], [invalides])``.
+    Invalide : que des chiffres, mais pas un id (chiffres non ASCII, hors bornes).
+    """
+    keys = {str(identifier).strip() for identifier in identifiers}
+    numeric = {key for key in keys if key.isdigit()}
+    ids = {parse_id(key) for key in numeric} - {None}
+    emails = {key for key in keys if '@' in key}
+    names = keys - emails - numeric
+
+    rows = User.objects.filter(
+        Q(id__in=ids) | Q(username__in=names) | Q(email__in=emails)
+    ).values_list('id', 'username', 'email')
+    by_key = {}
+    for user_id, username, email in rows:
+        # Un id numérique prime sur un username identique
+        by_key[str(user_id)] = user_id
+        by_key.setdefault(username, user_id)
+        if email:
+            by_key.setdefault(email, user_id)
+
+    resolved, not_found, invalid = {}, [], []
+    for identifier in identifiers:
+        key = str(identifier).strip()
+        user_id = by_key.get(key)
+        if user_id is not None:
+            resolved[str(identifier)] = user_id
+        elif key.isdigit() and parse_id(key) is None:
+            invalid.append(identifier)
+        else:
+            not_found.append(identifier)
+    return resolved, not_found, invalid
+
+
+class SparseFieldsViewMixin:
+    """
+    Adapte le queryset des lectures à ``?fields=`` / ``?expand=`` (voir
+    ``SparseFieldsMixin``) : seules les relations demandées sont jointes et
+    seules les colonnes utiles sont chargées (``.only()``).
+    ``sparse_required_sources`` liste ce dont la vue a besoin quels que soient
+    les champs demandés (permissions, curseur, Last-Modified).
+    """
+    sparse_required_sources = ('created_time',)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in ('list', 'retrieve'):
+            return queryset
+        return self.sparse_queryset(queryset, self.get_serializer(), self.sparse_required_sources)
+
+    def sparse_queryset(self, queryset, serializer, required=()):
+        if not getattr(serializer, 'is_sparse', False):
+            return queryset
+        plan = serializer.get_query_plan(required)
+        if plan is None:
+            return queryset
+        related, columns = plan
+        # select_related() sans argument suivrait toutes les clés étrangères
+        queryset = queryset.select_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*columns)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class BulkWriteMixin:
+    """
+    Écritures groupées (``POST``/``PATCH`` sur ``.../bulk/``) : une seule
+    vérification d'appartenance, validation ``many=True``, puis
+    ``bulk_create``/``bulk_update`` dans une transaction. En cas d'erreur,
+    rien n'est écrit et la réponse liste les erreurs par élément (même ordre).
+    """
+    bulk_max_items = 10000
+    bulk_batch_size = 500
+    bulk_create_serializer_class = None
+    bulk_update_serializer_class = None
+    project_url_kwarg = 'project_pk'
+
+    def get_bulk_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"detail": "Une liste non vide d'éléments est attendue."})
+        if len(items) > self.bulk_max_items:
+            raise ValidationError(
+                {"detail": f"Au plus {self.bulk_max_items} éléments par requête."}
+            )
+        return items
+
+    def get_bulk_context(self):
+        """Contexte partagé par tous les éléments (chargé une seule fois)."""
+        return {'request': self.request, 'view': self}
+
+    def build_bulk_instance(self, data):
+        """Instance à créer, avec l'utilisateur comme auteur."""
+        model = self.bulk_create_serializer_class.Meta.model
+        return model(author=self.request.user, **self.get_bulk_instance_fields(), **data)
+
+    def get_bulk_instance_fields(self):
+        """Champs communs aux instances créées : par défaut, le projet de l'URL."""
+        return {'project_id': self.get_bulk_project_id()}
+
+    def get_bulk_project_id(self):
+        """Projet dont la version avance après une écriture groupée (celui de l'URL)."""
+        return int(self.kwargs[self.project_url_kwarg])
+
+    def after_bulk_write(self, created=(), updated=()):
+        """
+        Effets de bord habituellement portés par les signaux, que
+        bulk_create/bulk_update n'émettent pas (versions, compteurs).
+        """
+        bump_project_versions([self.get_bulk_project_id()])
+
+    def get_bulk_targets(self, ids):
+        """Objets du périmètre de la vue, indexés par id (une seule requête)."""
+        return self.get_queryset().in_bulk(ids)
+
+    def get_bulk_response(self, pks, status_code):
+        queryset = self.get_queryset().filter(pk__in=pks).order_by('id')
+        return Response(self.get_serializer(queryset, many=True).data, status=status_code)
+
+    def bulk_create(self, request, *args, **kwargs):
+        items = self.get_bulk_items(request)
+        serializer = self.bulk_create_serializer_class(
+            data=items, many=True, context=self.get_bulk_context()
+        )
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        instances = [self.build_bulk_instance(data) for data in serializer.validated_data]
+        model = self.get_queryset().model
+        with transaction.atomic():
+            created = model.objects.bulk_create(instances, batch_size=self.bulk_batch_size)
+            self.after_bulk_write(created=created)
+        return self.get_bulk_response([obj.pk for obj in created], status.HTTP_201_CREATED)
+
+    def bulk_update(self, request, *args, **kwargs):
+        items = self.get_bulk_items(request)
+        serializer = self.bulk_update_serializer_class(
+            data=items, many=True, context=self.get_bulk_context()
+        )
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        targets = self.get_bulk_targets([data['id'] for data in serializer.validated_data])
+        errors, changed, fields = [], {}, set()
+        for data in serializer.validated_data:
+            obj = targets.get(data['id'])
+            if obj is None:
+                errors.append({"id": ["Objet introuvable dans ce périmètre."]})
+                continue
+            if obj.author_id != request.user.pk:
+                errors.append({"id": ["Seul l'auteur peut modifier cet objet."]})
+                continue
+            errors.append({})
+            for field, value in data.items():
+                if field != 'id':
+                    setattr(obj, field, value)
+                    fields.add(field)
+            changed[obj.pk] = obj
+        if any(errors):
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        if fields:
+            # bulk_update ne met pas à jour les champs auto_now ni n'émet de signal
+            now = timezone.now()
+            for obj in changed.values():
+                obj.updated_time = now
+            fields.add('updated_time')
+            with transaction.atomic():
+                self.get_queryset().model.objects.bulk_update(
+                    changed.values(), sorted(fields), batch_size=self.bulk_batch_size
+                )
+                self.after_bulk_write(updated=list(changed.values()))
+        return self.get_bulk_response(list(changed), status.HTTP_200_OK)
+
+
+class UserViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la gestion des utilisateurs.
     Inscription libre, mais seul l'utilisateur peut voir/modifier son profil.
@@ -58,28 +280,67 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(CachedResponseMixin, ConditionalGetMixin, SparseFieldsViewMixin,
+                     viewsets.ModelViewSet):
     """
     ViewSet pour la gestion des projets.
     Seuls les contributeurs peuvent accéder aux projets.
     """
+    sparse_required_sources = ('created_time', 'updated_time')
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated, IsProjectContributor, IsAuthorOrReadOnly]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = HybridPagination
+    # Projet de l'URL : compté par ProjectRateThrottle (voir throttling.py), versions
+    throttle_project_kwarg = 'pk'
+    project_url_kwarg = 'pk'
 
     def get_queryset(self):
         # Retourner uniquement les projets dont l'utilisateur est contributeur
         return Project.objects.filter(
-            contributors__user=self.request.user
-        ).distinct()
+            pk__in=contributed_project_ids(self.request.user)
+        ).select_related('author')
+
 
     @action(detail=True, methods=['get'], url_path='contributors')
     def list_contributors(self, request, pk=None):
         """Liste les contributeurs d'un projet"""
         project = self.get_object()
-        contributors = project.contributors.all()
-        serializer = ContributorSerializer(contributors, many=True)
-        return Response(serializer.data)
+        serializer = ContributorSerializer(context=self.get_serializer_context())
+        contributors = self.sparse_queryset(
+            project.contributors.select_related('user'), serializer, ('project', 'created_time')
+        )
+        aggregate = contributors.aggregate(total=Count('pk'), last=Max('created_time'))
+        validators = self.get_validators([aggregate['total'], aggregate['last']], [project.pk])
+        return self.conditional_response(
+            request, validators,
+            lambda: Response(ContributorSerializer(
+                contributors, many=True, context=self.get_serializer_context()
+            ).data)
+        )
+
+    @action(detail=True, methods=['get'], url_path='board-stats')
+    def board_stats(self, request, pk=None):
+        """
+        Nombre d'issues par statut, priorité, tag et assigné (voir ``board.py``).
+        Une requête GROUP BY, mise en cache pour la version du projet.
+        """
+        project = self.get_object()
+        versions = get_project_versions([project.pk])
+        return self.conditional_response(
+            request, self.make_validators([], versions),
+            lambda: Response(get_board_stats(project.pk, versions[project.pk]))
+        )
+
+    @action(detail=True, methods=['get'], url_path='export',
+            renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request, pk=None):
+        """
+        Exporte en flux les issues et commentaires du projet.
+        Format choisi par ``?format=ndjson|csv`` ou l'en-tête Accept (NDJSON par défaut).
+        """
+        project = self.get_object()
+        export = ProjectExport(project, request.accepted_renderer.format)
+        return export.response(export.iter_chunks())
 
     @action(detail=True, methods=['post'], url_path='add-contributor', 
             permission_classes=[IsAuthenticated, IsProjectAuthor])
@@ -96,7 +357,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        if Contributor.objects.filter(user=user, project=project).exists():
+        if membership_cache.is_member(user, project.pk):
             return Response(
                 {"detail": "Cet utilisateur est déjà contributeur."},
                 status=status.HTTP_400_BAD_REQUEST
@@ -106,6 +367,58 @@ class ProjectViewSet(viewsets.ModelViewSet):
         serializer = ContributorSerializer(contributor)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=True, methods=['post'], url_path='bulk-contributors',
+            permission_classes=[IsAuthenticated, IsProjectAuthor])
+    def bulk_contributors(self, request, pk=None):
+        """
+        Ajoute et/ou retire des contributeurs en une fois (réservé à l'auteur).
+        Corps : {"add": [...], "remove": [...]} avec des id, usernames ou emails.
+        """
+        project = self.get_object()
+        to_add = request.data.get('add') or []
+        to_remove = request.data.get('remove') or []
+        if not isinstance(to_add, list) or not isinstance(to_remove, list):
+            raise ValidationError({"detail": "'add' et 'remove' doivent être des listes."})
+
+        # Résolution de tous les identifiants en une seule requête
+        resolved, not_found, invalid = resolve_users(to_add + to_remove)
+        add_ids = {resolved[key] for key in map(str, to_add) if key in resolved}
+        remove_ids = {resolved[key] for key in map(str, to_remove) if key in resolved}
+        remove_ids.discard(project.author_id)  # L'auteur reste contributeur
+        add_ids -= remove_ids
+
+        with transaction.atomic():
+            # Verrou sur le projet : deux ajouts groupés simultanés ne lisent pas le même état
+            Project.objects.select_for_update().filter(pk=project.pk).values_list('pk').get()
+            existing = set(
+                Contributor.objects.filter(project=project, user_id__in=add_ids | remove_ids)
+                .values_list('user_id', flat=True)
+            )
+            new_ids = add_ids - existing
+            Contributor.objects.bulk_create(
+                [Contributor(user_id=user_id, project=project) for user_id in new_ids],
+                ignore_conflicts=True,
+            )
+            removed_ids = remove_ids & existing
+            if removed_ids:
+                Contributor.objects.filter(project=project, user_id__in=removed_ids).delete()
+            # bulk_create n'émet pas de signal post_save
+            membership_cache.invalidate_users_on_commit(new_ids)
+            bump_project_versions([project.pk])
+            # Lignes réellement présentes : un ajout concurrent a pu être ignoré (ignore_conflicts)
+            count_contributors(project.pk)
+
+        added = Contributor.objects.filter(
+            project=project, user_id__in=new_ids
+        ).select_related('user').order_by('id')
+        return Response({
+            "added": ContributorSerializer(added, many=True).data,
+            "removed": sorted(removed_ids),
+            "already_contributors": sorted(add_ids & existing),
+            "not_found": not_found,
+            "invalid": invalid,
+        })
+
     @action(detail=True, methods=['delete'], url_path='contributors/(?P<contributor_id>[^/.]+)',
             permission_classes=[IsAuthenticated, IsProjectAuthor])
     def remove_contributor(self, request, pk=None, contributor_id=None):
@@ -123,105 +436,247 @@ class ProjectViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class IssueViewSet(viewsets.ModelViewSet):
+class IssueViewSet(CachedResponseMixin, ConditionalGetMixin, SparseFieldsViewMixin, BulkWriteMixin,
+                   ScopedQuerysetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la gestion des issues.
     Accessible uniquement aux contributeurs du projet.
     """
+    sparse_required_sources = ('project', 'created_time', 'updated_time')
     serializer_class = IssueSerializer
+    bulk_create_serializer_class = IssueBulkCreateSerializer
+    bulk_update_serializer_class = IssueBulkUpdateSerializer
     permission_classes = [IsAuthenticated, IsProjectContributor, IsAuthorOrReadOnly]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = HybridPagination
+    # Filtres ?status= ?priority= ?tag= ?assigned_to= ?author= et ?ordering= (voir filters.py)
+    filter_backends = [IndexedFilterBackend]
+    index_scope = ('project_pk', 'project')
+    index_filters = {
+        'status': ChoiceFilter('status', Issue.STATUS_CHOICES),
+        'priority': ChoiceFilter('priority', Issue.PRIORITY_CHOICES),
+        'tag': ChoiceFilter('tag', Issue.TAG_CHOICES),
+        'assigned_to': RelatedFilter('assigned_to', nullable=True),
+        'author': RelatedFilter('author'),
+    }
+    index_orderings = CREATED_ORDERINGS
 
-    def get_queryset(self):
+    def scoped_queryset(self, project_id, is_member):
         # Filtrer par projet si fourni dans l'URL
-        project_id = self.kwargs.get('project_pk')
-        if project_id:
+        if project_id is not None:
             # Vérifier que l'utilisateur est contributeur
-            if not Contributor.objects.filter(
-                user=self.request.user, 
-                project_id=project_id
-            ).exists():
+            if not is_member:
                 return Issue.objects.none()
-            return Issue.objects.filter(project_id=project_id)
-        
-        # Sinon, retourner toutes les issues des projets contributés
-        return Issue.objects.filter(
-            project__contributors__user=self.request.user
-        ).distinct()
+            queryset = Issue.objects.filter(project_id=project_id)
+        else:
+            # Sinon, retourner toutes les issues des projets contributés
+            queryset = Issue.objects.filter(
+                project_id__in=contributed_project_ids(self.request.user)
+            )
+        return queryset.select_related('author', 'assigned_to', 'project')
 
     def perform_create(self, serializer):
         project_id = self.kwargs.get('project_pk')
         if project_id:
             # Vérifier que l'utilisateur est contributeur
-            if not Contributor.objects.filter(
-                user=self.request.user,
-                project_id=project_id
-            ).exists():
+            if not membership_cache.is_member(self.request.user, project_id):
                 raise PermissionError("Vous devez être contributeur du projet.")
             serializer.save(project_id=project_id)
         else:
             serializer.save()
 
+    def get_bulk_context(self):
+        project_id = self.kwargs.get('project_pk')
+        if not membership_cache.is_member(self.request.user, project_id):
+            raise PermissionDenied("Vous devez être contributeur du projet.")
+        context = super().get_bulk_context()
+        context['member_ids'] = set(
+            Contributor.objects.filter(project_id=project_id).values_list('user_id', flat=True)
+        )
+        return context
+
+    def after_bulk_write(self, created=(), updated=()):
+        super().after_bulk_write(created, updated)
+        opened = sum(issue.is_open for issue in created)
+        for issue in updated:
+            was_open = issue.saved_state()[1] != Issue.CLOSED_STATUS
+            opened += int(issue.is_open) - int(was_open)
+        adjust_project(self.get_bulk_project_id(), issues=len(created), open_issues=opened)
+
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        """Création (POST) ou modification du statut/priorité/assigné (PATCH) groupées"""
+        if request.method == 'POST':
+            return self.bulk_create(request, *args, **kwargs)
+        return self.bulk_update(request, *args, **kwargs)
+
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(CachedResponseMixin, ConditionalGetMixin, SparseFieldsViewMixin, BulkWriteMixin,
+                     ScopedQuerysetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la gestion des commentaires.
     Accessible uniquement aux contributeurs du projet.
     """
+    sparse_required_sources = ('issue.project', 'created_time', 'updated_time')
     serializer_class = CommentSerializer
+    bulk_create_serializer_class = CommentBulkCreateSerializer
+    bulk_update_serializer_class = CommentBulkUpdateSerializer
     permission_classes = [IsAuthenticated, IsProjectContributor, IsAuthorOrReadOnly]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = HybridPagination
+    # Filtre ?author= et ?ordering= (voir filters.py)
+    filter_backends = [IndexedFilterBackend]
+    index_scope = ('issue_pk', 'issue')
+    index_filters = {
+        'author': RelatedFilter('author'),
+    }
+    index_orderings = CREATED_ORDERINGS
 
-    def get_queryset(self):
-        # Filtrer par issue si fourni dans l'URL
+    def get_scope_project_id(self):
+        # Projet de l'issue de l'URL (mis en cache, voir versioning.py)
         issue_id = self.kwargs.get('issue_pk')
-        if issue_id:
-            issue = get_object_or_404(Issue, id=issue_id)
+        if issue_id is None:
+            return None
+        project_id = self.url_project_id(get_issue_project_id(issue_id))
+        if project_id is None:
+            raise Http404
+        return project_id
+
+    def url_project_id(self, project_id):
+        """``project_id`` (projet de l'issue de l'URL) s'il est celui de l'URL, sinon None."""
+        if project_id is None or str(project_id) != str(self.kwargs.get('project_pk')):
+            return None
+        return project_id
+
+    def get_url_issue(self):
+        """Issue de l'URL, 404 si elle n'appartient pas au projet de l'URL."""
+        return get_object_or_404(Issue, id=self.kwargs.get('issue_pk'), project_id=self.kwargs.get('project_pk'))
+
+    def scoped_queryset(self, project_id, is_member):
+        # Filtrer par issue si fourni dans l'URL
+        if project_id is not None:
             # Vérifier que l'utilisateur est contributeur du projet
-            if not Contributor.objects.filter(
-                user=self.request.user,
-                project=issue.project
-            ).exists():
+            if not is_member:
                 return Comment.objects.none()
-            return Comment.objects.filter(issue_id=issue_id)
-        
-        # Sinon, retourner tous les commentaires des projets contributés
-        return Comment.objects.filter(
-            issue__project__contributors__user=self.request.user
-        ).distinct()
+            queryset = Comment.objects.filter(issue_id=self.kwargs['issue_pk'])
+        else:
+            # Sinon, retourner tous les commentaires des projets contributés
+            queryset = Comment.objects.filter(
+                issue__project_id__in=contributed_project_ids(self.request.user)
+            )
+        return queryset.select_related('author', 'issue')
+
+    def get_version_project_ids(self):
+        issue_id = self.kwargs.get('issue_pk')
+        if issue_id is None:
+            return membership_cache.project_ids(self.request.user)
+        project_id = self.url_project_id(get_issue_project_id(issue_id))
+        return [] if project_id is None else [project_id]
 
     def perform_create(self, serializer):
         issue_id = self.kwargs.get('issue_pk')
         if issue_id:
-            issue = get_object_or_404(Issue, id=issue_id)
+            issue = self.get_url_issue()
             # Vérifier que l'utilisateur est contributeur
-            if not Contributor.objects.filter(
-                user=self.request.user,
-                project=issue.project
-            ).exists():
+            if not membership_cache.is_member(self.request.user, issue.project_id):
                 raise PermissionError("Vous devez être contributeur du projet.")
             serializer.save(issue=issue)
         else:
             serializer.save()
 
+    def get_bulk_context(self):
+        self.bulk_issue = self.get_url_issue()
+        if not membership_cache.is_member(self.request.user, self.bulk_issue.project_id):
+            raise PermissionDenied("Vous devez être contributeur du projet.")
+        return super().get_bulk_context()
+
+    def get_bulk_instance_fields(self):
+        return {'issue': self.bulk_issue}
+
+    def after_bulk_write(self, created=(), updated=()):
+        super().after_bulk_write(created, updated)
+        adjust_issue(self.bulk_issue.pk, comments=len(created))
+
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        """Création (POST) ou modification de la description (PATCH) groupées"""
+        if request.method == 'POST':
+            return self.bulk_create(request, *args, **kwargs)
+        return self.bulk_update(request, *args, **kwargs)
 
-class ContributorViewSet(viewsets.ModelViewSet):
+
+class ContributorViewSet(CachedResponseMixin, ConditionalGetMixin, SparseFieldsViewMixin,
+                         ScopedQuerysetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la gestion des contributeurs.
     Seul l'auteur du projet peut gérer les contributeurs.
     """
+    sparse_required_sources = ('project', 'created_time')
     serializer_class = ContributorSerializer
     permission_classes = [IsAuthenticated, IsProjectContributor, IsAuthorOrProjectAuthor]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = HybridPagination
+    last_modified_field = 'created_time'
 
-    def get_queryset(self):
-        project_id = self.kwargs.get('project_pk')
-        if project_id:
+    def scoped_queryset(self, project_id, is_member):
+        if project_id is not None:
             # Vérifier que l'utilisateur est contributeur du projet
-            if not Contributor.objects.filter(
-                user=self.request.user,
-                project_id=project_id
-            ).exists():
+            if not is_member:
                 return Contributor.objects.none()
-            return Contributor.objects.filter(project_id=project_id)
-        return Contributor.objects.none()
\ No newline at end of file
+            return Contributor.objects.filter(project_id=project_id).select_related(
+                'user', 'project'
+            )
+        return Contributor.objects.none()
+
+
+class SearchView(generics.GenericAPIView):
+    """
+    Recherche plein texte dans les issues et commentaires des projets de
+    l'utilisateur : ``?q=`` (requis), ``?type=issue|comment``, ``?project=``,
+    ``?page_size=`` et ``?cursor=`` (lien ``next`` de la page précédente).
+    """
+    serializer_class = SearchResultSerializer
+    permission_classes = [IsAuthenticated]
+    # Débit propre à la recherche (EndpointRateThrottle, voir throttling.py)
+    throttle_scope = 'search'
+    page_size = 10
+    max_page_size = 100
+
+    def get_page_size(self):
+        try:
+            size = int(self.request.query_params['page_size'])
+            if size > 0:
+                return min(size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_project_ids(self):
+        project_ids = membership_cache.project_ids(self.request.user)
+        project = self.request.query_params.get('project')
+        if project is None:
+            return project_ids
+        try:
+            project = int(project)
+        except ValueError:
+            raise ValidationError({"project": "Identifiant de projet invalide."})
+        return [project] if project in project_ids else []
+
+    def get(self, request, *args, **kwargs):
+        kind = request.query_params.get('type')
+        if kind is not None and kind not in KINDS:
+            raise ValidationError({"type": f"Valeurs possibles : {', '.join(KINDS)}."})
+        cursor = request.query_params.get('cursor')
+        page_size = self.get_page_size()
+
+        results = search(
+            request.query_params.get('q'), self.get_project_ids(), kind=kind,
+            limit=page_size, after=decode_cursor(cursor) if cursor else None,
+        )
+        next_link = None
+        if len(results) > page_size:
+            results = results[:page_size]
+            next_link = replace_query_param(
+                request.build_absolute_uri(), 'cursor', encode_cursor(*results[-1]['key'])
+            )
+        return Response({
+            'next': next_link,
+            'results': self.get_serializer(results, many=True).data,
+        })
\ No newline at end of file